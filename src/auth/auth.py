@@ -1,22 +1,32 @@
-from fastapi import Depends, HTTPException, status, Header
+from fastapi import Depends, HTTPException, Query, status, Header
 from fastapi.security import OAuth2PasswordBearer
 from typing import Optional, Dict, Union
+import uuid
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
+import logging
 from pydantic import BaseModel, ValidationError
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.resources.secret import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
 from src.resources.constants import ASTRELLECT_API_VERSION
-from src.database import get_db
-from src.database.models import User
-from src.utils.utils import verify_password
+from src.database import get_async_db
+from src.database.models import User, UserRole
+from src.utils.hashing import hashing_service
+from src.auth.principal_cache import principal_cache
+from src.auth.revocation import subject_revocations, session_revocations
+from src.resources.constants import PRINCIPAL_REVOCATION_CHECK
+
+logger = logging.getLogger(__name__)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{ASTRELLECT_API_VERSION}/auth/token")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{ASTRELLECT_API_VERSION}/auth/token", auto_error=False)
 
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
 
 class TokenData(BaseModel):
     user_id: Optional[str] = None
@@ -25,28 +35,65 @@ class TokenData(BaseModel):
     is_admin: Optional[bool] = None
     exp: Optional[datetime] = None
 
+class Principal:
+    """Caller identity taken from signed JWT claims, without loading the user row.
+
+    Exposes the same ``id``/``role``/``is_admin`` attributes handlers read from
+    ``User``, so read-only routes can swap dependencies without other changes.
+    """
+    __slots__ = ("id", "email", "role", "is_admin", "session_id", "issued_at", "expires_at")
+
+    def __init__(self, id: uuid.UUID, email: Optional[str], role: Optional[UserRole],
+                 is_admin: bool, session_id: Optional[str], issued_at: Optional[int],
+                 expires_at: Optional[int]):
+        self.id = id
+        self.email = email
+        self.role = role
+        self.is_admin = is_admin
+        self.session_id = session_id
+        self.issued_at = issued_at
+        self.expires_at = expires_at
+
+    @classmethod
+    def from_claims(cls, payload: dict) -> "Principal":
+        role = payload.get("role")
+        return cls(
+            id=uuid.UUID(payload["sub"]),
+            email=payload.get("email"),
+            role=UserRole(role) if role else None,
+            is_admin=bool(payload.get("is_admin")),
+            session_id=payload.get("sid"),
+            issued_at=payload.get("iat"),
+            expires_at=payload.get("exp"),
+        )
+
 def create_access_token(data: dict, expires_delta: Union[timedelta, None] = None):
     """Create a JWT access token"""
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def authenticate_user(db: Session, email: str, password: str):
+async def authenticate_user(db: AsyncSession, email: str, password: str):
     """Authenticate a user with email and password"""
-    user = db.query(User).filter(User.email == email).first()
+    user = await db.scalar(select(User).where(User.email == email))
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    verified, new_hash = await hashing_service.verify_and_update(password, user.hashed_password)
+    if not verified:
         return False
     if not user.is_active:
         return False
+    if new_hash:
+        # Stored hash predates the current cost policy; the caller's commit persists it.
+        user.hashed_password = new_hash
+        logger.info(f"🔁 Rehashed password for user {user.id} to current policy")
     return user
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme), 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get the current user from the token"""
     credentials_exception = HTTPException(
@@ -68,10 +115,17 @@ async def get_current_user(
         )
     except (JWTError, ValidationError):
         raise credentials_exception
-    
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
+    if session_revocations.is_revoked(payload.get("sid")):
         raise credentials_exception
+    
+    cached_user = principal_cache.get(user_id)
+    if cached_user is not None:
+        user = await db.merge(cached_user, load=False)
+    else:
+        user = await db.scalar(select(User).where(User.id == user_id))
+        if user is None:
+            raise credentials_exception
+        principal_cache.set(user_id, user, token_exp=payload.get("exp"))
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -79,6 +133,46 @@ async def get_current_user(
         )
     return user
 
+def principal_from_token(token: Optional[str]) -> Principal:
+    """Validate ``token`` and return its caller; raises 401 like the other dependencies."""
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    if not token:
+        raise credentials_exception
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        if payload.get("sub") is None:
+            raise credentials_exception
+        principal = Principal.from_claims(payload)
+    except (JWTError, ValueError):
+        raise credentials_exception
+
+    if session_revocations.is_revoked(principal.session_id):
+        raise credentials_exception
+    if PRINCIPAL_REVOCATION_CHECK and subject_revocations.is_revoked(principal.id, principal.issued_at):
+        raise credentials_exception
+    return principal
+
+async def get_current_principal(token: str = Depends(oauth2_scheme)) -> Principal:
+    """
+    Get the caller from the token claims alone (no database access).
+
+    Tokens from a logged-out session are always rejected. Tokens whose subject
+    had its role, admin flag or active state changed after the token was issued
+    are rejected when PRINCIPAL_REVOCATION_CHECK is on.
+    """
+    return principal_from_token(token)
+
+async def get_stream_principal(
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    access_token: Optional[str] = Query(None, description="JWT, for clients such as EventSource that cannot set headers"),
+) -> Principal:
+    """``get_current_principal`` that also accepts the token as a query parameter."""
+    return principal_from_token(token or access_token)
+
 async def get_current_active_user(current_user: User = Depends(get_current_user)):
     """Get the current active user"""
     if not current_user.is_active:
@@ -0,0 +1,102 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from src.database.models import User
+from src.resources.constants import PRINCIPAL_CACHE_MAX_SIZE, PRINCIPAL_CACHE_TTL_SECONDS
+from src.resources.secret import ACCESS_TOKEN_EXPIRE_MINUTES
+
+
+class PrincipalCache:
+    """Bounded LRU cache of authenticated users keyed by token subject.
+
+    Entries are detached ``User`` snapshots holding column attributes only.
+    Callers attach them to their own session with ``Session.merge(load=False)``
+    so a cache hit costs no SQL and never shares ORM state across requests.
+    Writers drop entries through ``sessions.invalidate_users``, which also
+    tells the other worker processes.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, subject: str) -> Optional[User]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, user = entry
+            if expires_at <= now:
+                del self._entries[subject]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(subject)
+            self.hits += 1
+            return user
+
+    def set(self, subject: str, user: User, token_exp: Optional[float] = None):
+        """Cache a snapshot of ``user``; the entry never outlives ``token_exp``."""
+        if self.max_size <= 0:
+            return
+        ttl = self.ttl_seconds
+        if token_exp is not None:
+            ttl = min(ttl, token_exp - time.time())
+        if ttl <= 0:
+            return
+        snapshot = _detached_copy(user)
+        with self._lock:
+            self._entries[subject] = (time.monotonic() + ttl, snapshot)
+            self._entries.move_to_end(subject)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, subject) -> None:
+        with self._lock:
+            if self._entries.pop(str(subject), None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+def _detached_copy(user: User) -> User:
+    """Copy the column state of ``user`` into a clean, detached instance."""
+    values = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+    snapshot = User(**values)
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+
+principal_cache = PrincipalCache(
+    max_size=PRINCIPAL_CACHE_MAX_SIZE,
+    ttl_seconds=min(PRINCIPAL_CACHE_TTL_SECONDS, int(ACCESS_TOKEN_EXPIRE_MINUTES) * 60),
+)
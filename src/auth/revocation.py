@@ -0,0 +1,93 @@
+import threading
+import time
+from typing import Dict, Optional
+
+from src.resources.secret import ACCESS_TOKEN_EXPIRE_MINUTES
+
+
+class SubjectRevocations:
+    """In-process record of subjects whose outstanding tokens carry stale claims.
+
+    Revocations reach the other worker processes through the
+    ``user_invalidations`` log (see ``src/auth/sessions.py``).
+
+    A subject revoked during second T rejects every token issued before T.
+    ``iat`` is whole seconds, so revocation times are truncated to match: a
+    token minted in the same second as the revocation, typically the user
+    logging straight back in, stays valid.
+
+    Entries only need to live as long as the longest-lived access token, after
+    which no token issued before the revocation can still be valid.
+    """
+
+    def __init__(self, retention_seconds: float):
+        self.retention_seconds = retention_seconds
+        self._revoked_at: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def revoke(self, subject, revoked_at: Optional[float] = None) -> None:
+        now = int(time.time())
+        revoked_at = now if revoked_at is None else int(revoked_at)
+        with self._lock:
+            key = str(subject)
+            self._revoked_at[key] = max(revoked_at, self._revoked_at.get(key, 0))
+            self._prune(now)
+
+    def is_revoked(self, subject, issued_at: Optional[float]) -> bool:
+        revoked_at = self._revoked_at.get(str(subject))
+        if revoked_at is None:
+            return False
+        return (issued_at or 0) < revoked_at
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.retention_seconds
+        for subject in [s for s, at in self._revoked_at.items() if at < cutoff]:
+            del self._revoked_at[subject]
+
+
+subject_revocations = SubjectRevocations(retention_seconds=int(ACCESS_TOKEN_EXPIRE_MINUTES) * 60)
+
+
+class SessionRevocations:
+    """In-memory index of ended sessions, consulted on every authenticated request.
+
+    Access tokens carry their session id as ``sid``. Logging out ends the
+    session row and records the id here, so the token stops working without a
+    database read per request. The index only has to remember sessions that
+    ended within the access-token lifetime; it is rebuilt from the ``sessions``
+    table at startup and pruned by the session sweeper.
+    """
+
+    def __init__(self, retention_seconds: float):
+        self.retention_seconds = retention_seconds
+        self._ended_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def revoke(self, session_id, ended_at: Optional[float] = None) -> None:
+        with self._lock:
+            self._ended_at[str(session_id)] = ended_at or time.time()
+
+    def is_revoked(self, session_id) -> bool:
+        return session_id is not None and str(session_id) in self._ended_at
+
+    def replace(self, ended: Dict[str, float]) -> None:
+        with self._lock:
+            self._ended_at = dict(ended)
+
+    def merge(self, ended: Dict[str, float]) -> None:
+        with self._lock:
+            self._ended_at.update(ended)
+
+    def prune(self) -> int:
+        cutoff = time.time() - self.retention_seconds
+        with self._lock:
+            stale = [sid for sid, at in self._ended_at.items() if at < cutoff]
+            for sid in stale:
+                del self._ended_at[sid]
+        return len(stale)
+
+    def __len__(self) -> int:
+        return len(self._ended_at)
+
+
+session_revocations = SessionRevocations(retention_seconds=int(ACCESS_TOKEN_EXPIRE_MINUTES) * 60)
@@ -0,0 +1,231 @@
+import asyncio
+import hashlib
+import logging
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.auth.principal_cache import principal_cache
+from src.auth.revocation import session_revocations, subject_revocations
+from src.database import SessionLocal
+from src.database.models import Session as UserSession, User, UserInvalidation
+from src.resources.constants import (
+    SESSION_INDEX_REFRESH_SECONDS,
+    SESSION_SWEEP_BATCH_SIZE,
+    SESSION_SWEEP_INTERVAL_SECONDS,
+)
+from src.resources.secret import ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS
+
+logger = logging.getLogger(__name__)
+
+# Ended sessions keep their row (token prefixed with this marker) until the
+# sweeper removes them, so the revocation index can be rebuilt after a restart.
+REVOKED_MARKER = "revoked:"
+
+# Highest user_invalidations id this worker has applied
+_last_invalidation_id = 0
+
+
+def hash_refresh_token(refresh_token: str) -> str:
+    """Refresh tokens are 384-bit random strings, so a fast digest is enough."""
+    return hashlib.sha256(refresh_token.encode()).hexdigest()
+
+def _new_refresh_token() -> Tuple[str, str]:
+    refresh_token = secrets.token_urlsafe(48)
+    return refresh_token, hash_refresh_token(refresh_token)
+
+def create_session(db: AsyncSession, user: User, ip_address: Optional[str] = None,
+                   user_agent: Optional[str] = None) -> Tuple[UserSession, str]:
+    """Add a refresh-token session for ``user``; the caller commits."""
+    refresh_token, token_hash = _new_refresh_token()
+    session = UserSession(
+        id=uuid.uuid4(),
+        user_id=user.id,
+        token=token_hash,
+        ip_address=ip_address,
+        user_agent=user_agent,
+        expires_at=datetime.now() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+        created_at=datetime.now(),
+    )
+    db.add(session)
+    return session, refresh_token
+
+async def rotate_session(db: AsyncSession, refresh_token: str) -> Optional[Tuple[UserSession, str]]:
+    """Swap a valid refresh token for a new one on the same session; the caller commits.
+
+    The swap is a conditional ``UPDATE`` on the old token, so of two requests
+    presenting the same refresh token only one rotates; the other gets
+    ``None``, as for an invalid or already used token.
+    """
+    now = datetime.now()
+    old_hash = hash_refresh_token(refresh_token)
+    session = await db.scalar(select(UserSession).where(UserSession.token == old_hash))
+    if session is None or session.expires_at <= now:
+        return None
+    new_refresh_token, token_hash = _new_refresh_token()
+    result = await db.execute(
+        update(UserSession)
+        .where(
+            UserSession.id == session.id,
+            UserSession.token == old_hash,
+            UserSession.expires_at > now,
+        )
+        .values(token=token_hash)
+    )
+    if result.rowcount == 0:
+        logger.warning(f"⚠️ Refresh token for session {session.id} was already used")
+        return None
+    return session, new_refresh_token
+
+def _end(session: UserSession, now: datetime):
+    if not session.token.startswith(REVOKED_MARKER):
+        session.token = REVOKED_MARKER + session.token
+    session.expires_at = now
+    session_revocations.revoke(session.id, now.timestamp())
+
+async def revoke_session(db: AsyncSession, session_id) -> bool:
+    """End one session; its access tokens stop working immediately. The caller commits."""
+    session = await db.get(UserSession, uuid.UUID(str(session_id)))
+    if session is None:
+        return False
+    _end(session, datetime.now())
+    return True
+
+async def revoke_user_sessions(db: AsyncSession, user_id, keep_session_id=None) -> int:
+    """End every live session of ``user_id`` except ``keep_session_id``. The caller commits."""
+    now = datetime.now()
+    query = select(UserSession).where(
+        UserSession.user_id == user_id,
+        UserSession.expires_at > now,
+    )
+    if keep_session_id is not None:
+        query = query.where(UserSession.id != keep_session_id)
+    sessions = (await db.scalars(query)).all()
+    for session in sessions:
+        _end(session, now)
+    return len(sessions)
+
+def _forget_user(user_id, revoke_claims: bool, at: float) -> None:
+    principal_cache.invalidate(user_id)
+    if revoke_claims:
+        subject_revocations.revoke(user_id, at)
+
+async def invalidate_users(db: AsyncSession, user_ids: Iterable, revoke_claims: bool = False) -> None:
+    """Drop the cached principals of ``user_ids`` on every worker; the caller commits.
+
+    This worker forgets them at once; the others when their revocation
+    refresher reads the logged ``user_invalidations`` rows. With
+    ``revoke_claims`` their tokens issued before now are rejected too.
+    """
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+    now = datetime.now()
+    await db.execute(insert(UserInvalidation), [
+        {"user_id": user_id, "revoke_claims": revoke_claims, "created_at": now}
+        for user_id in user_ids
+    ])
+    for user_id in user_ids:
+        _forget_user(user_id, revoke_claims, now.timestamp())
+
+async def invalidate_user(db: AsyncSession, user_id, revoke_claims: bool = False) -> None:
+    await invalidate_users(db, [user_id], revoke_claims)
+
+def _apply_invalidations(db: Session) -> int:
+    """Apply user invalidations logged since the last call, this worker's own included.
+
+    Re-applying our own rows also drops a snapshot that a concurrent request
+    cached between the invalidation and its commit.
+    """
+    global _last_invalidation_id
+    since = datetime.now() - timedelta(minutes=int(ACCESS_TOKEN_EXPIRE_MINUTES))
+    rows = db.query(UserInvalidation).filter(
+        UserInvalidation.id > _last_invalidation_id,
+        UserInvalidation.created_at >= since,
+    ).order_by(UserInvalidation.id).all()
+    for row in rows:
+        _forget_user(row.user_id, row.revoke_claims, row.created_at.timestamp())
+    if rows:
+        _last_invalidation_id = rows[-1].id
+    return len(rows)
+
+def _recent_revocations(db: Session) -> dict:
+    since = datetime.now() - timedelta(minutes=int(ACCESS_TOKEN_EXPIRE_MINUTES))
+    rows = db.query(UserSession.id, UserSession.expires_at).filter(
+        UserSession.token.startswith(REVOKED_MARKER),
+        UserSession.expires_at >= since,
+    ).all()
+    return {str(row.id): row.expires_at.timestamp() for row in rows}
+
+def rebuild_revocation_index(db: Session) -> int:
+    """Reload sessions revoked within the access-token lifetime into memory."""
+    ended = _recent_revocations(db)
+    session_revocations.replace(ended)
+    _apply_invalidations(db)
+    return len(ended)
+
+def refresh_revocation_index(db: Session) -> int:
+    """Pick up sessions ended and users changed by other worker processes since the last refresh."""
+    ended = _recent_revocations(db)
+    session_revocations.merge(ended)
+    _apply_invalidations(db)
+    return len(ended)
+
+def sweep_expired_sessions(db: Session, batch_size: int = SESSION_SWEEP_BATCH_SIZE) -> int:
+    """Delete sessions that ended longer ago than any access token can live, in batches."""
+    cutoff = datetime.now() - timedelta(minutes=int(ACCESS_TOKEN_EXPIRE_MINUTES))
+    deleted = 0
+    while True:
+        ids = [row.id for row in db.query(UserSession.id).filter(
+            UserSession.expires_at < cutoff
+        ).limit(batch_size)]
+        if not ids:
+            break
+        db.query(UserSession).filter(UserSession.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+        deleted += len(ids)
+        if len(ids) < batch_size:
+            break
+    db.query(UserInvalidation).filter(UserInvalidation.created_at < cutoff).delete(synchronize_session=False)
+    db.commit()
+    session_revocations.prune()
+    return deleted
+
+def _sweep_once() -> int:
+    db = SessionLocal()
+    try:
+        return sweep_expired_sessions(db)
+    finally:
+        db.close()
+
+async def run_session_sweeper(interval_seconds: float = SESSION_SWEEP_INTERVAL_SECONDS):
+    """Background task: periodically purge expired sessions off the event loop."""
+    while True:
+        try:
+            deleted = await asyncio.to_thread(_sweep_once)
+            if deleted:
+                logger.info(f"🧹 Swept {deleted} expired sessions")
+        except Exception as e:
+            logger.error(f"❌ Session sweep failed: {str(e)}")
+        await asyncio.sleep(interval_seconds)
+
+def _refresh_once() -> int:
+    db = SessionLocal()
+    try:
+        return refresh_revocation_index(db)
+    finally:
+        db.close()
+
+async def run_revocation_refresher(interval_seconds: float = SESSION_INDEX_REFRESH_SECONDS):
+    """Background task: keep this worker's revocation index in step with the others."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(_refresh_once)
+        except Exception as e:
+            logger.error(f"❌ Revocation index refresh failed: {str(e)}")
@@ -1,26 +1,47 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 import uuid
 import os
-from src.resources.constants import DATABASE_URL
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from src.resources.constants import SQL_INSTRUMENTATION, UUID_STORAGE
+from src.resources.settings import database_settings
+from src.database.instrumentation import instrument_sql
+from src.database.pool import PoolStats, instrument_engine, timed_pool_class
+from src.database.routing import CONSISTENCY_HEADER, ReadRouter, client_key, replica_urls
+from src.database.sqlite_tuning import apply_sqlite_pragmas, resolve_pragmas
 from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean
 
 # Add UUID type support for SQLite (SQLite doesn't natively support UUID)
-from sqlalchemy.types import TypeDecorator, CHAR
+from sqlalchemy.types import TypeDecorator, CHAR, BINARY
 from sqlalchemy.dialects.postgresql import UUID as pgUUID
 
+UUID_STORAGE_MODES = ("text", "binary")
+
 class UUID(TypeDecorator):
     """Platform-independent UUID type.
     
     Uses PostgreSQL's UUID type when available, otherwise 
-    uses CHAR(36), storing as a string.
+    uses CHAR(36), storing as a string, or BINARY(16) storing the raw
+    bytes when ``UUID_STORAGE=binary``. Switching an existing database
+    between the two needs ``python src/database/uuid_storage.py``.
     """
     impl = CHAR
     cache_ok = True
 
+    def __init__(self, storage: str = None):
+        super().__init__()
+        self.storage = storage or UUID_STORAGE
+        if self.storage not in UUID_STORAGE_MODES:
+            raise ValueError(f"Unknown UUID_STORAGE '{self.storage}', expected one of {', '.join(UUID_STORAGE_MODES)}")
+
     def load_dialect_impl(self, dialect):
         if dialect.name == 'postgresql':
             return dialect.type_descriptor(pgUUID())
+        elif self.storage == 'binary':
+            return dialect.type_descriptor(BINARY(16))
         else:
             return dialect.type_descriptor(CHAR(36))
 
@@ -31,24 +52,95 @@ class UUID(TypeDecorator):
             return str(value)
         else:
             if not isinstance(value, uuid.UUID):
-                return str(uuid.UUID(value))
-            else:
-                return str(value)
+                value = uuid.UUID(value)
+            return value.bytes if self.storage == 'binary' else str(value)
 
     def process_result_value(self, value, dialect):
         if value is None:
             return value
-        else:
-            if not isinstance(value, uuid.UUID):
-                value = uuid.UUID(value)
+        elif isinstance(value, uuid.UUID):
             return value
+        elif isinstance(value, bytes):
+            return uuid.UUID(bytes=value)
+        else:
+            return uuid.UUID(value)
+
+
+# Async drivers used for the same database when serving requests
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+def to_async_url(url: str) -> str:
+    """Map a sync DATABASE_URL onto the async driver for the same backend."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+def _engine_kwargs(pool_class, stats: PoolStats, is_async: bool) -> dict:
+    kwargs = database_settings.engine_kwargs(is_async=is_async)
+    if not database_settings.is_memory:
+        kwargs["poolclass"] = timed_pool_class(pool_class, stats)
+    return kwargs
 
+engine_pool_stats = PoolStats()
+async_engine_pool_stats = PoolStats()
 
+# Sync engine: scripts (init_db.py), startup DDL/seeding and background threads
 engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}
+    database_settings.url, **_engine_kwargs(QueuePool, engine_pool_stats, is_async=False)
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine: request handlers, so waiting on the database never blocks the event loop
+async_engine = create_async_engine(
+    to_async_url(database_settings.url),
+    **_engine_kwargs(AsyncAdaptedQueuePool, async_engine_pool_stats, is_async=True)
+)
+# expire_on_commit=False: handlers read attributes after commit, and an
+# expired attribute would need a lazy load, which AsyncSession cannot do.
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+instrument_engine(engine, engine_pool_stats)
+instrument_engine(async_engine.sync_engine, async_engine_pool_stats)
+
+if engine.dialect.name == "sqlite":
+    apply_sqlite_pragmas(engine)
+    apply_sqlite_pragmas(async_engine.sync_engine)
+
+# Read replicas for GET handlers (see src/database/routing.py)
+replica_pool_stats = {}
+_replicas = []
+for _number, _url in enumerate(replica_urls(database_settings), start=1):
+    _name = f"replica{_number}"
+    replica_pool_stats[_name] = PoolStats()
+    _kwargs = _engine_kwargs(AsyncAdaptedQueuePool, replica_pool_stats[_name], is_async=True)
+    _replica_engine = create_async_engine(to_async_url(_url), **_kwargs)
+    instrument_engine(_replica_engine.sync_engine, replica_pool_stats[_name])
+    if _replica_engine.dialect.name == "sqlite":
+        # journal_mode cannot be changed through a read-only connection
+        apply_sqlite_pragmas(_replica_engine.sync_engine, {
+            name: value for name, value in resolve_pragmas().items() if name != "journal_mode"
+        })
+    _replicas.append((_name, _replica_engine, async_sessionmaker(
+        _replica_engine, autoflush=False, expire_on_commit=False
+    )))
+if SQL_INSTRUMENTATION:
+    for _instrumented in [engine, async_engine] + [replica_engine for _, replica_engine, _ in _replicas]:
+        instrument_sql(getattr(_instrumented, "sync_engine", _instrumented))
+
+read_router = ReadRouter(AsyncSessionLocal, _replicas, database_settings.replica_sticky_seconds)
+replica_engines = {name: replica_engine for name, replica_engine, _ in _replicas}
+
+@event.listens_for(Session, "after_commit")
+def _mark_client_write(session):
+    key = session.info.get("client_key")
+    if key is not None:
+        read_router.mark_write(key)
+
 Base = declarative_base()
 
 def get_db():
@@ -56,4 +148,17 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db(request: Request):
+    async with AsyncSessionLocal() as db:
+        # Commits from this request keep the client's reads on the primary for a while
+        db.sync_session.info["client_key"] = client_key(request)
+        yield db
+
+async def get_read_db(request: Request):
+    """Session for handlers that only read; may be served by a replica."""
+    force_primary = request.headers.get(CONSISTENCY_HEADER, "").lower() == "primary"
+    _, session_factory = read_router.choose(client_key(request), force_primary)
+    async with session_factory() as db:
+        yield db
\ No newline at end of file
@@ -0,0 +1,62 @@
+"""Announcement audience and recipient fan-out.
+
+Recipient rows are written with one ``INSERT ... SELECT`` over the audience
+query, so publishing to 20k employees is a single statement instead of
+20k ORM objects. Row ids are generated by the database. Backends without
+a UUID expression here fall back to chunked executemany inserts.
+"""
+import uuid
+from typing import Optional
+
+from sqlalchemy import and_, false, insert, literal, literal_column, select
+from sqlalchemy.engine import Dialect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from src.database.models import AnnouncementRecipient, User, UserRole
+
+FALLBACK_CHUNK_SIZE = 5000
+
+# Random version 4 UUID in canonical text form, one per row
+_SQLITE_TEXT_UUID = (
+    "lower(hex(randomblob(4))) || '-' || lower(hex(randomblob(2))) || '-4' || "
+    "substr(lower(hex(randomblob(2))), 2) || '-' || substr('89ab', 1 + (abs(random()) % 4), 1) || "
+    "substr(lower(hex(randomblob(2))), 2) || '-' || lower(hex(randomblob(6)))"
+)
+
+
+def in_audience(user=User):
+    """Whether ``user`` is someone announcements are addressed to: an active employee."""
+    return and_(user.role == UserRole.EMPLOYEE, user.is_active == True)
+
+def audience_query() -> Select:
+    return select(User.id).where(in_audience())
+
+def new_uuid_sql(dialect: Dialect) -> Optional[str]:
+    """SQL expression producing a fresh key for ``AnnouncementRecipient.id``, if the backend has one."""
+    if dialect.name == "postgresql":
+        return "gen_random_uuid()"
+    if dialect.name == "sqlite":
+        storage = AnnouncementRecipient.__table__.c.id.type.storage
+        return "randomblob(16)" if storage == "binary" else _SQLITE_TEXT_UUID
+    return None
+
+async def fan_out(db: AsyncSession, announcement_id: uuid.UUID) -> int:
+    """Create an unread recipient row for every audience member; returns how many."""
+    announcement = literal(announcement_id, type_=AnnouncementRecipient.__table__.c.announcement_id.type)
+    new_id = new_uuid_sql(db.bind.dialect)
+    if new_id is not None:
+        audience = audience_query().subquery()
+        result = await db.execute(insert(AnnouncementRecipient.__table__).from_select(
+            ["id", "announcement_id", "user_id", "is_read"],
+            select(literal_column(new_id), announcement, audience.c.id, false()),
+        ))
+        return result.rowcount
+
+    user_ids = (await db.scalars(audience_query())).all()
+    for start in range(0, len(user_ids), FALLBACK_CHUNK_SIZE):
+        await db.execute(insert(AnnouncementRecipient), [
+            {"id": uuid.uuid4(), "announcement_id": announcement_id, "user_id": user_id, "is_read": False}
+            for user_id in user_ids[start:start + FALLBACK_CHUNK_SIZE]
+        ])
+    return len(user_ids)
@@ -0,0 +1,117 @@
+"""Org chart queries over the ``user_hierarchy`` closure table.
+
+Each ``reporting_manager_id`` change is applied incrementally: a new user
+inherits its manager's ancestors, and moving a user re-links its whole
+subtree under the new manager's ancestors. "Everyone under X" and "X's
+management chain" then become one indexed lookup at any depth.
+
+The User mapper listeners below cover every ORM write (routes, seeding,
+``init_db``). Core bulk writes, such as the bulk import, call
+``link_users``/``move_user`` themselves.
+"""
+import uuid
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, event, insert, inspect, literal, select, true
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.models import User, UserHierarchy
+
+hierarchy = UserHierarchy.__table__
+_columns = ["ancestor_id", "descendant_id", "depth"]
+
+
+class HierarchyCycleError(ValueError):
+    """The requested manager reports, directly or not, to the user being moved."""
+
+
+def _user_id(value):
+    return literal(value, type_=hierarchy.c.descendant_id.type)
+
+def link_user(connection: Connection, user_id: uuid.UUID, manager_id: Optional[uuid.UUID]) -> None:
+    """Add a new user below ``manager_id`` (or as a root)."""
+    connection.execute(insert(hierarchy).values(ancestor_id=user_id, descendant_id=user_id, depth=0))
+    if manager_id is not None:
+        connection.execute(insert(hierarchy).from_select(_columns, select(
+            hierarchy.c.ancestor_id, _user_id(user_id), hierarchy.c.depth + 1
+        ).where(hierarchy.c.descendant_id == manager_id)))
+
+def link_users(connection: Connection, pairs: Iterable[Tuple[uuid.UUID, Optional[uuid.UUID]]]) -> None:
+    """``link_user`` for many new users, managers before their reports."""
+    pending = dict(pairs)
+    while pending:
+        ready = [user_id for user_id, manager_id in pending.items() if manager_id not in pending]
+        if not ready:
+            raise HierarchyCycleError("New users report to each other in a cycle")
+        for user_id in ready:
+            link_user(connection, user_id, pending.pop(user_id))
+
+def would_cycle(connection: Connection, user_id: uuid.UUID, manager_id: Optional[uuid.UUID]) -> bool:
+    if manager_id is None:
+        return False
+    if manager_id == user_id:
+        return True
+    return connection.execute(select(1).where(
+        hierarchy.c.ancestor_id == user_id, hierarchy.c.descendant_id == manager_id
+    )).first() is not None
+
+def move_user(connection: Connection, user_id: uuid.UUID, manager_id: Optional[uuid.UUID]) -> None:
+    """Re-parent ``user_id`` and its whole subtree under ``manager_id``."""
+    if would_cycle(connection, user_id, manager_id):
+        raise HierarchyCycleError(f"User {manager_id} reports to {user_id}")
+    subtree = select(hierarchy.c.descendant_id).where(hierarchy.c.ancestor_id == user_id)
+    # Drop the links from the old management chain into the subtree...
+    connection.execute(delete(hierarchy).where(
+        hierarchy.c.descendant_id.in_(subtree), hierarchy.c.ancestor_id.not_in(subtree)
+    ))
+    if manager_id is None:
+        return
+    # ...and link every ancestor of the new manager to every member of the subtree
+    above, below = hierarchy.alias("above"), hierarchy.alias("below")
+    connection.execute(insert(hierarchy).from_select(_columns, select(
+        above.c.ancestor_id, below.c.descendant_id, above.c.depth + below.c.depth + 1
+    ).select_from(above.join(below, true())).where(
+        above.c.descendant_id == manager_id, below.c.ancestor_id == user_id
+    )))
+
+
+@event.listens_for(User, "after_insert")
+def _link_inserted_user(mapper, connection, target):
+    link_user(connection, target.id, target.reporting_manager_id)
+
+@event.listens_for(User, "after_update")
+def _move_updated_user(mapper, connection, target):
+    if inspect(target).attrs.reporting_manager_id.history.has_changes():
+        move_user(connection, target.id, target.reporting_manager_id)
+
+
+async def creates_cycle(db: AsyncSession, user_id: uuid.UUID, manager_id: Optional[uuid.UUID]) -> bool:
+    """Whether making ``manager_id`` the manager of ``user_id`` would make someone their own manager."""
+    return await db.run_sync(lambda session: would_cycle(session.connection(), user_id, manager_id))
+
+async def direct_reports(db: AsyncSession, user_id: uuid.UUID) -> List[User]:
+    return (await db.scalars(
+        select(User).where(User.reporting_manager_id == user_id).order_by(User.last_name, User.first_name, User.id)
+    )).all()
+
+async def subtree(db: AsyncSession, user_id: uuid.UUID, max_depth: Optional[int] = None) -> List[Tuple[User, int]]:
+    """Everyone under ``user_id``, nearest levels first, with their depth below them."""
+    condition = and_(hierarchy.c.ancestor_id == user_id, hierarchy.c.depth >= 1)
+    if max_depth is not None:
+        condition = and_(condition, hierarchy.c.depth <= max_depth)
+    return (await db.execute(
+        select(User, hierarchy.c.depth)
+        .join(hierarchy, hierarchy.c.descendant_id == User.id)
+        .where(condition)
+        .order_by(hierarchy.c.depth, User.last_name, User.first_name, User.id)
+    )).all()
+
+async def management_chain(db: AsyncSession, user_id: uuid.UUID) -> List[Tuple[User, int]]:
+    """Managers of ``user_id`` from the direct manager up to the top."""
+    return (await db.execute(
+        select(User, hierarchy.c.depth)
+        .join(hierarchy, hierarchy.c.ancestor_id == User.id)
+        .where(hierarchy.c.descendant_id == user_id, hierarchy.c.depth >= 1)
+        .order_by(hierarchy.c.depth)
+    )).all()
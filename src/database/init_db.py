@@ -5,12 +5,14 @@ import os
 import uuid
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
 
-from src.database import Base, engine, SessionLocal
+from src.database import engine, SessionLocal
+from src.database.base import Base
+from src.database.migrations import ensure_schema
 from src.database.models import User, UserRole 
 from src.utils.utils import get_password_hash
 
 def init():
-    Base.metadata.create_all(bind=engine)
+    ensure_schema(engine, Base.metadata)
     db = SessionLocal()
     admin_user = db.query(User).filter(User.email == "admin@astrellect.com").first()
     if not admin_user:
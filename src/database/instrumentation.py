@@ -0,0 +1,146 @@
+"""Per-request SQL accounting.
+
+``before/after_cursor_execute`` listeners attribute every statement to the
+request being served through a ``ContextVar``. The context reaches the
+async engine's cursor events because SQLAlchemy runs them in a greenlet
+that shares the calling task's context. ``SQLTimingMiddleware`` then:
+
+- adds ``Server-Timing: db;dur=<ms>;desc="<n> queries"`` (and the slowest
+  statement) to the response,
+- folds the request into per-endpoint totals for ``GET /metrics/sql``,
+- logs a warning when one statement ran ``SQL_N_PLUS_ONE_THRESHOLD`` times or
+  more in the same request, the usual sign of a lazy load inside a loop.
+"""
+import logging
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from sqlalchemy import event
+
+from src.resources.constants import SQL_N_PLUS_ONE_THRESHOLD, SQL_SLOW_STATEMENT_MS
+
+logger = logging.getLogger(__name__)
+
+_STATEMENT_PREVIEW = 200
+
+
+class RequestSQLStats:
+    __slots__ = ("queries", "total_seconds", "slowest_seconds", "slowest_statement", "statements")
+
+    def __init__(self):
+        self.queries = 0
+        self.total_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.queries += 1
+        self.total_seconds += seconds
+        self.statements[statement] += 1
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+    def repeated(self, threshold: int = SQL_N_PLUS_ONE_THRESHOLD) -> Dict[str, int]:
+        return {statement: n for statement, n in self.statements.items() if n >= threshold}
+
+    def server_timing(self) -> str:
+        timing = f'db;dur={self.total_seconds * 1000:.2f};desc="{self.queries} queries"'
+        if self.queries:
+            timing += f', db-slowest;dur={self.slowest_seconds * 1000:.2f}'
+        return timing
+
+
+current_sql_stats: ContextVar[Optional[RequestSQLStats]] = ContextVar("current_sql_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("sql_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["sql_start"].pop()
+    stats = current_sql_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    if elapsed * 1000 >= SQL_SLOW_STATEMENT_MS:
+        logger.warning(f"🐢 Slow SQL ({elapsed * 1000:.1f} ms): {statement[:_STATEMENT_PREVIEW]}")
+
+def instrument_sql(engine) -> None:
+    """Attach the cursor listeners to ``engine`` (sync, or ``async_engine.sync_engine``)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class EndpointSQLStats:
+    """Running per-endpoint totals, keyed by ``"METHOD /route/{template}"``."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, dict] = {}
+
+    def record(self, endpoint: str, stats: RequestSQLStats, flagged: bool) -> None:
+        with self._lock:
+            entry = self._endpoints.setdefault(endpoint, {
+                "requests": 0, "queries": 0, "db_ms": 0.0, "max_queries": 0,
+                "slowest_ms": 0.0, "slowest_statement": None, "n_plus_one_requests": 0,
+            })
+            entry["requests"] += 1
+            entry["queries"] += stats.queries
+            entry["db_ms"] += stats.total_seconds * 1000
+            entry["max_queries"] = max(entry["max_queries"], stats.queries)
+            if stats.slowest_seconds * 1000 > entry["slowest_ms"]:
+                entry["slowest_ms"] = stats.slowest_seconds * 1000
+                entry["slowest_statement"] = (stats.slowest_statement or "")[:_STATEMENT_PREVIEW]
+            entry["n_plus_one_requests"] += int(flagged)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            endpoints = {name: dict(entry) for name, entry in self._endpoints.items()}
+        for entry in endpoints.values():
+            entry["avg_queries"] = round(entry["queries"] / entry["requests"], 2)
+            entry["avg_db_ms"] = round(entry["db_ms"] / entry["requests"], 3)
+            entry["db_ms"] = round(entry["db_ms"], 3)
+            entry["slowest_ms"] = round(entry["slowest_ms"], 3)
+        return dict(sorted(endpoints.items(), key=lambda item: item[1]["db_ms"], reverse=True))
+
+
+endpoint_sql_stats = EndpointSQLStats()
+
+
+class SQLTimingMiddleware:
+    """ASGI middleware opening a ``RequestSQLStats`` scope around each HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = RequestSQLStats()
+        token = current_sql_stats.set(stats)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_sql_stats.reset(token)
+            route = scope.get("route")
+            endpoint = f"{scope['method']} {getattr(route, 'path', scope['path'])}"
+            repeated = stats.repeated()
+            for statement, n in repeated.items():
+                logger.warning(
+                    f"⚠️ Possible N+1 on {endpoint}: statement ran {n} times: {statement[:_STATEMENT_PREVIEW]}"
+                )
+            if route is not None or stats.queries:
+                endpoint_sql_stats.record(endpoint, stats, bool(repeated))
@@ -0,0 +1,38 @@
+"""Apply or inspect schema migrations.
+
+Usage:
+    python src/database/migrate.py            # create missing tables, apply pending migrations
+    python src/database/migrate.py status
+"""
+import argparse
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.database import engine
+from src.database.base import Base
+from src.database import models  # noqa: F401  (registers every table on Base.metadata)
+from src.database.migrations import LATEST_VERSION, current_version, pending_migrations, upgrade
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply or inspect schema migrations")
+    parser.add_argument("command", nargs="?", choices=("upgrade", "status"), default="upgrade")
+    args = parser.parse_args()
+
+    if args.command == "status":
+        with engine.connect() as connection:
+            version = current_version(connection)
+            pending = pending_migrations(connection)
+        print(f"Schema version {version} (latest {LATEST_VERSION})")
+        for migration in pending:
+            print(f"  pending {migration.VERSION:04d}: {migration.DESCRIPTION}")
+        return
+
+    Base.metadata.create_all(bind=engine)
+    applied = upgrade(engine, Base.metadata)
+    print(f"✅ Applied {len(applied)} migration(s); schema version {LATEST_VERSION}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Versioned schema migrations.
+
+``Base.metadata.create_all`` creates missing tables, but never touches
+tables that already exist. Changes to existing tables (new indexes,
+backfills) are shipped as numbered migration modules listed in
+``MIGRATIONS``; each exposes ``VERSION``, ``DESCRIPTION`` and
+``upgrade(connection)``. Applied versions are recorded in the
+``schema_version`` table so every migration runs exactly once per database.
+
+Migrations must be idempotent (``IF NOT EXISTS``), because a fresh database
+already gets the current model's indexes from ``create_all`` before they run.
+Any model change, including a new table, needs a migration: ``ensure_schema``
+skips all DDL when the stored version is already the latest.
+"""
+import logging
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, inspect, select
+from sqlalchemy.engine import Connection, Engine
+
+from src.database.migrations import (
+    v0001_hot_path_indexes,
+    v0002_keyset_pagination,
+    v0003_people_search,
+    v0004_org_chart,
+    v0005_announcement_reads,
+    v0006_announcement_inbox,
+    v0007_broadcast_events,
+    v0008_user_invalidations,
+    v0009_announcement_pinned_not_null,
+    v0010_user_invalidations_autoincrement,
+    v0011_broadcast_events_autoincrement,
+)
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS = [
+    v0001_hot_path_indexes,
+    v0002_keyset_pagination,
+    v0003_people_search,
+    v0004_org_chart,
+    v0005_announcement_reads,
+    v0006_announcement_inbox,
+    v0007_broadcast_events,
+    v0008_user_invalidations,
+    v0009_announcement_pinned_not_null,
+    v0010_user_invalidations_autoincrement,
+    v0011_broadcast_events_autoincrement,
+]
+
+LATEST_VERSION = MIGRATIONS[-1].VERSION
+
+schema_version = Table(
+    "schema_version",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def current_version(connection: Connection) -> int:
+    """Highest applied version, 0 for a database that predates migrations."""
+    if not inspect(connection).has_table(schema_version.name):
+        return 0
+    return connection.execute(select(func.max(schema_version.c.version))).scalar() or 0
+
+def pending_migrations(connection: Connection) -> list:
+    version = current_version(connection)
+    return [migration for migration in MIGRATIONS if migration.VERSION > version]
+
+def missing_tables(connection: Connection, metadata: MetaData) -> List[str]:
+    present = set(inspect(connection).get_table_names())
+    return sorted(name for name in metadata.tables if name not in present)
+
+def upgrade(engine: Engine, metadata: MetaData) -> List[int]:
+    """Apply every pending migration, each in its own transaction.
+
+    Refuses to run while any table of ``metadata`` is missing: migrations
+    skip absent tables, so their versions would be recorded for a schema
+    that was never built, and ``ensure_schema`` would never look again.
+    """
+    applied = []
+    with engine.begin() as connection:
+        missing = missing_tables(connection, metadata)
+        if missing:
+            raise RuntimeError(f"Tables missing, create them before migrating: {', '.join(missing)}")
+        schema_version.create(connection, checkfirst=True)
+        migrations = pending_migrations(connection)
+    for migration in migrations:
+        with engine.begin() as connection:
+            migration.upgrade(connection)
+            connection.execute(schema_version.insert().values(
+                version=migration.VERSION,
+                description=migration.DESCRIPTION,
+                applied_at=datetime.now(),
+            ))
+        logger.info(f"✅ Applied migration {migration.VERSION:04d}: {migration.DESCRIPTION}")
+        applied.append(migration.VERSION)
+    return applied
+
+def ensure_schema(engine: Engine, metadata: MetaData) -> dict:
+    """Bring the database up to ``LATEST_VERSION``; no DDL at all when it already is.
+
+    Recorded versions with tables missing (written by an older ``init_db``
+    that created none) are discarded, and every migration runs again once
+    the tables exist; migrations are idempotent.
+    """
+    with engine.connect() as connection:
+        version = current_version(connection)
+        missing = missing_tables(connection, metadata)
+    if version == LATEST_VERSION and not missing:
+        return {"version": version, "ddl": False}
+    if version and missing:
+        logger.warning(f"⚠️ Schema version {version} recorded but tables are missing; re-running all migrations")
+        with engine.begin() as connection:
+            connection.execute(schema_version.delete())
+    metadata.create_all(bind=engine)
+    applied = upgrade(engine, metadata)
+    return {"version": LATEST_VERSION, "ddl": True, "applied": applied}
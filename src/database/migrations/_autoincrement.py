@@ -0,0 +1,36 @@
+"""Shared step of migrations that switch a SQLite table to AUTOINCREMENT.
+
+Without it SQLite hands out ``max(rowid) + 1``, so once every row has been
+deleted the ids start over at 1. Tables read by id watermark need ids that
+never repeat.
+"""
+from sqlalchemy import Table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateTable
+
+
+def rebuild_with_autoincrement(connection: Connection, table: Table) -> bool:
+    """Recreate ``table`` from its model (``sqlite_autoincrement=True``), keeping rows and indexes."""
+    if connection.dialect.name != "sqlite":
+        return False
+    sql = connection.execute(
+        text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": table.name}
+    ).scalar()
+    if sql is None or "AUTOINCREMENT" in sql.upper():
+        return False
+    indexes = connection.execute(
+        text("SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = :name AND sql IS NOT NULL"),
+        {"name": table.name},
+    ).scalars().all()
+    new_name = f"{table.name}__autoincrement"
+    ddl = str(CreateTable(table).compile(dialect=connection.dialect)).strip()
+    ddl = ddl.replace(f"CREATE TABLE {table.name} ", f'CREATE TABLE "{new_name}" ', 1)
+    columns = ", ".join(f'"{column.name}"' for column in table.columns)
+    connection.execute(text(f'DROP TABLE IF EXISTS "{new_name}"'))
+    connection.execute(text(ddl))
+    connection.execute(text(f'INSERT INTO "{new_name}" ({columns}) SELECT {columns} FROM "{table.name}"'))
+    connection.execute(text(f'DROP TABLE "{table.name}"'))
+    connection.execute(text(f'ALTER TABLE "{new_name}" RENAME TO "{table.name}"'))
+    for statement in indexes:
+        connection.execute(text(statement))
+    return True
@@ -0,0 +1,99 @@
+"""Indexes for the hot query paths and every foreign key column.
+
+Mirrors the ``index=True``/``Index`` declarations in ``models.py`` so that
+databases created before they existed end up with the same indexes.
+"""
+import logging
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+VERSION = 1
+DESCRIPTION = "hot-path and foreign key indexes"
+
+# (name, table, columns, unique)
+INDEXES = [
+    # GET /announcement/get-recipient, mark-read: one row per (user, announcement)
+    ("ix_announcement_recipients_user_announcement", "announcement_recipients", ("user_id", "announcement_id"), True),
+    ("ix_announcement_recipients_announcement_id", "announcement_recipients", ("announcement_id",), False),
+    # Non-admin testimonial listing filters on status
+    ("ix_testimonials_status", "testimonials", ("status",), False),
+    ("ix_testimonials_user_id", "testimonials", ("user_id",), False),
+    # Announcement fan-out and admin counts filter on role/is_active
+    ("ix_users_role_is_active", "users", ("role", "is_active"), False),
+    ("ix_users_reporting_manager_id", "users", ("reporting_manager_id",), False),
+    # Policy create/update title conflict check
+    ("ix_company_policies_title", "company_policies", ("title",), True),
+    ("ix_company_policies_created_by", "company_policies", ("created_by",), False),
+    # Refresh-token lookup, per-user revocation and the expiry sweeper
+    ("ix_sessions_token", "sessions", ("token",), True),
+    ("ix_sessions_user_id", "sessions", ("user_id",), False),
+    ("ix_sessions_expires_at", "sessions", ("expires_at",), False),
+    # Remaining foreign keys
+    ("ix_announcements_author_id", "announcements", ("author_id",), False),
+    ("ix_attendance_records_user_id", "attendance_records", ("user_id",), False),
+    ("ix_events_organizer_id", "events", ("organizer_id",), False),
+    ("ix_events_type_id", "events", ("type_id",), False),
+    ("ix_event_attendees_event_id", "event_attendees", ("event_id",), False),
+    ("ix_event_attendees_user_id", "event_attendees", ("user_id",), False),
+    ("ix_leave_balances_leave_type_id", "leave_balances", ("leave_type_id",), False),
+    ("ix_leave_balances_user_id", "leave_balances", ("user_id",), False),
+    ("ix_leave_requests_approver_id", "leave_requests", ("approver_id",), False),
+    ("ix_leave_requests_leave_type_id", "leave_requests", ("leave_type_id",), False),
+    ("ix_leave_requests_user_id", "leave_requests", ("user_id",), False),
+    ("ix_manual_time_entries_manager_id", "manual_time_entries", ("manager_id",), False),
+    ("ix_manual_time_entries_user_id", "manual_time_entries", ("user_id",), False),
+    ("ix_password_reset_tokens_user_id", "password_reset_tokens", ("user_id",), False),
+    ("ix_performance_ratings_cycle_id", "performance_ratings", ("cycle_id",), False),
+    ("ix_performance_ratings_finalized_by", "performance_ratings", ("finalized_by",), False),
+    ("ix_performance_ratings_manager_id", "performance_ratings", ("manager_id",), False),
+    ("ix_performance_ratings_user_id", "performance_ratings", ("user_id",), False),
+    ("ix_referrals_position_id", "referrals", ("position_id",), False),
+    ("ix_referrals_referrer_id", "referrals", ("referrer_id",), False),
+    ("ix_tickets_assigned_to", "tickets", ("assigned_to",), False),
+    ("ix_tickets_category_id", "tickets", ("category_id",), False),
+    ("ix_tickets_user_id", "tickets", ("user_id",), False),
+]
+
+
+def _has_duplicates(connection: Connection, table: str, columns) -> bool:
+    column_list = ", ".join(columns)
+    return connection.execute(text(
+        f"SELECT 1 FROM {table} GROUP BY {column_list} HAVING count(*) > 1 LIMIT 1"
+    )).first() is not None
+
+def _dedupe_recipients(connection: Connection) -> None:
+    """Keep one recipient row per (user, announcement), preferring a read one."""
+    if not _has_duplicates(connection, "announcement_recipients", ("user_id", "announcement_id")):
+        return
+    result = connection.execute(text("""
+        DELETE FROM announcement_recipients
+        WHERE id NOT IN (
+            SELECT (SELECT r2.id FROM announcement_recipients r2
+                    WHERE r2.user_id = r1.user_id AND r2.announcement_id = r1.announcement_id
+                    ORDER BY r2.is_read DESC, r2.read_at DESC, r2.id
+                    LIMIT 1)
+            FROM announcement_recipients r1
+            GROUP BY r1.user_id, r1.announcement_id
+        )
+    """))
+    logger.warning(f"⚠️ Removed {result.rowcount} duplicate announcement recipients")
+
+def upgrade(connection: Connection) -> None:
+    # Tables created later by create_all get these indexes from the models
+    existing = set(inspect(connection).get_table_names())
+    if "announcement_recipients" in existing:
+        _dedupe_recipients(connection)
+    for name, table, columns, unique in INDEXES:
+        if table not in existing:
+            continue
+        if unique and _has_duplicates(connection, table, columns):
+            # Existing data predates the uniqueness rule; index it anyway and
+            # leave the clean-up to an admin rather than deleting rows here.
+            logger.warning(f"⚠️ {table}({', '.join(columns)}) has duplicates; creating {name} as non-unique")
+            unique = False
+        connection.execute(text(
+            f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+        ))
@@ -0,0 +1,25 @@
+"""``(created_at, id)`` indexes behind keyset pagination on the list endpoints.
+
+Rows with a NULL ``created_at`` would sort before every cursor and never be
+reachable past the first page, so they are backfilled first.
+"""
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+VERSION = 2
+DESCRIPTION = "keyset pagination indexes on (created_at, id)"
+
+TABLES = ["users", "announcements", "testimonials", "company_policies"]
+
+
+def upgrade(connection: Connection) -> None:
+    existing = set(inspect(connection).get_table_names())
+    for table in TABLES:
+        if table not in existing:
+            continue
+        connection.execute(text(
+            f"UPDATE {table} SET created_at = COALESCE(updated_at, CURRENT_TIMESTAMP) WHERE created_at IS NULL"
+        ))
+        connection.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_created_at_id ON {table} (created_at, id)"
+        ))
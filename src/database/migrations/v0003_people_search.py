@@ -0,0 +1,59 @@
+"""FTS5 index over user names, email, phone and address for ``/employees/search``.
+
+``users_fts`` is an external-content table: it stores only the index and
+reads column values from ``users`` by rowid. Triggers keep it in sync with
+inserts, deletes and updates of the indexed columns. Logins update
+``last_login`` only, so they do not touch the index.
+
+Only applies to SQLite builds with FTS5. Elsewhere the search endpoint falls
+back to prefix ``ILIKE`` matching.
+"""
+import logging
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import OperationalError
+
+logger = logging.getLogger(__name__)
+
+VERSION = 3
+DESCRIPTION = "FTS5 people-search index on users"
+
+COLUMNS = ("email", "first_name", "last_name", "contact_number", "address")
+
+_columns = ", ".join(COLUMNS)
+_new = ", ".join(f"new.{name}" for name in COLUMNS)
+_old = ", ".join(f"old.{name}" for name in COLUMNS)
+
+STATEMENTS = [
+    # prefix='2 3' keeps extra indexes for 2 and 3 character prefixes, the
+    # first keystrokes of a typeahead
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS users_fts USING fts5(
+        {_columns}, content='users', content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS users_fts_insert AFTER INSERT ON users BEGIN
+        INSERT INTO users_fts(rowid, {_columns}) VALUES (new.rowid, {_new});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS users_fts_delete AFTER DELETE ON users BEGIN
+        INSERT INTO users_fts(users_fts, rowid, {_columns}) VALUES ('delete', old.rowid, {_old});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS users_fts_update AFTER UPDATE OF {_columns} ON users BEGIN
+        INSERT INTO users_fts(users_fts, rowid, {_columns}) VALUES ('delete', old.rowid, {_old});
+        INSERT INTO users_fts(rowid, {_columns}) VALUES (new.rowid, {_new});
+    END""",
+    "INSERT INTO users_fts(users_fts) VALUES ('rebuild')",
+]
+
+
+def upgrade(connection: Connection) -> None:
+    if connection.dialect.name != "sqlite" or "users" not in inspect(connection).get_table_names():
+        return
+    try:
+        connection.execute(text("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)"))
+        connection.execute(text("DROP TABLE temp.fts5_probe"))
+    except OperationalError:
+        logger.warning("⚠️ SQLite was built without FTS5; /employees/search will use ILIKE prefix matching")
+        return
+    for statement in STATEMENTS:
+        connection.execute(text(statement))
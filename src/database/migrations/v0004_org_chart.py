@@ -0,0 +1,40 @@
+"""Backfill the ``user_hierarchy`` closure table from ``reporting_manager_id``.
+
+The table itself comes from the model via ``create_all``; from here on the
+listeners in ``src/database/hierarchy.py`` keep it current.
+"""
+import logging
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+VERSION = 4
+DESCRIPTION = "org chart closure table"
+
+# Longer chains than this can only come from a reporting cycle in old data
+MAX_DEPTH = 64
+
+
+def upgrade(connection: Connection) -> None:
+    tables = set(inspect(connection).get_table_names())
+    if not {"users", "user_hierarchy"} <= tables:
+        return
+    connection.execute(text("DELETE FROM user_hierarchy"))
+    connection.execute(text(f"""
+        INSERT INTO user_hierarchy (ancestor_id, descendant_id, depth)
+        WITH RECURSIVE chain(ancestor_id, descendant_id, depth) AS (
+            SELECT id, id, 0 FROM users
+            UNION ALL
+            SELECT users.reporting_manager_id, chain.descendant_id, chain.depth + 1
+            FROM chain JOIN users ON users.id = chain.ancestor_id
+            WHERE users.reporting_manager_id IS NOT NULL AND chain.depth < {MAX_DEPTH}
+        )
+        SELECT ancestor_id, descendant_id, MIN(depth) FROM chain GROUP BY ancestor_id, descendant_id
+    """))
+    cyclic = connection.execute(text(
+        "SELECT count(*) FROM user_hierarchy WHERE ancestor_id = descendant_id AND depth > 0"
+    )).scalar()
+    if cyclic:
+        logger.warning(f"⚠️ {cyclic} users are in a reporting_manager_id cycle; fix their managers")
@@ -0,0 +1,20 @@
+"""``announcement_reads`` for the lazy read-receipt mode.
+
+The table comes from the model via ``create_all``. Converting existing
+recipient rows depends on ``ANNOUNCEMENT_RECEIPTS`` and is an explicit step:
+``python src/database/receipts.py compact``.
+"""
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+VERSION = 5
+DESCRIPTION = "announcement read receipts"
+
+
+def upgrade(connection: Connection) -> None:
+    if "announcement_reads" not in inspect(connection).get_table_names():
+        return
+    connection.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_announcement_reads_user_announcement "
+        "ON announcement_reads (user_id, announcement_id)"
+    ))
@@ -0,0 +1,21 @@
+"""Inbox index on announcements and the ``announcement_unread_counts`` table.
+
+The inbox pages through ``(is_pinned, created_at, id)`` newest first; a NULL
+``is_pinned`` would break the keyset comparison, so those rows are set to
+false first. The counter table comes from the model via ``create_all`` and
+is filled at startup by ``receipts.fill_unread_counts``.
+"""
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+VERSION = 6
+DESCRIPTION = "announcement inbox index and unread counters"
+
+
+def upgrade(connection: Connection) -> None:
+    if "announcements" not in inspect(connection).get_table_names():
+        return
+    connection.execute(text("UPDATE announcements SET is_pinned = false WHERE is_pinned IS NULL"))
+    connection.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_announcements_inbox ON announcements (is_pinned, created_at, id)"
+    ))
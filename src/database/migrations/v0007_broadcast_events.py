@@ -0,0 +1,18 @@
+"""``broadcast_events``, the relay table of ``BROADCAST_BACKEND=table``.
+
+The table comes from the model via ``create_all``; rows only live for
+``BROADCAST_RETENTION_SECONDS``, so there is nothing to backfill.
+"""
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+VERSION = 7
+DESCRIPTION = "broadcast event relay table"
+
+
+def upgrade(connection: Connection) -> None:
+    if "broadcast_events" not in inspect(connection).get_table_names():
+        return
+    connection.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_broadcast_events_created_at ON broadcast_events (created_at)"
+    ))
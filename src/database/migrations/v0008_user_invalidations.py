@@ -0,0 +1,18 @@
+"""``user_invalidations``, the log other workers read cache invalidations from.
+
+The table comes from the model via ``create_all``; rows only live for the
+access-token lifetime, so there is nothing to backfill.
+"""
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+VERSION = 8
+DESCRIPTION = "user invalidation log"
+
+
+def upgrade(connection: Connection) -> None:
+    if "user_invalidations" not in inspect(connection).get_table_names():
+        return
+    connection.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_user_invalidations_created_at ON user_invalidations (created_at)"
+    ))
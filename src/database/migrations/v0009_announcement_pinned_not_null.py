@@ -0,0 +1,42 @@
+"""``announcements.is_pinned`` NOT NULL, defaulting to false.
+
+A NULL ``is_pinned`` drops the row out of the inbox keyset comparison on
+``(is_pinned, created_at, id)``. Version 6 only backfilled the NULLs that
+existed then, so they are backfilled again before the column is
+constrained. SQLite cannot add NOT NULL to an existing column without
+rebuilding the table, which its foreign keys rule out inside a
+migration transaction; there, triggers reject NULL instead. Fresh
+databases get the constraint from ``create_all``.
+"""
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+VERSION = 9
+DESCRIPTION = "announcements.is_pinned not null"
+
+SQLITE_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS announcements_is_pinned_insert BEFORE INSERT ON announcements
+    WHEN new.is_pinned IS NULL BEGIN
+        SELECT RAISE(ABORT, 'NOT NULL constraint failed: announcements.is_pinned');
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS announcements_is_pinned_update BEFORE UPDATE OF is_pinned ON announcements
+    WHEN new.is_pinned IS NULL BEGIN
+        SELECT RAISE(ABORT, 'NOT NULL constraint failed: announcements.is_pinned');
+    END""",
+]
+
+
+def upgrade(connection: Connection) -> None:
+    inspector = inspect(connection)
+    if "announcements" not in inspector.get_table_names():
+        return
+    column = next(column for column in inspector.get_columns("announcements") if column["name"] == "is_pinned")
+    if not column["nullable"]:
+        return
+    connection.execute(text("UPDATE announcements SET is_pinned = false WHERE is_pinned IS NULL"))
+    if connection.dialect.name == "sqlite":
+        for statement in SQLITE_TRIGGERS:
+            connection.execute(text(statement))
+        return
+    connection.execute(text("ALTER TABLE announcements ALTER COLUMN is_pinned SET DEFAULT false"))
+    connection.execute(text("ALTER TABLE announcements ALTER COLUMN is_pinned SET NOT NULL"))
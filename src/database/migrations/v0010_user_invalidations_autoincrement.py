@@ -0,0 +1,18 @@
+"""``user_invalidations`` ids never repeat.
+
+Workers apply the rows above the highest id they have seen. The sweeper
+deletes rows older than the access-token lifetime; on an emptied table
+SQLite would start again at id 1, below every worker's watermark, and
+those invalidations would be skipped. AUTOINCREMENT keeps ids rising.
+"""
+from sqlalchemy.engine import Connection
+
+from src.database.migrations._autoincrement import rebuild_with_autoincrement
+from src.database.models import UserInvalidation
+
+VERSION = 10
+DESCRIPTION = "user_invalidations AUTOINCREMENT ids"
+
+
+def upgrade(connection: Connection) -> None:
+    rebuild_with_autoincrement(connection, UserInvalidation.__table__)
@@ -0,0 +1,19 @@
+"""``broadcast_events`` ids never repeat.
+
+Each worker relays the events above the highest id it has seen. Events are
+pruned after ``BROADCAST_RETENTION_SECONDS``; after a quiet spell the table
+is empty and SQLite would start again at id 1, below every worker's
+watermark, so those events never reached other workers' streams.
+AUTOINCREMENT keeps ids rising.
+"""
+from sqlalchemy.engine import Connection
+
+from src.database.migrations._autoincrement import rebuild_with_autoincrement
+from src.database.models import BroadcastEvent
+
+VERSION = 11
+DESCRIPTION = "broadcast_events AUTOINCREMENT ids"
+
+
+def upgrade(connection: Connection) -> None:
+    rebuild_with_autoincrement(connection, BroadcastEvent.__table__)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Float, Text, Date, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Float, Text, Date, Enum, Index, false
 from sqlalchemy.orm import relationship
 import enum
 import uuid
@@ -13,6 +13,10 @@ class UserRole(str, enum.Enum):
     
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_role_is_active", "role", "is_active"),
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
 
     id = Column(UUID(), primary_key=True, default=uuid.uuid4)
     email = Column(String, unique=True, index=True, nullable=False)
@@ -25,7 +29,7 @@ class User(Base):
     address = Column(String)
     profile_picture_url = Column(String)
     joining_date = Column(DateTime)
-    reporting_manager_id = Column(UUID(), ForeignKey("users.id"), nullable=True)
+    reporting_manager_id = Column(UUID(), ForeignKey("users.id"), nullable=True, index=True)
     is_active = Column(Boolean, default=True)
     is_admin = Column(Boolean, default=False) 
     last_login = Column(DateTime)
@@ -43,26 +47,52 @@ class User(Base):
     assigned_tickets = relationship("Ticket", foreign_keys="Ticket.assigned_to", back_populates="assignee")
     announcements = relationship("Announcement", back_populates="author")
     testimonials = relationship("Testimonial", back_populates="user")
+
+class UserHierarchy(Base):
+    """Closure table of ``reporting_manager_id``: one row per (manager, report) pair at any depth.
+
+    Every user also has a depth 0 row to themselves. Maintained by the
+    listeners in ``src/database/hierarchy.py``.
+    """
+    __tablename__ = "user_hierarchy"
+    __table_args__ = (
+        Index("ix_user_hierarchy_descendant_depth", "descendant_id", "depth"),
+    )
+
+    ancestor_id = Column(UUID(), ForeignKey("users.id"), primary_key=True)
+    descendant_id = Column(UUID(), ForeignKey("users.id"), primary_key=True)
+    depth = Column(Integer, nullable=False)
     
 class Session(Base):
     __tablename__ = "sessions"
     
     id = Column(UUID(), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(), ForeignKey("users.id"))
-    token = Column(String, nullable=False)
+    user_id = Column(UUID(), ForeignKey("users.id"), index=True)
+    token = Column(String, nullable=False, unique=True, index=True)  # sha256 of the refresh token
     ip_address = Column(String)
     user_agent = Column(String)
-    expires_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.now)
     
     # Relationship
     user = relationship("User")
 
+class UserInvalidation(Base):
+    """A change to a user that other worker processes must drop cached state for."""
+    __tablename__ = "user_invalidations"
+    # Read by id watermark, so ids must not be reused once the sweeper empties the table
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(UUID(), nullable=False)
+    revoke_claims = Column(Boolean, nullable=False, default=False)  # also reject tokens issued before created_at
+    created_at = Column(DateTime, nullable=False, default=datetime.now, index=True)
+
 class PasswordResetToken(Base):
     __tablename__ = "password_reset_tokens"
     
     id = Column(UUID(), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(), ForeignKey("users.id"))
+    user_id = Column(UUID(), ForeignKey("users.id"), index=True)
     token = Column(String, nullable=False)
     expires_at = Column(DateTime, nullable=False)
     created_at = Column(DateTime, default=datetime.now)
@@ -74,7 +104,7 @@ class AttendanceRecord(Base):
     __tablename__ = "attendance_records"
     
     id = Column(UUID(), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(), ForeignKey("users.id"))
+    user_id = Column(UUID(), ForeignKey("users.id"), index=True)
     clock_in_time = Column(DateTime)
     clock_out_time = Column(DateTime)
     total_hours = Column(Float)
@@ -89,13 +119,13 @@ class ManualTimeEntry(Base):
     __tablename__ = "manual_time_entries"
     
     id = Column(UUID(), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(), ForeignKey("users.id"))
+    user_id = Column(UUID(), ForeignKey("users.id"), index=True)
     date = Column(Date, nullable=False)
     start_time = Column(DateTime, nullable=False)
     end_time = Column(DateTime, nullable=False)
     reason = Column(Text)
     status = Column(String, default="Pending")
-    manager_id = Column(UUID(), ForeignKey("users.id"))
+    manager_id = Column(UUID(), ForeignKey("users.id"), index=True)
     manager_comments = Column(Text)
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
@@ -121,8 +151,8 @@ class LeaveBalance(Base):
     __tablename__ = "leave_balances"
     
     id = Column(UUID(), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(), ForeignKey("users.id"))
-    leave_type_id = Column(UUID(), ForeignKey("leave_types.id"))
+    user_id = Column(UUID(), ForeignKey("users.id"), index=True)
+    leave_type_id = Column(UUID(), ForeignKey("leave_types.id"), index=True)
     balance = Column(Float, nullable=False)
     year = Column(Integer, nullable=False)
     
@@ -134,13 +164,13 @@ class LeaveRequest(Base):
     __tablename__ = "leave_requests"
     
     id = Column(UUID(), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(), ForeignKey("users.id"))
-    leave_type_id = Column(UUID(), ForeignKey("leave_types.id"))
+    user_id = Column(UUID(), ForeignKey("users.id"), index=True)
+    leave_type_id = Column(UUID(), ForeignKey("leave_types.id"), index=True)
     start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=False)
     reason = Column(Text)
     status = Column(String, default="Pending") 
-    approver_id = Column(UUID(), ForeignKey("users.id"))
+    approver_id = Column(UUID(), ForeignKey("users.id"), index=True)
     approver_comments = Column(Text)
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
@@ -167,11 +197,11 @@ class Referral(Base):
     __tablename__ = "referrals"
     
     id = Column(UUID(), primary_key=True, default=uuid.uuid4)
-    referrer_id = Column(UUID(), ForeignKey("users.id"))
+    referrer_id = Column(UUID(), ForeignKey("users.id"), index=True)
     candidate_name = Column(String, nullable=False)
     candidate_email = Column(String, nullable=False)
     candidate_phone = Column(String)
-    position_id = Column(UUID(), ForeignKey("job_positions.id"))
+    position_id = Column(UUID(), ForeignKey("job_positions.id"), index=True)
     resume_url = Column(String)
     referral_note = Column(Text)
     status = Column(String, default="Submitted")
@@ -200,13 +230,13 @@ class PerformanceRating(Base):
     __tablename__ = "performance_ratings"
     
     id = Column(UUID(), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(), ForeignKey("users.id"))
-    cycle_id = Column(UUID(), ForeignKey("performance_cycles.id"))
-    manager_id = Column(UUID(), ForeignKey("users.id"))
+    user_id = Column(UUID(), ForeignKey("users.id"), index=True)
+    cycle_id = Column(UUID(), ForeignKey("performance_cycles.id"), index=True)
+    manager_id = Column(UUID(), ForeignKey("users.id"), index=True)
     rating_value = Column(Float)
     feedback = Column(Text)
     is_finalized = Column(Boolean, default=False)
-    finalized_by = Column(UUID(), ForeignKey("users.id"))
+    finalized_by = Column(UUID(), ForeignKey("users.id"), index=True)
     finalized_at = Column(DateTime)
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
@@ -236,8 +266,8 @@ class Event(Base):
     start_time = Column(DateTime, nullable=False)
     end_time = Column(DateTime, nullable=False)
     location = Column(String)
-    organizer_id = Column(UUID(), ForeignKey("users.id"))
-    type_id = Column(UUID(), ForeignKey("event_types.id"))
+    organizer_id = Column(UUID(), ForeignKey("users.id"), index=True)
+    type_id = Column(UUID(), ForeignKey("event_types.id"), index=True)
     is_recurring = Column(Boolean, default=False)
     recurrence_pattern = Column(String)
     is_company_wide = Column(Boolean, default=False)
@@ -253,8 +283,8 @@ class EventAttendee(Base):
     __tablename__ = "event_attendees"
     
     id = Column(UUID(), primary_key=True, default=uuid.uuid4)
-    event_id = Column(UUID(), ForeignKey("events.id"))
-    user_id = Column(UUID(), ForeignKey("users.id"))
+    event_id = Column(UUID(), ForeignKey("events.id"), index=True)
+    user_id = Column(UUID(), ForeignKey("users.id"), index=True)
     status = Column(String, default="Pending") 
     response_date = Column(DateTime)
     
@@ -286,13 +316,13 @@ class Ticket(Base):
     __tablename__ = "tickets"
     
     id = Column(UUID(), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(), ForeignKey("users.id"))
-    category_id = Column(UUID(), ForeignKey("ticket_categories.id"))
+    user_id = Column(UUID(), ForeignKey("users.id"), index=True)
+    category_id = Column(UUID(), ForeignKey("ticket_categories.id"), index=True)
     title = Column(String, nullable=False)
     description = Column(Text)
     status = Column(String, default="Open") 
     priority = Column(String, default="Medium")
-    assigned_to = Column(UUID(), ForeignKey("users.id"))
+    assigned_to = Column(UUID(), ForeignKey("users.id"), index=True)
     resolution_notes = Column(Text)
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
@@ -305,12 +335,17 @@ class Ticket(Base):
 
 class Announcement(Base):
     __tablename__ = "announcements"
+    __table_args__ = (
+        Index("ix_announcements_created_at_id", "created_at", "id"),
+        Index("ix_announcements_inbox", "is_pinned", "created_at", "id"),
+    )
     
     id = Column(UUID(), primary_key=True, default=uuid.uuid4)
     title = Column(String, nullable=False)
     content = Column(Text)
-    author_id = Column(UUID(), ForeignKey("users.id"))
-    is_pinned = Column(Boolean, default=False)
+    author_id = Column(UUID(), ForeignKey("users.id"), index=True)
+    # Part of the inbox keyset, which a NULL would break
+    is_pinned = Column(Boolean, nullable=False, default=False, server_default=false())
     start_date = Column(Date)
     end_date = Column(Date)
     created_at = Column(DateTime, default=datetime.now)
@@ -322,9 +357,12 @@ class Announcement(Base):
 
 class AnnouncementRecipient(Base):
     __tablename__ = "announcement_recipients"
+    __table_args__ = (
+        Index("ix_announcement_recipients_user_announcement", "user_id", "announcement_id", unique=True),
+    )
     
     id = Column(UUID(), primary_key=True, default=uuid.uuid4)
-    announcement_id = Column(UUID(), ForeignKey("announcements.id"))
+    announcement_id = Column(UUID(), ForeignKey("announcements.id"), index=True)
     user_id = Column(UUID(), ForeignKey("users.id"))
     is_read = Column(Boolean, default=False)
     read_at = Column(DateTime)
@@ -333,17 +371,51 @@ class AnnouncementRecipient(Base):
     announcement = relationship("Announcement", back_populates="recipients")
     user = relationship("User")
 
+class AnnouncementRead(Base):
+    """Read receipt; with ANNOUNCEMENT_RECEIPTS=lazy only reads are stored, not recipients."""
+    __tablename__ = "announcement_reads"
+    __table_args__ = (
+        Index("ix_announcement_reads_user_announcement", "user_id", "announcement_id"),
+    )
+
+    announcement_id = Column(UUID(), ForeignKey("announcements.id"), primary_key=True)
+    user_id = Column(UUID(), ForeignKey("users.id"), primary_key=True)
+    read_at = Column(DateTime, nullable=False, default=datetime.now)
+
+class AnnouncementUnreadCount(Base):
+    """Unread announcements per user, kept current by src/database/receipts.py."""
+    __tablename__ = "announcement_unread_counts"
+
+    user_id = Column(UUID(), ForeignKey("users.id"), primary_key=True)
+    unread = Column(Integer, nullable=False, default=0)
+
+class BroadcastEvent(Base):
+    """Live event relayed between worker processes when BROADCAST_BACKEND=table."""
+    __tablename__ = "broadcast_events"
+    # Relayed by id watermark, so ids must not be reused once pruning empties the table
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    event_id = Column(String(32), nullable=False)
+    event_type = Column(String, nullable=False)
+    payload = Column(Text, nullable=False)
+    origin = Column(String(32), nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.now, index=True)
+
 class CompanyPolicy(Base):
     __tablename__ = "company_policies"
+    __table_args__ = (
+        Index("ix_company_policies_created_at_id", "created_at", "id"),
+    )
     
     id = Column(UUID(), primary_key=True, default=uuid.uuid4)
-    title = Column(String, nullable=False)
+    title = Column(String, nullable=False, unique=True, index=True)
     description = Column(Text)
     category = Column(String)
     document_url = Column(String)
     version = Column(String)
     is_active = Column(Boolean, default=True)
-    created_by = Column(UUID(), ForeignKey("users.id"))
+    created_by = Column(UUID(), ForeignKey("users.id"), index=True)
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
     
@@ -352,11 +424,14 @@ class CompanyPolicy(Base):
 
 class Testimonial(Base):
     __tablename__ = "testimonials"
+    __table_args__ = (
+        Index("ix_testimonials_created_at_id", "created_at", "id"),
+    )
     
     id = Column(UUID(), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(), ForeignKey("users.id"))
+    user_id = Column(UUID(), ForeignKey("users.id"), index=True)
     content = Column(Text, nullable=False)
-    status = Column(String, default="Pending")
+    status = Column(String, default="Pending", index=True)
     admin_comments = Column(Text)
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
@@ -370,3 +445,9 @@ class Avatar(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, index=True)
     url = Column(String, nullable=False)  
+
+
+# Registers the User listeners that keep user_hierarchy current
+from src.database import hierarchy  # noqa: E402,F401
+# ...and the ones that keep announcement_unread_counts current
+from src.database import receipts  # noqa: E402,F401
@@ -0,0 +1,110 @@
+import threading
+import time
+from typing import Type
+
+from sqlalchemy import exc, event
+from sqlalchemy.pool import Pool, QueuePool
+
+
+class PoolStats:
+    """Checkout counters and wait times for one engine's connection pool.
+
+    ``wait`` is the time from asking the pool for a connection until one is
+    handed out, including opening a new connection when the pool is below
+    size or allowed to overflow. A growing average wait, or any timeouts,
+    means requests are queueing for connections and the pool is too small for
+    the number of concurrent workers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.peak_checked_out = 0
+        self.peak_overflow = 0
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def record_checkin(self) -> None:
+        with self._lock:
+            self.checkins += 1
+
+    def record_checkout(self, pool: Pool, wait_seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += wait_seconds
+            self.wait_max = max(self.wait_max, wait_seconds)
+            if isinstance(pool, QueuePool):
+                self.peak_checked_out = max(self.peak_checked_out, pool.checkedout())
+                self.peak_overflow = max(self.peak_overflow, pool.overflow())
+
+    def record_timeout(self, wait_seconds: float) -> None:
+        with self._lock:
+            self.timeouts += 1
+            self.wait_max = max(self.wait_max, wait_seconds)
+
+    def snapshot(self, pool: Pool) -> dict:
+        with self._lock:
+            stats = {
+                "pool_class": type(pool).__name__,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.wait_max * 1000, 3),
+                "peak_checked_out": self.peak_checked_out,
+                "peak_overflow": self.peak_overflow,
+            }
+        if isinstance(pool, QueuePool):
+            stats.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=pool.overflow(),
+            )
+        return stats
+
+
+class _TimedPool:
+    """Mixin timing ``Pool.connect``; the stats object is bound per engine by ``timed_pool_class``."""
+
+    pool_stats: PoolStats
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.pool_stats.record_timeout(time.perf_counter() - start)
+            raise
+        self.pool_stats.record_checkout(self, time.perf_counter() - start)
+        return connection
+
+
+def timed_pool_class(base: Type[Pool], stats: PoolStats) -> Type[Pool]:
+    """Subclass of ``base`` reporting into ``stats``.
+
+    A class rather than an event listener because SQLAlchemy has no event
+    for "connection requested", and ``Pool.recreate`` (on ``engine.dispose``)
+    builds the replacement pool from ``self.__class__``, so the timing survives.
+    """
+    return type(f"Timed{base.__name__}", (_TimedPool, base), {"pool_stats": stats})
+
+
+def instrument_engine(engine, stats: PoolStats) -> None:
+    """Count physical connects and checkins of ``engine`` (sync or ``async_engine.sync_engine``)."""
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        stats.record_connect()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        stats.record_checkin()
@@ -0,0 +1,346 @@
+"""Announcement read state, in either ``ANNOUNCEMENT_RECEIPTS`` mode.
+
+``materialized``: publishing writes an unread ``announcement_recipients``
+row for every employee in the audience; reading flips it.
+
+``lazy``: nothing is written at publish time. The recipients of an
+announcement are the users the audience rule matches who already existed
+when it was published, and only actual reads are stored, in
+``announcement_reads``. Storage grows with reads instead of with
+employees x announcements.
+
+Routes go through the functions here, so both modes serve the same API.
+Every write also adjusts ``announcement_unread_counts``, which makes the
+unread badge a primary-key lookup. Users without a counter row (after a
+mode switch) are counted from scratch until the next startup fills their
+row in.
+
+Switching modes converts the stored rows:
+
+Usage:
+    python src/database/receipts.py status
+    python src/database/receipts.py compact    # materialized -> lazy
+    python src/database/receipts.py expand     # lazy -> materialized
+"""
+import argparse
+import os
+import sys
+import uuid
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from sqlalchemy import (
+    and_, case, create_engine, delete, event, exists, func, insert, inspect, literal, literal_column, or_, select, true, tuple_, update
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql import Select
+
+# Module import: models.py imports this module, possibly while fanout is still loading
+from src.database import fanout
+from src.database.models import Announcement, AnnouncementRead, AnnouncementRecipient, AnnouncementUnreadCount, User
+from src.resources.constants import ANNOUNCEMENT_RECEIPTS, DATABASE_URL
+from src.utils.pagination import PageParams, cursor_key, decode_pinned_cursor, encode_pinned_cursor
+
+RECEIPT_MODES = ("materialized", "lazy")
+
+recipients = AnnouncementRecipient.__table__
+reads = AnnouncementRead.__table__
+unread_counts = AnnouncementUnreadCount.__table__
+
+
+def lazy_mode() -> bool:
+    return ANNOUNCEMENT_RECEIPTS == "lazy"
+
+def addressed(announcement=Announcement, user=User):
+    """Lazy-mode recipients: the audience, limited to users who existed when ``announcement`` was published."""
+    return and_(fanout.in_audience(user), user.created_at <= announcement.created_at)
+
+def receipt_id(announcement_id: uuid.UUID, user_id: uuid.UUID) -> uuid.UUID:
+    """Stable recipient id in lazy mode, where there is no recipient row to take it from."""
+    return uuid.uuid5(announcement_id, str(user_id))
+
+def _user_id(value):
+    return literal(value, type_=reads.c.user_id.type)
+
+def insert_ignoring_duplicates(dialect_name: str, table):
+    """``INSERT`` that skips rows whose key already exists, where the backend supports it."""
+    if dialect_name == "sqlite":
+        return sqlite.insert(table).on_conflict_do_nothing()
+    if dialect_name == "postgresql":
+        return postgresql.insert(table).on_conflict_do_nothing()
+    return insert(table)
+
+
+def count_unread(user_id) -> Select:
+    """``COUNT`` of ``user_id``'s unread announcements; ``user_id`` may be a value or a correlated column."""
+    if not lazy_mode():
+        return select(func.count()).select_from(recipients).where(
+            recipients.c.user_id == user_id, recipients.c.is_read == False
+        )
+    member = aliased(User)
+    return (
+        select(func.count())
+        .select_from(Announcement)
+        .join(member, member.id == user_id)
+        .where(addressed(user=member), ~exists().where(
+            AnnouncementRead.announcement_id == Announcement.id, AnnouncementRead.user_id == user_id
+        ))
+    )
+
+def _unread_holders(announcement_id: uuid.UUID) -> Select:
+    """Ids of the users who have not read ``announcement_id`` yet."""
+    if not lazy_mode():
+        return select(recipients.c.user_id).where(
+            recipients.c.announcement_id == announcement_id, recipients.c.is_read == False
+        )
+    return (
+        select(User.id)
+        .join(Announcement, Announcement.id == announcement_id)
+        .where(addressed(), ~exists().where(
+            AnnouncementRead.announcement_id == announcement_id, AnnouncementRead.user_id == User.id
+        ))
+    )
+
+async def _adjust_unread(db: AsyncSession, delta: int, *conditions) -> None:
+    adjusted = unread_counts.c.unread + delta
+    await db.execute(
+        update(unread_counts)
+        .where(*conditions)
+        .values(unread=case((adjusted < 0, 0), else_=adjusted))
+    )
+
+
+async def publish(db: AsyncSession, announcement: Announcement) -> int:
+    """Record the audience of a new announcement; returns its size."""
+    if not lazy_mode():
+        count = await fanout.fan_out(db, announcement.id)
+    else:
+        count = await db.scalar(select(func.count()).select_from(User).where(addressed(announcement)))
+    await _adjust_unread(db, 1, unread_counts.c.user_id.in_(_unread_holders(announcement.id)))
+    return count
+
+async def recipient_state(db: AsyncSession, announcement_id: uuid.UUID, user_id: uuid.UUID) -> Optional[AnnouncementRecipient]:
+    """The caller's recipient entry, or ``None`` when the announcement is not addressed to them."""
+    if not lazy_mode():
+        return await db.scalar(select(AnnouncementRecipient).where(
+            AnnouncementRecipient.user_id == user_id,
+            AnnouncementRecipient.announcement_id == announcement_id
+        ))
+    row = (await db.execute(
+        select(AnnouncementRead.read_at)
+        .select_from(Announcement)
+        .join(User, User.id == user_id)
+        .outerjoin(AnnouncementRead, and_(
+            AnnouncementRead.announcement_id == Announcement.id, AnnouncementRead.user_id == user_id
+        ))
+        .where(Announcement.id == announcement_id, addressed())
+    )).first()
+    if row is None:
+        return None
+    # Transient, never added to the session: same shape as a materialized row
+    return AnnouncementRecipient(
+        id=receipt_id(announcement_id, user_id),
+        announcement_id=announcement_id,
+        user_id=user_id,
+        is_read=row.read_at is not None,
+        read_at=row.read_at,
+    )
+
+async def _mark_read_where(db: AsyncSession, user_id: uuid.UUID, *conditions) -> int:
+    """Mark the user's unread announcements matching ``conditions`` read in one statement; returns how many."""
+    now = datetime.now()
+    if not lazy_mode():
+        result = await db.execute(
+            update(AnnouncementRecipient)
+            .where(
+                AnnouncementRecipient.user_id == user_id,
+                AnnouncementRecipient.is_read == False,
+                AnnouncementRecipient.announcement_id.in_(select(Announcement.id).where(*conditions))
+            )
+            .values(is_read=True, read_at=now)
+            .execution_options(synchronize_session=False)
+        )
+    else:
+        # Only inserts for announcements addressed to the user and not read yet
+        result = await db.execute(insert_ignoring_duplicates(db.bind.dialect.name, reads).from_select(
+            ["announcement_id", "user_id", "read_at"],
+            select(Announcement.id, _user_id(user_id), literal(now, type_=reads.c.read_at.type))
+            .select_from(Announcement)
+            .join(User, User.id == user_id)
+            .where(*conditions, addressed(), ~exists().where(
+                AnnouncementRead.announcement_id == Announcement.id, AnnouncementRead.user_id == user_id
+            ))
+        ))
+    if result.rowcount:
+        await _adjust_unread(db, -result.rowcount, unread_counts.c.user_id == user_id)
+    return result.rowcount
+
+async def mark_read(db: AsyncSession, announcement_id: uuid.UUID, user_id: uuid.UUID) -> Optional[bool]:
+    """``True`` if newly marked read, ``False`` if it already was, ``None`` if not addressed to the user."""
+    if await _mark_read_where(db, user_id, Announcement.id == announcement_id):
+        return True
+    return False if await recipient_state(db, announcement_id, user_id) is not None else None
+
+async def mark_many_read(db: AsyncSession, announcement_ids: List[uuid.UUID], user_id: uuid.UUID) -> int:
+    """Mark the listed announcements read; ids that are unknown, not addressed or already read are skipped."""
+    if not announcement_ids:
+        return 0
+    return await _mark_read_where(db, user_id, Announcement.id.in_(announcement_ids))
+
+async def mark_all_read(db: AsyncSession, user_id: uuid.UUID, up_to: datetime) -> int:
+    """Mark every announcement created at or before ``up_to`` read."""
+    if up_to.tzinfo is not None:
+        # created_at is stored as naive local time
+        up_to = up_to.astimezone().replace(tzinfo=None)
+    return await _mark_read_where(db, user_id, Announcement.created_at <= up_to)
+
+async def forget(db: AsyncSession, announcement_id: uuid.UUID) -> None:
+    """Drop all read state of a deleted announcement, whichever mode wrote it."""
+    await _adjust_unread(db, -1, unread_counts.c.user_id.in_(_unread_holders(announcement_id)))
+    await db.execute(delete(AnnouncementRecipient).where(AnnouncementRecipient.announcement_id == announcement_id))
+    await db.execute(delete(AnnouncementRead).where(AnnouncementRead.announcement_id == announcement_id))
+
+async def unread_count(db: AsyncSession, user_id: uuid.UUID) -> int:
+    """The user's counter row; counted from scratch when there is none yet."""
+    unread = await db.scalar(select(unread_counts.c.unread).where(unread_counts.c.user_id == user_id))
+    if unread is None:
+        unread = await db.scalar(count_unread(user_id))
+    return unread
+
+async def inbox(db: AsyncSession, user_id: uuid.UUID, page: PageParams) -> Tuple[List, Optional[str]]:
+    """One page of ``(announcement, is_read, read_at)`` for the user, pinned first, then newest first."""
+    if not lazy_mode():
+        query = select(Announcement, recipients.c.is_read, recipients.c.read_at).join(recipients, and_(
+            recipients.c.announcement_id == Announcement.id, recipients.c.user_id == user_id
+        ))
+    else:
+        query = (
+            select(Announcement, AnnouncementRead.read_at.is_not(None).label("is_read"), AnnouncementRead.read_at)
+            .select_from(Announcement)
+            .join(User, User.id == user_id)
+            .outerjoin(AnnouncementRead, and_(
+                AnnouncementRead.announcement_id == Announcement.id, AnnouncementRead.user_id == user_id
+            ))
+            .where(addressed())
+        )
+    key = (Announcement.is_pinned, Announcement.created_at, Announcement.id)
+    if page.cursor:
+        query = query.where(tuple_(*key) < cursor_key(key, decode_pinned_cursor(page.cursor)))
+    query = query.order_by(*(column.desc() for column in key))
+    rows = (await db.execute(query.limit(page.limit + 1))).all()
+    if len(rows) <= page.limit:
+        return rows, None
+    last = rows[page.limit - 1].Announcement
+    return rows[:page.limit], encode_pinned_cursor(last.is_pinned, last.created_at, last.id)
+
+
+def fill_unread_counts(connection: Connection) -> int:
+    """Create the counter row of every user who has none; returns how many were added."""
+    result = connection.execute(insert_ignoring_duplicates(connection.dialect.name, unread_counts).from_select(
+        ["user_id", "unread"],
+        select(User.id, count_unread(User.id).scalar_subquery())
+        .where(~exists().where(unread_counts.c.user_id == User.id))
+    ))
+    return result.rowcount
+
+def recount_unread(connection: Connection, user_ids: List[uuid.UUID]) -> None:
+    """Recount, or create, the counter rows of ``user_ids``: for bulk statements, which skip the listeners below."""
+    if not user_ids:
+        return
+    connection.execute(delete(unread_counts).where(unread_counts.c.user_id.in_(user_ids)))
+    connection.execute(insert(unread_counts).from_select(
+        ["user_id", "unread"],
+        select(User.id, count_unread(User.id).scalar_subquery()).where(User.id.in_(user_ids))
+    ))
+
+@event.listens_for(User, "after_insert")
+def _add_unread_count(mapper, connection, target):
+    connection.execute(insert(unread_counts).values(user_id=target.id, unread=count_unread(target.id).scalar_subquery()))
+
+@event.listens_for(User, "after_update")
+def _recount_unread(mapper, connection, target):
+    # Role and active flag decide which announcements a user is addressed
+    changes = inspect(target).attrs
+    if changes.role.history.has_changes() or changes.is_active.history.has_changes():
+        connection.execute(
+            update(unread_counts)
+            .where(unread_counts.c.user_id == target.id)
+            .values(unread=count_unread(target.id).scalar_subquery())
+        )
+
+
+def check_receipt_storage(connection: Connection, mode: str = ANNOUNCEMENT_RECEIPTS) -> Optional[str]:
+    """The conversion command to run when stored rows belong to the other mode, so startup can warn."""
+    if mode == "lazy" and connection.execute(select(recipients.c.id).limit(1)).first():
+        return "compact"
+    if mode == "materialized" and connection.execute(select(reads.c.user_id).limit(1)).first():
+        return "expand"
+    return None
+
+def compact(connection: Connection) -> dict:
+    """materialized -> lazy: keep the reads, drop every recipient row."""
+    moved = connection.execute(insert_ignoring_duplicates(connection.dialect.name, reads).from_select(
+        ["announcement_id", "user_id", "read_at"],
+        select(recipients.c.announcement_id, recipients.c.user_id, func.coalesce(recipients.c.read_at, func.now()))
+        .where(recipients.c.is_read == True)
+    )).rowcount
+    dropped = connection.execute(delete(recipients)).rowcount
+    # Counted the other mode's way; refilled at the next startup
+    connection.execute(delete(unread_counts))
+    return {"reads": moved, "recipient_rows_removed": dropped}
+
+def expand(connection: Connection) -> dict:
+    """lazy -> materialized: one recipient row per addressed user, read or not."""
+    new_id = fanout.new_uuid_sql(connection.dialect)
+    if new_id is None:
+        raise SystemExit(f"Expanding receipts is not supported on {connection.dialect.name}")
+    announcement, user, read = Announcement.__table__.alias("a"), User.__table__.alias("u"), reads.alias("r")
+    created = connection.execute(insert(recipients).from_select(
+        ["id", "announcement_id", "user_id", "is_read", "read_at"],
+        select(literal_column(new_id), announcement.c.id, user.c.id, read.c.user_id.is_not(None), read.c.read_at)
+        .select_from(announcement.join(user, true()).outerjoin(read, and_(
+            read.c.announcement_id == announcement.c.id, read.c.user_id == user.c.id
+        )))
+        .where(or_(addressed(announcement.c, user.c), read.c.user_id.is_not(None)))
+    )).rowcount
+    connection.execute(delete(reads))
+    connection.execute(delete(unread_counts))
+    return {"recipient_rows": created}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=DATABASE_URL)
+    parser.add_argument("command", choices=("status", "compact", "expand"))
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    if args.command == "status":
+        with engine.connect() as connection:
+            recipient_rows = connection.execute(select(func.count()).select_from(recipients)).scalar()
+            read_rows = connection.execute(select(func.count()).select_from(reads)).scalar()
+            pending = check_receipt_storage(connection)
+        print(f"ANNOUNCEMENT_RECEIPTS={ANNOUNCEMENT_RECEIPTS}")
+        print(f"  announcement_recipients  {recipient_rows} rows")
+        print(f"  announcement_reads       {read_rows} rows")
+        if pending:
+            print(f"  stored rows belong to the other mode; run `python src/database/receipts.py {pending}`")
+        return
+
+    with engine.begin() as connection:
+        result = compact(connection) if args.command == "compact" else expand(connection)
+    if engine.dialect.name == "sqlite":
+        with engine.connect() as connection:
+            connection.exec_driver_sql("VACUUM")
+    target = "lazy" if args.command == "compact" else "materialized"
+    print(", ".join(f"{name}={count}" for name, count in result.items()))
+    print(f"✅ Converted; start the app with ANNOUNCEMENT_RECEIPTS={target}")
+
+
+if __name__ == "__main__":
+    main()
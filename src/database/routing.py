@@ -0,0 +1,114 @@
+"""Routing of read-only request sessions to replica engines.
+
+Handlers that only read take ``Depends(get_read_db)`` instead of
+``Depends(get_async_db)``. Their sessions go round-robin to the replicas
+unless:
+
+- no replica is configured,
+- the request sends ``X-Read-Consistency: primary`` (per-request override), or
+- the same client committed a write within ``DB_REPLICA_STICKY_SECONDS``
+  (read-your-writes: replicas may lag behind the primary).
+
+A route that must always read from the primary simply keeps
+``get_async_db``. On SQLite the "replica" is a second, read-only
+(``mode=ro``) connection pool on the same WAL file: readers then never
+queue behind the primary pool's writers and cannot write by mistake.
+"""
+import hashlib
+import threading
+import time
+from itertools import count
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from src.resources.settings import DatabaseSettings
+
+CONSISTENCY_HEADER = "x-read-consistency"
+
+# Prune the write-recency map once it grows past this many clients
+_STICKY_PRUNE_SIZE = 4096
+
+
+def sqlite_read_only_url(url: str) -> Optional[str]:
+    """URI for a read-only connection to the same SQLite file, or None for in-memory databases."""
+    parsed = make_url(url)
+    if parsed.database in (None, "", ":memory:"):
+        return None
+    return f"sqlite:///file:{parsed.database}?mode=ro&uri=true"
+
+def replica_urls(settings: DatabaseSettings) -> List[str]:
+    if settings.replica_urls:
+        return list(settings.replica_urls)
+    if settings.backend == "sqlite" and settings.sqlite_read_pool:
+        read_only = sqlite_read_only_url(settings.url)
+        return [read_only] if read_only else []
+    return []
+
+
+def client_key(request) -> str:
+    """Identify the caller for read-your-writes: its bearer token, else its address."""
+    credential = request.headers.get("authorization") or (request.client.host if request.client else "")
+    return hashlib.blake2b(credential.encode(), digest_size=12).hexdigest()
+
+
+class ReadRouter:
+    """Picks the session factory for each read-only request and counts the split."""
+
+    def __init__(self, primary: async_sessionmaker, replicas: List[Tuple[str, AsyncEngine, async_sessionmaker]],
+                 sticky_seconds: float):
+        self.primary = primary
+        self.replicas = replicas
+        self.sticky_seconds = sticky_seconds
+        self._next = count()
+        self._last_write: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.writes = 0
+        self.primary_reads = {"no_replica": 0, "forced": 0, "sticky": 0}
+        self.replica_reads = {name: 0 for name, _, _ in replicas}
+
+    def mark_write(self, key: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self.writes += 1
+            self._last_write[key] = now
+            if len(self._last_write) > _STICKY_PRUNE_SIZE:
+                cutoff = now - self.sticky_seconds
+                self._last_write = {k: at for k, at in self._last_write.items() if at >= cutoff}
+
+    def _recently_wrote(self, key: str) -> bool:
+        last_write = self._last_write.get(key)
+        return last_write is not None and time.monotonic() - last_write < self.sticky_seconds
+
+    def choose(self, key: str, force_primary: bool = False) -> Tuple[str, async_sessionmaker]:
+        if not self.replicas:
+            reason = "no_replica"
+        elif force_primary:
+            reason = "forced"
+        elif self._recently_wrote(key):
+            reason = "sticky"
+        else:
+            name, _, factory = self.replicas[next(self._next) % len(self.replicas)]
+            with self._lock:
+                self.replica_reads[name] += 1
+            return name, factory
+        with self._lock:
+            self.primary_reads[reason] += 1
+        return "primary", self.primary
+
+    def stats(self) -> dict:
+        with self._lock:
+            primary_reads = dict(self.primary_reads)
+            replica_reads = dict(self.replica_reads)
+            writes = self.writes
+        total_reads = sum(primary_reads.values()) + sum(replica_reads.values())
+        return {
+            "replicas": list(replica_reads),
+            "sticky_seconds": self.sticky_seconds,
+            "write_sessions": writes,
+            "reads": total_reads,
+            "primary_reads": primary_reads,
+            "replica_reads": replica_reads,
+            "replica_ratio": round(sum(replica_reads.values()) / total_reads, 4) if total_reads else 0.0,
+        }
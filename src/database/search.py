@@ -0,0 +1,193 @@
+"""People search behind ``/employees/search``, plus rebuild and benchmark commands.
+
+Usage:
+    python src/database/search.py rebuild
+    python src/database/search.py benchmark --users 100000
+
+On SQLite the query goes through the ``users_fts`` FTS5 index (migration
+0003). Each word of the query becomes a prefix term, results are ranked by
+bm25 with names weighted above email, phone and address. Other backends,
+or SQLite builds without FTS5, use prefix ``ILIKE`` on the same columns.
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from statistics import median
+from typing import Dict, List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from sqlalchemy import column, create_engine, insert, literal_column, or_, select, table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from src.database.migrations import v0003_people_search
+from src.database.models import User
+from src.resources.constants import DATABASE_URL
+
+SEARCH_COLUMNS = v0003_people_search.COLUMNS
+# bm25 weights in SEARCH_COLUMNS order; a name match counts most, address least
+SEARCH_WEIGHTS = (4.0, 10.0, 10.0, 2.0, 1.0)
+MAX_TERMS = 8
+
+_fts_available: Dict[str, bool] = {}
+
+users_fts = table("users_fts", column("rowid"))
+
+
+def search_terms(q: str) -> List[str]:
+    """Words of ``q``; punctuation is dropped so user input never reaches FTS5 query syntax."""
+    return re.findall(r"[^\W_]+", q.lower())[:MAX_TERMS]
+
+def search_statement(terms: List[str], limit: int, use_fts: bool) -> Select:
+    if use_fts:
+        match = " ".join(f'"{term}"*' for term in terms)
+        weights = ", ".join(str(weight) for weight in SEARCH_WEIGHTS)
+        return (
+            select(User)
+            .join(users_fts, users_fts.c.rowid == literal_column("users.rowid"))
+            .where(text("users_fts MATCH :match").bindparams(match=match))
+            .order_by(text(f"bm25(users_fts, {weights})"), User.last_name, User.first_name)
+            .limit(limit)
+        )
+    conditions = [
+        or_(*(getattr(User, name).ilike(f"{term}%") for name in SEARCH_COLUMNS)) for term in terms
+    ]
+    return select(User).where(*conditions).order_by(User.last_name, User.first_name, User.id).limit(limit)
+
+
+def has_search_index(connection: Connection) -> bool:
+    if connection.dialect.name != "sqlite":
+        return False
+    return connection.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'users_fts'"
+    )).first() is not None
+
+async def uses_fts(db: AsyncSession) -> bool:
+    """Whether this session's database has the FTS5 index, checked once per engine."""
+    key = str(db.bind.url)
+    if key not in _fts_available:
+        _fts_available[key] = await db.run_sync(lambda session: has_search_index(session.connection()))
+    return _fts_available[key]
+
+def rebuild_search_index(connection: Connection) -> bool:
+    """Re-read every row of ``users`` into the index, e.g. after rowids changed."""
+    if not has_search_index(connection):
+        return False
+    connection.execute(text("INSERT INTO users_fts(users_fts) VALUES ('rebuild')"))
+    return True
+
+
+FIRST_NAMES = ["james", "maria", "arjun", "li", "fatima", "john", "olga", "kenji", "amara", "lucas",
+               "priya", "noah", "sofia", "omar", "chen", "elena", "david", "aisha", "mateo", "yuki"]
+LAST_NAMES = ["smith", "garcia", "sharma", "wang", "khan", "johnson", "ivanova", "tanaka", "okafor",
+              "silva", "patel", "brown", "rossi", "hassan", "zhang", "novak", "miller", "ali", "lopez", "sato"]
+STREETS = ["main street", "park avenue", "station road", "lake view", "hill crescent", "market lane"]
+
+
+def _time(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return median(samples) * 1000
+
+def benchmark_search(users: int, queries: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    rows = [
+        {
+            "email": f"{first}.{last}{i}@example.com",
+            "hashed_password": "x",
+            "first_name": first.title(),
+            "last_name": last.title(),
+            "contact_number": f"+91{rng.randrange(10 ** 9, 10 ** 10)}",
+            "address": f"{rng.randrange(1, 999)} {rng.choice(STREETS)}",
+        }
+        for i, (first, last) in enumerate(
+            (rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)) for _ in range(users)
+        )
+    ]
+    # What an admin types: prefixes of one or two name words
+    samples = []
+    for _ in range(queries):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        samples.append(rng.choice([first[:2], first[:3], last[:4], f"{first} {last[:2]}"]))
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'search.db')}")
+        User.__table__.create(engine)
+        with engine.begin() as connection:
+            connection.execute(insert(User), rows[1000:])
+        start = time.perf_counter()
+        with engine.begin() as connection:
+            connection.execute(insert(User), rows[:1000])
+        plain_insert_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        with engine.begin() as connection:
+            v0003_people_search.upgrade(connection)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        def substring_scan(connection, q):
+            # What /employees/filter does today: '%x%' on every column, keyset ordered
+            pattern = f"%{q}%"
+            return connection.execute(
+                select(User.id)
+                .where(or_(*(getattr(User, name).ilike(pattern) for name in SEARCH_COLUMNS)))
+                .order_by(User.created_at, User.id)
+                .limit(10)
+            ).all()
+
+        def run(connection, q, use_fts):
+            statement = search_statement(search_terms(q), 10, use_fts)
+            return connection.execute(statement.with_only_columns(User.id)).all()
+
+        with engine.connect() as connection:
+            results = {
+                "substring_ilike_ms": _time(lambda: [substring_scan(connection, q) for q in samples], 3),
+                "prefix_ilike_ms": _time(lambda: [run(connection, q, False) for q in samples], 3),
+                "fts5_ms": _time(lambda: [run(connection, q, True) for q in samples], 3),
+            }
+        extra = [dict(row, email=f"extra{i}@example.com") for i, row in enumerate(rows[:1000])]
+        start = time.perf_counter()
+        with engine.begin() as connection:
+            connection.execute(insert(User), extra)
+        insert_ms = (time.perf_counter() - start) * 1000
+        engine.dispose()
+    report = {name: round(total / len(samples), 3) for name, total in results.items()}
+    report["index_build_ms"] = round(build_ms, 1)
+    report["insert_1000_without_index_ms"] = round(plain_insert_ms, 1)
+    report["insert_1000_with_index_ms"] = round(insert_ms, 1)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=DATABASE_URL)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("rebuild", help="Rebuild the users_fts index from the users table")
+    bench_parser = commands.add_parser("benchmark", help="Compare ILIKE and FTS5 search on a scratch database")
+    bench_parser.add_argument("--users", type=int, default=100_000)
+    bench_parser.add_argument("--queries", type=int, default=200)
+    bench_parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.command == "rebuild":
+        engine = create_engine(args.database_url)
+        with engine.begin() as connection:
+            rebuilt = rebuild_search_index(connection)
+        print("✅ Rebuilt users_fts" if rebuilt else "ℹ️ No users_fts index in this database")
+    else:
+        report = benchmark_search(args.users, args.queries, args.seed)
+        print(f"{args.users} users, per-query median over {args.queries} typeahead queries:")
+        for name, value in report.items():
+            print(f"  {name:<30} {value}")
+
+
+if __name__ == "__main__":
+    main()
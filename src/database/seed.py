@@ -0,0 +1,98 @@
+"""Default users and avatars.
+
+Run explicitly with ``python src/database/seed.py``, or let the app do it in
+the background after startup (``SEED_ON_STARTUP=background``, the default).
+Both paths are idempotent and only hash passwords for users they create.
+"""
+import asyncio
+import logging
+import os
+import sys
+import uuid
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from sqlalchemy.orm import Session
+
+from src.database import SessionLocal, engine
+from src.database.base import Base
+from src.database.migrations import ensure_schema
+from src.database.models import User, UserRole, Avatar
+from src.resources.constants import AVATAR_1_URL, AVATAR_2_URL
+from src.utils.hashing import get_password_hash
+
+logger = logging.getLogger(__name__)
+
+def init_seed_avatars(db: Session):
+    # Check if avatars already exist
+    if db.query(Avatar).count() == 0:
+        # Add default avatars
+        avatars = [
+            Avatar(
+                
+                name="Avatar 1",
+                url= AVATAR_1_URL
+                
+            ),
+            Avatar(
+                name="Avatar 2",
+                url= AVATAR_2_URL
+            ),
+        ]
+        db.add_all(avatars)
+        db.commit()
+        print("✅ Default avatars created")
+    else:
+        print("✅ Avatars already exist")
+
+def init_admin_user():
+    """Initialize admin user if it doesn't exist"""
+    db = SessionLocal()
+    try:
+        admin_user = db.query(User).filter(User.email == "admin@astrellect.com").first()
+        if not admin_user:
+            new_user = User(
+                id=uuid.uuid4(),
+                first_name="Admin",
+                email="admin@astrellect.com",
+                hashed_password=get_password_hash("Admin@123#"),
+                role=UserRole.ADMIN,
+                is_admin=True,
+            )
+            db.add(new_user)
+            db.commit()
+
+            logger.info("✅ Admin user created")
+            new_employee = User(
+                id=uuid.uuid4(),
+                first_name="employee",
+                email="employee@astrellect.com",
+                hashed_password=get_password_hash("employee@123#"),
+                role=UserRole.EMPLOYEE,
+                is_admin=False,
+            )
+            db.add(new_employee)
+            db.commit()
+            logger.info("✅ Employee user created")
+        else:
+            logger.info("✅ Admin user already exists")
+            logger.info("✅ Employee user already exists")
+        # seed default existing avatars into the database    
+        init_seed_avatars(db)
+        logger.info("✅ Avatars seeded successfully")
+
+    except Exception as e:
+        logger.error(f"Error creating admin user: {e}")
+    finally:
+        db.close()
+
+async def run_seed_in_background():
+    """Background task: seed off the event loop so bcrypt never delays startup."""
+    try:
+        await asyncio.to_thread(init_admin_user)
+    except Exception as e:
+        logger.error(f"Error seeding default data: {e}")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    ensure_schema(engine, Base.metadata)
+    init_admin_user()
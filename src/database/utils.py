@@ -1,7 +1,2 @@
-from passlib.context import CryptContext
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+# Password hashing lives in src/utils/hashing.py; re-exported for existing imports.
+from src.utils.hashing import pwd_context, get_password_hash, verify_password
@@ -0,0 +1,267 @@
+"""Switch SQLite UUID columns between CHAR(36) text and BINARY(16) storage.
+
+Usage:
+    python src/database/uuid_storage.py status
+    python src/database/uuid_storage.py migrate --to binary
+    python src/database/uuid_storage.py benchmark --users 5000 --announcements 200
+
+``migrate`` rebuilds every table that has UUID columns (create new table,
+copy rows converting the keys, drop the old table, rename, recreate its
+indexes and triggers) in one transaction, following SQLite's documented
+procedure for changing a column type. It is idempotent, so an interrupted
+or repeated run is safe. Stop the app first, back up ``database/`` and set
+``UUID_STORAGE`` to the new mode before starting it again.
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+from statistics import median
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from sqlalchemy import MetaData, create_engine, inspect, select, text
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.schema import CreateTable
+
+from src.database import UUID, UUID_STORAGE_MODES
+from src.database import models  # noqa: F401  (registers every table on Base.metadata)
+from src.database.base import Base
+from src.resources.constants import DATABASE_URL, UUID_STORAGE
+
+
+def _to_blob(value):
+    if value is None or isinstance(value, bytes):
+        return value
+    return uuid.UUID(value).bytes
+
+def _to_text(value):
+    if value is None:
+        return value
+    if isinstance(value, bytes):
+        return str(uuid.UUID(bytes=value))
+    return str(uuid.UUID(value))
+
+CONVERTERS = {"binary": "uuid_to_blob", "text": "uuid_to_text"}
+
+
+def uuid_columns(table):
+    return [column.name for column in table.columns if isinstance(column.type, UUID)]
+
+def retyped_metadata(storage: str, table_names=None) -> MetaData:
+    """Copy of the model metadata whose UUID columns use ``storage``."""
+    metadata = MetaData()
+    for table in Base.metadata.sorted_tables:
+        if table_names is None or table.name in table_names:
+            table.to_metadata(metadata)
+    for table in metadata.tables.values():
+        for column in table.columns:
+            if isinstance(column.type, UUID):
+                column.type = UUID(storage=storage)
+    return metadata
+
+
+def detect_storage(engine) -> dict:
+    """Storage class (``text``/``blob``) found in the first row of each UUID key column."""
+    found = {}
+    existing = set(inspect(engine).get_table_names())
+    with engine.connect() as connection:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing or "id" not in uuid_columns(table):
+                continue
+            found[table.name] = connection.execute(
+                text(f'SELECT typeof(id) FROM "{table.name}" LIMIT 1')
+            ).scalar()
+    return found
+
+def check_storage(engine, storage: str = UUID_STORAGE):
+    """Return the tables whose stored keys do not match ``storage``, so startup can warn."""
+    if engine.dialect.name != "sqlite":
+        return []
+    expected = "blob" if storage == "binary" else "text"
+    return [name for name, kind in detect_storage(engine).items() if kind is not None and kind != expected]
+
+
+def _sqlite_path(database_url: str) -> str:
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        raise SystemExit("UUID storage conversion only applies to file-backed SQLite databases")
+    return url.database
+
+def migrate(database_url: str, target: str) -> dict:
+    connection = sqlite3.connect(_sqlite_path(database_url), isolation_level=None)
+    connection.create_function("uuid_to_blob", 1, _to_blob, deterministic=True)
+    connection.create_function("uuid_to_text", 1, _to_text, deterministic=True)
+    dialect = sqlite.dialect()
+    existing = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    metadata = retyped_metadata(target)
+    converted = {}
+    # foreign_keys cannot change inside a transaction, and must be off while
+    # referenced tables are dropped and renamed
+    connection.execute("PRAGMA foreign_keys = OFF")
+    try:
+        connection.execute("BEGIN IMMEDIATE")
+        for table in metadata.sorted_tables:
+            keys = uuid_columns(table)
+            if table.name not in existing or not keys:
+                continue
+            present = {row[1] for row in connection.execute(f'PRAGMA table_info("{table.name}")')}
+            columns = [column.name for column in table.columns if column.name in present]
+            dependents = [row[0] for row in connection.execute(
+                "SELECT sql FROM sqlite_master WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL",
+                (table.name,),
+            )]
+            new_name = f"{table.name}__uuid_{target}"
+            ddl = str(CreateTable(table).compile(dialect=dialect)).strip()
+            ddl = ddl.replace(f"CREATE TABLE {table.name} ", f'CREATE TABLE "{new_name}" ', 1)
+            connection.execute(f'DROP TABLE IF EXISTS "{new_name}"')
+            connection.execute(ddl)
+            select_list = ", ".join(
+                f'{CONVERTERS[target]}("{name}")' if name in keys else f'"{name}"' for name in columns
+            )
+            column_list = ", ".join(f'"{name}"' for name in columns)
+            connection.execute(
+                f'INSERT INTO "{new_name}" ({column_list}) SELECT {select_list} FROM "{table.name}"'
+            )
+            connection.execute(f'DROP TABLE "{table.name}"')
+            connection.execute(f'ALTER TABLE "{new_name}" RENAME TO "{table.name}"')
+            for statement in dependents:
+                connection.execute(statement)
+            converted[table.name] = connection.execute(f'SELECT count(*) FROM "{table.name}"').fetchone()[0]
+        problems = connection.execute("PRAGMA foreign_key_check").fetchall()
+        if problems:
+            raise RuntimeError(f"Foreign key check failed after conversion: {problems[:5]}")
+        connection.execute("COMMIT")
+    except Exception:
+        connection.execute("ROLLBACK")
+        raise
+    finally:
+        connection.execute("PRAGMA foreign_keys = ON")
+    connection.execute("VACUUM")
+    # Copying and VACUUM renumber the rowids the people-search index points at
+    if connection.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'users_fts'").fetchone():
+        connection.execute("INSERT INTO users_fts(users_fts) VALUES ('rebuild')")
+    connection.close()
+    return converted
+
+
+def _size_report(connection) -> dict:
+    try:
+        rows = connection.execute(text(
+            "SELECT name, sum(pgsize) FROM dbstat GROUP BY name ORDER BY name"
+        )).all()
+        return {name: size for name, size in rows}
+    except Exception:
+        page_count = connection.execute(text("PRAGMA page_count")).scalar()
+        page_size = connection.execute(text("PRAGMA page_size")).scalar()
+        return {"database": page_count * page_size}
+
+def _time(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return median(samples) * 1000
+
+def benchmark_storage(storage: str, users: int, announcements: int, recipients_per: int,
+                      lookups: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    metadata = retyped_metadata(storage, {"users", "announcements", "announcement_recipients"})
+    users_t = metadata.tables["users"]
+    announcements_t = metadata.tables["announcements"]
+    recipients_t = metadata.tables["announcement_recipients"]
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, f'uuid_{storage}.db')}")
+        metadata.create_all(engine)
+        user_ids = [uuid.UUID(int=rng.getrandbits(128)) for _ in range(users)]
+        announcement_ids = [uuid.UUID(int=rng.getrandbits(128)) for _ in range(announcements)]
+        start = time.perf_counter()
+        with engine.begin() as connection:
+            connection.execute(users_t.insert(), [
+                {"id": user_id, "email": f"user{i}@example.com", "hashed_password": "x"}
+                for i, user_id in enumerate(user_ids)
+            ])
+            connection.execute(announcements_t.insert(), [
+                {"id": announcement_id, "title": f"Announcement {i}", "author_id": user_ids[0]}
+                for i, announcement_id in enumerate(announcement_ids)
+            ])
+            connection.execute(recipients_t.insert(), [
+                {"id": uuid.UUID(int=rng.getrandbits(128)), "announcement_id": announcement_id, "user_id": user_id}
+                for announcement_id in announcement_ids
+                for user_id in rng.sample(user_ids, min(recipients_per, users))
+            ])
+            connection.execute(text(
+                "CREATE INDEX ix_bench_recipients_announcement ON announcement_recipients (announcement_id)"
+            ))
+        insert_ms = (time.perf_counter() - start) * 1000
+
+        sample_users = [rng.choice(user_ids) for _ in range(lookups)]
+        sample_announcements = [rng.choice(announcement_ids) for _ in range(max(1, lookups // 10))]
+        lookup_query = select(users_t.c.id, users_t.c.email)
+        join_query = select(recipients_t.c.id, users_t.c.id, users_t.c.email).join(
+            users_t, users_t.c.id == recipients_t.c.user_id
+        )
+        with engine.connect() as connection:
+            lookup_ms = _time(lambda: [
+                connection.execute(lookup_query.where(users_t.c.id == user_id)).one()
+                for user_id in sample_users
+            ], repeat=5) / len(sample_users)
+            join_ms = _time(lambda: [
+                connection.execute(join_query.where(recipients_t.c.announcement_id == announcement_id)).all()
+                for announcement_id in sample_announcements
+            ], repeat=5) / len(sample_announcements)
+            full_join_ms = _time(lambda: connection.execute(join_query).all(), repeat=3)
+            sizes = _size_report(connection)
+        engine.dispose()
+    return {
+        "insert_ms": round(insert_ms, 1),
+        "pk_lookup_ms": round(lookup_ms, 4),
+        "join_per_announcement_ms": round(join_ms, 4),
+        "full_join_ms": round(full_join_ms, 1),
+        "bytes": sizes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=DATABASE_URL)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("status", help="Show how UUID keys are currently stored")
+    migrate_parser = commands.add_parser("migrate", help="Rewrite UUID columns in place")
+    migrate_parser.add_argument("--to", choices=UUID_STORAGE_MODES, required=True)
+    bench_parser = commands.add_parser("benchmark", help="Compare text and binary keys on a scratch database")
+    bench_parser.add_argument("--users", type=int, default=5000)
+    bench_parser.add_argument("--announcements", type=int, default=200)
+    bench_parser.add_argument("--recipients-per", type=int, default=500)
+    bench_parser.add_argument("--lookups", type=int, default=2000)
+    bench_parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.command == "status":
+        engine = create_engine(args.database_url)
+        print(f"UUID_STORAGE={UUID_STORAGE}")
+        for name, kind in detect_storage(engine).items():
+            print(f"  {name:<28} {kind or 'empty'}")
+    elif args.command == "migrate":
+        converted = migrate(args.database_url, args.to)
+        for name, count in converted.items():
+            print(f"  {name:<28} {count} rows")
+        print(f"Converted {len(converted)} tables to {args.to} UUIDs; start the app with UUID_STORAGE={args.to}")
+    else:
+        for storage in UUID_STORAGE_MODES:
+            result = benchmark_storage(storage, args.users, args.announcements, args.recipients_per,
+                                       args.lookups, args.seed)
+            sizes = result.pop("bytes")
+            print(f"{storage:>6}: " + ", ".join(f"{k}={v}" for k, v in result.items()))
+            for name, size in sizes.items():
+                print(f"        {name:<40} {size / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+import asyncio
 import logging
 import os
 import sys
@@ -10,79 +11,70 @@ import uvicorn
 
 from src.routes import ACTIVE_ROUTES
 from src.resources.constants import ASTRELLECT_API_VERSION
-from src.database import models, engine, Base, SessionLocal
-from src.database.models import User, UserRole, Avatar
+from src.database import models, engine, async_engine, replica_engines, Base, SessionLocal
+from src.database.instrumentation import SQLTimingMiddleware
+from src.database.migrations import ensure_schema
+from src.database.seed import init_admin_user, run_seed_in_background
+from src.database.sqlite_tuning import run_sqlite_maintenance_task
+from src.database.receipts import check_receipt_storage, fill_unread_counts
+from src.database.uuid_storage import check_storage
+from src.resources.constants import ANNOUNCEMENT_RECEIPTS, LEADER_LOCK_FILE, SCHEMA_LOCK_FILE, SEED_ON_STARTUP, SQL_INSTRUMENTATION, UUID_STORAGE
 from src.resources.constants import  STATIC_DIR, TEMPLATES_DIR
-from src.utils.utils import get_password_hash
+from src.utils.hashing import hashing_service
+from src.utils.file_lock import FileLock
+from src.utils.startup import StartupPipeline
+from src.utils.broadcast import broadcast_hub
+from src.auth.sessions import rebuild_revocation_index, run_revocation_refresher, run_session_sweeper
 from fastapi.responses import HTMLResponse
-from sqlalchemy.orm import Session
-from src.resources.constants import AVATAR_1_URL, AVATAR_2_URL
+from sqlalchemy.orm import configure_mappers
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def init_seed_avatars(db: Session):
-    # Check if avatars already exist
-    if db.query(Avatar).count() == 0:
-        # Add default avatars
-        avatars = [
-            Avatar(
-                
-                name="Avatar 1",
-                url= AVATAR_1_URL
-                
-            ),
-            Avatar(
-                name="Avatar 2",
-                url= AVATAR_2_URL
-            ),
-        ]
-        db.add_all(avatars)
-        db.commit()
-        print("✅ Default avatars created")
-    else:
-        print("✅ Avatars already exist")
-
-def init_admin_user():
-    """Initialize admin user if it doesn't exist"""
+def init_session_revocations():
+    """Load recently revoked sessions so logged-out tokens stay rejected after a restart"""
     db = SessionLocal()
     try:
-        admin_user = db.query(User).filter(User.email == "admin@astrellect.com").first()
-        if not admin_user:
-            new_user = User(
-                id=uuid.uuid4(),
-                first_name="Admin",
-                email="admin@astrellect.com",
-                hashed_password=get_password_hash("Admin@123#"),
-                role=UserRole.ADMIN,
-                is_admin=True,
+        count = rebuild_revocation_index(db)
+        logger.info(f"✅ Session revocation index rebuilt ({count} entries)")
+    except Exception as e:
+        logger.error(f"Error rebuilding session revocation index: {e}")
+    finally:
+        db.close()
+
+def check_uuid_storage():
+    """Warn when stored keys do not match UUID_STORAGE; lookups would silently miss"""
+    try:
+        mismatched = check_storage(engine)
+        if mismatched:
+            logger.error(
+                f"❌ UUID_STORAGE={UUID_STORAGE} but {', '.join(mismatched)} store keys differently; "
+                f"run `python src/database/uuid_storage.py migrate --to {UUID_STORAGE}`"
             )
-            db.add(new_user)
-            db.commit()
-
-            logger.info("✅ Admin user created")
-            new_employee = User(
-                id=uuid.uuid4(),
-                first_name="employee",
-                email="employee@astrellect.com",
-                hashed_password=get_password_hash("employee@123#"),
-                role=UserRole.EMPLOYEE,
-                is_admin=False,
+    except Exception as e:
+        logger.error(f"Error checking UUID storage: {e}")
+
+def check_receipt_mode():
+    """Warn when stored read receipts were written in the other ANNOUNCEMENT_RECEIPTS mode"""
+    try:
+        with engine.connect() as connection:
+            pending = check_receipt_storage(connection)
+        if pending:
+            logger.error(
+                f"❌ ANNOUNCEMENT_RECEIPTS={ANNOUNCEMENT_RECEIPTS} but read receipts are stored for the other mode; "
+                f"run `python src/database/receipts.py {pending}`"
             )
-            db.add(new_employee)
-            db.commit()
-            logger.info("✅ Employee user created")
-        else:
-            logger.info("✅ Admin user already exists")
-            logger.info("✅ Employee user already exists")
-        # seed default existing avatars into the database    
-        init_seed_avatars(db)
-        logger.info("✅ Avatars seeded successfully")
+    except Exception as e:
+        logger.error(f"Error checking read receipt storage: {e}")
 
+def init_unread_counts():
+    """Add announcement unread counters for users who have none, e.g. after an upgrade or a mode switch"""
+    try:
+        with engine.begin() as connection:
+            count = fill_unread_counts(connection)
+        logger.info(f"✅ Unread counters filled in ({count} users)")
     except Exception as e:
-        logger.error(f"Error creating admin user: {e}")
-    finally:
-        db.close()
+        logger.error(f"Error filling in unread counters: {e}")
 
 def _get_app():
     """Create and return a FastAPI app instance"""
@@ -98,31 +90,78 @@ def _get_app():
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["Server-Timing", "ETag"],
     )
+    if SQL_INSTRUMENTATION:
+        app.add_middleware(SQLTimingMiddleware)
     app.mount("/static", StaticFiles(directory="static"), name="static")
     templates = Jinja2Templates(directory="templates")
     print(STATIC_DIR, TEMPLATES_DIR)
-    async def startup_event():
-        try:
-            models.Base.metadata.create_all(bind=engine)
-            logger.info("✅ Database tables created successfully")
+    pipeline = StartupPipeline()
+    app.state.startup_pipeline = pipeline
+
+    schema_lock = FileLock(SCHEMA_LOCK_FILE)
+    leader_lock = FileLock(LEADER_LOCK_FILE)
+
+    def migrate_schema():
+        # Workers wait for each other here; later ones find the version current and skip DDL
+        with schema_lock:
+            return ensure_schema(engine, models.Base.metadata)
+
+    def elect_leader():
+        return "leader" if leader_lock.acquire(blocking=False) else "follower"
+
+    def start_background_tasks():
+        app.state.revocation_refresher = asyncio.create_task(run_revocation_refresher())
+        app.state.broadcast_relay = asyncio.create_task(broadcast_hub.run_backend(prune=leader_lock.held))
+        if not leader_lock.held:
+            return
+        app.state.session_sweeper = asyncio.create_task(run_session_sweeper())
+        if engine.dialect.name == "sqlite":
+            app.state.sqlite_maintenance = asyncio.create_task(run_sqlite_maintenance_task(engine))
+
+    def fill_counters():
+        if not leader_lock.held:
+            return "skipped (follower)"
+        init_unread_counts()
+
+    def schedule_seeding():
+        if not leader_lock.held:
+            return "skipped (follower)"
+        if SEED_ON_STARTUP == "background":
+            app.state.seeding = asyncio.create_task(run_seed_in_background())
+        elif SEED_ON_STARTUP == "blocking":
             init_admin_user()
-        except Exception as e:
-            logger.error(f"Error during startup: {e}")
-            
-    app.add_event_handler("startup", startup_event)
+        return SEED_ON_STARTUP
+
+    # Mapper configuration otherwise happens inside the first ORM query
+    pipeline.add("orm-mappers", configure_mappers)
+    pipeline.add("schema", migrate_schema)
+    pipeline.add("leader-election", elect_leader)
+    pipeline.add("uuid-storage", check_uuid_storage)
+    pipeline.add("receipt-storage", check_receipt_mode)
+    pipeline.add("session-index", init_session_revocations)
+    pipeline.add("unread-counters", fill_counters)
+    pipeline.add("background-tasks", start_background_tasks)
+    pipeline.add("seed", schedule_seeding)
+
+    async def shutdown():
+        broadcast_hub.close()
+        for name in ("revocation_refresher", "broadcast_relay", "session_sweeper", "sqlite_maintenance", "seeding"):
+            task = getattr(app.state, name, None)
+            if task is not None:
+                task.cancel()
+        leader_lock.release()
+        hashing_service.shutdown()
+        await async_engine.dispose()
+        for replica_engine in replica_engines.values():
+            await replica_engine.dispose()
+
     app.add_event_handler("startup", lambda: logger.info("Starting up the FastAPI app..."))
+    app.add_event_handler("startup", pipeline.run)
     app.add_event_handler("shutdown", lambda: logger.info("Shutting down the FastAPI app..."))
+    app.add_event_handler("shutdown", shutdown)
 
-    
-    @app.on_event("startup")
-    async def startup_event():
-        try:
-            models.Base.metadata.create_all(bind=engine)
-            logger.info("✅ Database tables created successfully")
-            init_admin_user()
-        except Exception as e:
-            logger.error(f"Error during startup: {e}")
     for route in ACTIVE_ROUTES.values():
         app.include_router(route, prefix=ASTRELLECT_API_VERSION)
 
@@ -155,5 +194,6 @@ def _get_app():
     return app
 
 if __name__ == "__main__":
+    # Development: one process. Production: python src/serve.py
     app = _get_app()
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
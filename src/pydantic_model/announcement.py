@@ -19,6 +19,8 @@ class AnnouncementResponse(BaseModel):
 
 class AnnouncementListResponse(BaseModel):
     announcements: List[AnnouncementResponse]
+    next_cursor: Optional[str] = None
+    total_estimate: Optional[int] = None
     
 class AnnouncementCreate(BaseModel):
     title: str
@@ -46,4 +48,24 @@ class AnnouncementRecipientResponse(BaseModel):
 
     class Config:
         from_attributes = True 
-        
\ No newline at end of file
+        
+
+class InboxItem(AnnouncementResponse):
+    is_read: bool
+    read_at: Optional[datetime] = None
+
+class InboxResponse(BaseModel):
+    announcements: List[InboxItem]
+    unread_count: int
+    next_cursor: Optional[str] = None
+
+class UnreadCountResponse(BaseModel):
+    unread_count: int
+
+class MarkReadBulk(BaseModel):
+    announcement_ids: List[uuid.UUID]
+
+class MarkReadResponse(BaseModel):
+    detail: str
+    marked: int
+    unread_count: int
@@ -17,6 +17,8 @@ class AllCompanyPolicy(BaseModel):
 
 class AllCompanyPolicyResponseList(BaseModel):
     company_policies: List[AllCompanyPolicy]
+    next_cursor: Optional[str] = None
+    total_estimate: Optional[int] = None
 
 class CompanyPolicyCreate(BaseModel):
     title: str
@@ -32,4 +32,6 @@ class TestimonialResponse(TestimonialBase):
         from_attributes = True
 
 class TestimonialListResponse(BaseModel):
-    testimonials: List[TestimonialResponse]
\ No newline at end of file
+    testimonials: List[TestimonialResponse]
+    next_cursor: Optional[str] = None
+    total_estimate: Optional[int] = None
\ No newline at end of file
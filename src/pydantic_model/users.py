@@ -29,6 +29,46 @@ class UserResponse(BaseModel):
 
 class UserListResponse(BaseModel):
     result : List[UserResponse]
+    next_cursor: Optional[str] = None
+    total_estimate: Optional[int] = None
+
+class OrgChartMember(BaseModel):
+    depth: int
+    user: UserResponse
+
+class OrgChartResponse(BaseModel):
+    user_id: uuid.UUID
+    members: List[OrgChartMember]
+
+class ManagerSummary(BaseModel):
+    id: uuid.UUID
+    email: str
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    profile_picture_url: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class RoleFlags(BaseModel):
+    role: Optional[UserRole] = None
+    is_admin: bool = False
+    is_manager: bool = False
+
+class AvatarResponse(BaseModel):
+    id: int
+    name: Optional[str] = None
+    url: str
+
+    class Config:
+        from_attributes = True
+
+class BootstrapResponse(BaseModel):
+    profile: UserResponse
+    manager: Optional[ManagerSummary] = None
+    flags: RoleFlags
+    unread_announcements: int = 0
+    avatars: List[AvatarResponse] = []
     
 class UserCreate(BaseModel):
     email: str
@@ -73,4 +113,33 @@ class UserAttribute(BaseModel):
     is_admin: Optional[bool] = None
 
 class AvatarUpdate(BaseModel):
-    avatar_id: int
\ No newline at end of file
+    avatar_id: int
+
+class BulkImportRow(BaseModel):
+    email: str
+    password: Optional[str] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    role: Optional[UserRole] = None
+    contact_number: Optional[str] = None
+    dob: Optional[datetime] = None
+    address: Optional[str] = None
+    profile_picture_url: Optional[str] = None
+    joining_date: Optional[datetime] = None
+    reporting_manager_id: Optional[uuid.UUID] = None
+    is_active: Optional[bool] = None
+    is_admin: Optional[bool] = None
+
+class BulkImportRowResult(BaseModel):
+    row: int
+    email: Optional[str] = None
+    status: str
+    id: Optional[uuid.UUID] = None
+    detail: Optional[str] = None
+
+class BulkImportResponse(BaseModel):
+    created: int = 0
+    updated: int = 0
+    skipped: int = 0
+    failed: int = 0
+    results: List[BulkImportRowResult] = []
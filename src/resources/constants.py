@@ -1,5 +1,6 @@
 import os
 from pathlib import Path
+from dotenv import load_dotenv
 
 
 API_VERSION_CONTROLLER = "v1"
@@ -8,6 +9,10 @@ ASTRELLECT_API_VERSION = f"/astrellect/{API_VERSION_CONTROLLER}"
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Optional .env at the project root; variables already set in the environment win
+ENV_FILE = os.getenv("ASTRELLECT_ENV_FILE", os.path.join(PROJECT_ROOT, ".env"))
+load_dotenv(ENV_FILE)
+
 
 SORS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 STATIC_DIR = os.path.join(PROJECT_ROOT, "static")
@@ -29,8 +34,96 @@ if not os.path.exists(UPLOADS_DIR):
 if not os.path.exists(AVATARS_DIR):
     os.makedirs(AVATARS_DIR)
     
-DATABASE_URL = f"sqlite:///{os.path.join(DATABASE_DIR, 'astrellect.db')}"
+# Pool and timeout settings for this URL live in src/resources/settings.py
+DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{os.path.join(DATABASE_DIR, 'astrellect.db')}")
 
 # These are the *URL paths* served to the frontend for avatar display
 AVATAR_1_URL = "/static/uploads/avatars/avatar1.png"
 AVATAR_2_URL = "/static/uploads/avatars/avatar2.png"
+
+# Authenticated principal cache (see src/auth/principal_cache.py)
+PRINCIPAL_CACHE_MAX_SIZE = int(os.getenv("PRINCIPAL_CACHE_MAX_SIZE", 10000))
+PRINCIPAL_CACHE_TTL_SECONDS = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", 300))
+
+# Password hashing worker pool (see src/utils/hashing.py)
+HASHING_EXECUTOR = os.getenv("HASHING_EXECUTOR", "thread")
+HASHING_MAX_WORKERS = int(os.getenv("HASHING_MAX_WORKERS", min(4, os.cpu_count() or 1)))
+HASHING_MAX_QUEUE = int(os.getenv("HASHING_MAX_QUEUE", 64))
+
+# bcrypt cost factor; pick a value with `python src/utils/calibrate_hashing.py`
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+
+# Reject claims-only principals whose role/admin/active state changed after issue
+PRINCIPAL_REVOCATION_CHECK = os.getenv("PRINCIPAL_REVOCATION_CHECK", "true").lower() in ("1", "true", "yes")
+
+# Expired refresh-token session cleanup (see src/auth/sessions.py)
+SESSION_SWEEP_INTERVAL_SECONDS = int(os.getenv("SESSION_SWEEP_INTERVAL_SECONDS", 900))
+SESSION_SWEEP_BATCH_SIZE = int(os.getenv("SESSION_SWEEP_BATCH_SIZE", 500))
+
+# Rows per transaction for POST /employees/bulk-import
+BULK_IMPORT_CHUNK_SIZE = int(os.getenv("BULK_IMPORT_CHUNK_SIZE", 500))
+
+# SQLite connection PRAGMAs: "production", "safe" or "off" (see src/database/sqlite_tuning.py)
+SQLITE_PRAGMA_PROFILE = os.getenv("SQLITE_PRAGMA_PROFILE", "production")
+SQLITE_MAINTENANCE_INTERVAL_SECONDS = int(os.getenv("SQLITE_MAINTENANCE_INTERVAL_SECONDS", 600))
+SQLITE_CHECKPOINT_MODE = os.getenv("SQLITE_CHECKPOINT_MODE", "PASSIVE")
+
+# How UUID keys are stored outside Postgres: "text" (CHAR(36)) or "binary" (BINARY(16)).
+# Convert an existing database first with `python src/database/uuid_storage.py migrate`.
+UUID_STORAGE = os.getenv("UUID_STORAGE", "text").lower()
+
+# Per-request SQL accounting (see src/database/instrumentation.py)
+SQL_INSTRUMENTATION = os.getenv("SQL_INSTRUMENTATION", "true").lower() in ("1", "true", "yes")
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", 5))
+SQL_SLOW_STATEMENT_MS = float(os.getenv("SQL_SLOW_STATEMENT_MS", 250))
+
+# Keyset pagination on list endpoints (see src/utils/pagination.py)
+PAGINATION_DEFAULT_LIMIT = int(os.getenv("PAGINATION_DEFAULT_LIMIT", 100))
+PAGINATION_MAX_LIMIT = int(os.getenv("PAGINATION_MAX_LIMIT", 500))
+# total_estimate is a COUNT(*) cached for this long per endpoint and filter set
+PAGINATION_COUNT_TTL_SECONDS = int(os.getenv("PAGINATION_COUNT_TTL_SECONDS", 60))
+
+# /employees/search typeahead (see src/database/search.py)
+SEARCH_DEFAULT_LIMIT = int(os.getenv("SEARCH_DEFAULT_LIMIT", 10))
+SEARCH_MAX_LIMIT = int(os.getenv("SEARCH_MAX_LIMIT", 50))
+
+# Most announcement ids accepted by PUT /announcement/mark-as-read/bulk
+MARK_READ_MAX_IDS = int(os.getenv("MARK_READ_MAX_IDS", 500))
+
+# The avatar catalogue in /employees/bootstrap is re-read at most this often
+AVATAR_CATALOGUE_TTL_SECONDS = int(os.getenv("AVATAR_CATALOGUE_TTL_SECONDS", 300))
+
+# Announcement read state: "materialized" (one recipient row per employee per
+# announcement) or "lazy" (recipients follow the audience rule, only reads are
+# stored). Convert existing rows with `python src/database/receipts.py compact|expand`.
+ANNOUNCEMENT_RECEIPTS = os.getenv("ANNOUNCEMENT_RECEIPTS", "materialized").lower()
+
+# Default admin/employee/avatar seeding: "background" (after startup), "blocking" or "off".
+# `python src/database/seed.py` seeds explicitly.
+SEED_ON_STARTUP = os.getenv("SEED_ON_STARTUP", "background").lower()
+
+# Production server (python src/serve.py); uvloop/httptools are used when installed
+SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+SERVER_PORT = int(os.getenv("SERVER_PORT", 8000))
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+SERVER_KEEPALIVE_SECONDS = int(os.getenv("SERVER_KEEPALIVE_SECONDS", 5))
+SERVER_BACKLOG = int(os.getenv("SERVER_BACKLOG", 2048))
+SERVER_LIMIT_CONCURRENCY = int(os.getenv("SERVER_LIMIT_CONCURRENCY", 0)) or None
+SERVER_LIMIT_MAX_REQUESTS = int(os.getenv("SERVER_LIMIT_MAX_REQUESTS", 0)) or None
+SERVER_GRACEFUL_SHUTDOWN_SECONDS = int(os.getenv("SERVER_GRACEFUL_SHUTDOWN_SECONDS", 30))
+
+# Worker coordination: one worker at a time runs DDL, the leader seeds and runs maintenance
+SCHEMA_LOCK_FILE = os.path.join(DATABASE_DIR, ".schema.lock")
+LEADER_LOCK_FILE = os.path.join(DATABASE_DIR, ".leader.lock")
+# Each worker re-reads sessions revoked and users changed (user_invalidations) by the
+# others this often; until then another worker may serve a changed user's cached principal
+SESSION_INDEX_REFRESH_SECONDS = int(os.getenv("SESSION_INDEX_REFRESH_SECONDS", 30))
+
+# Live events on /events/stream (see src/utils/broadcast.py). "local" delivers within
+# one process; "table" relays between workers through the broadcast_events table.
+# src/serve.py sets "table" for its workers when it starts more than one.
+BROADCAST_BACKEND = os.getenv("BROADCAST_BACKEND", "local").lower()
+BROADCAST_QUEUE_SIZE = int(os.getenv("BROADCAST_QUEUE_SIZE", 100))
+BROADCAST_POLL_SECONDS = float(os.getenv("BROADCAST_POLL_SECONDS", 1))
+BROADCAST_RETENTION_SECONDS = int(os.getenv("BROADCAST_RETENTION_SECONDS", 300))
+SSE_HEARTBEAT_SECONDS = int(os.getenv("SSE_HEARTBEAT_SECONDS", 15))
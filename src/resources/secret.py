@@ -1,9 +1,12 @@
 import secrets
 import os
 
+from src.resources.constants import ENV_FILE  # noqa: F401  (loads .env before the lookups below)
+
 SECRET_KEY = os.getenv("SECRET_KEY", "yZosK3ELIrMRb2W3OjSesWGKg5V5-0ENqOZUIGAV4Dc")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30)
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", 7))
 
 SYSTEM_API_KEY = os.getenv("SYSTEM_API_KEY", "")
 
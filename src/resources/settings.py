@@ -0,0 +1,144 @@
+"""Database connection settings.
+
+Values come from the process environment or from the ``.env`` file loaded by
+``src.resources.constants``. Pool defaults depend on the backend: a local
+SQLite file needs few connections and no liveness checks, while a networked
+Postgres server gets a larger pool, ``pool_pre_ping``, connection recycling
+and a server-side statement timeout.
+
+    DATABASE_URL=postgresql://user:pass@db:5432/astrellect
+    DB_POOL_SIZE=10
+    DB_MAX_OVERFLOW=20
+    DB_POOL_TIMEOUT=30
+    DB_POOL_RECYCLE=1800
+    DB_POOL_PRE_PING=true
+    DB_STATEMENT_TIMEOUT_MS=30000
+    DB_ECHO=false
+
+Read-only request sessions can be routed away from the primary (see
+``src/database/routing.py``):
+
+    DATABASE_REPLICA_URLS=postgresql://ro@replica1/astrellect,postgresql://ro@replica2/astrellect
+    DB_SQLITE_READ_POOL=true        # SQLite: separate read-only pool on the same WAL file
+    DB_REPLICA_STICKY_SECONDS=5     # reads stay on the primary this long after a client writes
+"""
+import os
+from dataclasses import asdict, dataclass
+from typing import Optional, Tuple
+
+from sqlalchemy.engine import make_url
+
+from src.resources.constants import DATABASE_URL
+
+# Per-backend defaults, overridden field by field from the environment
+POOL_DEFAULTS = {
+    "sqlite": {
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "pool_recycle": -1,
+        "pool_pre_ping": False,
+        "statement_timeout_ms": 0,
+    },
+    "postgresql": {
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_timeout": 30,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "statement_timeout_ms": 30000,
+    },
+}
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return value.lower() in ("1", "true", "yes")
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return default if value is None or value == "" else int(value)
+
+
+@dataclass(frozen=True)
+class DatabaseSettings:
+    url: str
+    pool_size: int
+    max_overflow: int
+    pool_timeout: int
+    pool_recycle: int
+    pool_pre_ping: bool
+    statement_timeout_ms: int
+    echo: bool = False
+    replica_urls: Tuple[str, ...] = ()
+    sqlite_read_pool: bool = True
+    replica_sticky_seconds: float = 5
+
+    @classmethod
+    def from_env(cls, url: Optional[str] = None) -> "DatabaseSettings":
+        url = url or DATABASE_URL
+        backend = make_url(url).get_backend_name()
+        defaults = POOL_DEFAULTS.get(backend, POOL_DEFAULTS["postgresql"])
+        return cls(
+            url=url,
+            pool_size=_env_int("DB_POOL_SIZE", defaults["pool_size"]),
+            max_overflow=_env_int("DB_MAX_OVERFLOW", defaults["max_overflow"]),
+            pool_timeout=_env_int("DB_POOL_TIMEOUT", defaults["pool_timeout"]),
+            pool_recycle=_env_int("DB_POOL_RECYCLE", defaults["pool_recycle"]),
+            pool_pre_ping=_env_bool("DB_POOL_PRE_PING", defaults["pool_pre_ping"]),
+            statement_timeout_ms=_env_int("DB_STATEMENT_TIMEOUT_MS", defaults["statement_timeout_ms"]),
+            echo=_env_bool("DB_ECHO", False),
+            replica_urls=tuple(
+                replica.strip() for replica in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if replica.strip()
+            ),
+            sqlite_read_pool=_env_bool("DB_SQLITE_READ_POOL", True),
+            replica_sticky_seconds=float(os.getenv("DB_REPLICA_STICKY_SECONDS", 5)),
+        )
+
+    @property
+    def backend(self) -> str:
+        return make_url(self.url).get_backend_name()
+
+    @property
+    def is_memory(self) -> bool:
+        """In-memory SQLite lives in a single connection, so pool settings do not apply."""
+        return self.backend == "sqlite" and make_url(self.url).database in (None, "", ":memory:")
+
+    def connect_args(self, is_async: bool = False) -> dict:
+        if self.backend == "sqlite":
+            # aiosqlite runs each connection on its own thread already
+            return {} if is_async else {"check_same_thread": False}
+        if self.backend == "postgresql" and self.statement_timeout_ms:
+            if is_async:
+                return {"server_settings": {"statement_timeout": str(self.statement_timeout_ms)}}
+            return {"options": f"-c statement_timeout={self.statement_timeout_ms}"}
+        return {}
+
+    def engine_kwargs(self, is_async: bool = False) -> dict:
+        """Keyword arguments for ``create_engine``/``create_async_engine``."""
+        kwargs = {"echo": self.echo, "connect_args": self.connect_args(is_async)}
+        if self.is_memory:
+            return kwargs
+        kwargs.update(
+            pool_size=self.pool_size,
+            max_overflow=self.max_overflow,
+            pool_timeout=self.pool_timeout,
+            pool_recycle=self.pool_recycle,
+            pool_pre_ping=self.pool_pre_ping,
+        )
+        return kwargs
+
+    def public_dict(self) -> dict:
+        """Settings without credentials, for the metrics endpoint."""
+        values = asdict(self)
+        values["url"] = make_url(self.url).render_as_string(hide_password=True)
+        values["replica_urls"] = [
+            make_url(url).render_as_string(hide_password=True) for url in self.replica_urls
+        ]
+        return values
+
+
+database_settings = DatabaseSettings.from_env()
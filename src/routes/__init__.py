@@ -3,13 +3,17 @@ from src.routes.auth import auth_router
 from src.routes.testimonials import testimonials_router
 from src.routes.announcement import announcement_router
 from src.routes.companyPolicy import policy_router
+from src.routes.metrics import metrics_router
+from src.routes.events import events_router
 
 ACTIVE_ROUTES = {
     "users": users_router,
     "auth": auth_router,
     "testimonials": testimonials_router,
     "announcement": announcement_router,
-    "policy": policy_router
+    "policy": policy_router,
+    "metrics": metrics_router,
+    "events": events_router
 
 }
 
@@ -1,22 +1,45 @@
 import uuid
 import logging
-from fastapi import APIRouter, Depends, status, HTTPException
+import time
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, status, HTTPException
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 
-from src.database.models import Announcement, AnnouncementRecipient
+from src.database.models import Announcement
 from src.pydantic_model.announcement import (
     AnnouncementAttribute,
     AnnouncementCreate,
     AnnouncementListResponse,
-    AnnouncementRecipientResponse
+    AnnouncementRecipientResponse,
+    AnnouncementResponse,
+    InboxItem,
+    InboxResponse,
+    MarkReadBulk,
+    MarkReadResponse,
+    UnreadCountResponse
 )
 
-from src.database import get_db
-from src.auth.auth import get_current_user
-from src.database.models import User, UserRole
+from src.database import get_async_db, get_read_db
+from src.database.receipts import (
+    forget,
+    inbox,
+    mark_all_read,
+    mark_many_read,
+    mark_read,
+    publish,
+    recipient_state,
+    unread_count
+)
+from src.resources.constants import MARK_READ_MAX_IDS
+from src.utils.broadcast import broadcast_hub
+from src.utils.fieldsets import FieldSelection, project, sparse_response
+from src.utils.pagination import PageParams, estimate_total, fetch_page
+from src.auth.auth import Principal, get_current_user, get_current_principal
+from src.database.models import User
 
 logger = logging.getLogger(__name__)
 
@@ -27,23 +50,35 @@ announcement_router = APIRouter(
 
 @announcement_router.get("/get-all", response_model=AnnouncementListResponse)
 async def get_all_announcements(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    page: PageParams = Depends(),
+    fieldset: FieldSelection = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Get all announcements from the database.
     Need to be authenticated.
     """
     try:
-        announcements = db.query(Announcement).all()
-        if not announcements:
+        fields = fieldset.resolve(AnnouncementResponse, Announcement)
+        query = select(Announcement)
+        announcements, next_cursor = await fetch_page(db, project(query, Announcement, fields), Announcement, page)
+        if not announcements and not page.cursor:
             logger.warning("⚠️ No announcements found.")
             return JSONResponse(
                 status_code=status.HTTP_404_NOT_FOUND,
                 content={"detail": "No announcements found."}
             )
+        total = await estimate_total(db, query, "announcements:get-all") if page.include_total else None
         logger.info("✅ Announcements retrieved successfully")
-        return AnnouncementListResponse(announcements=announcements)
+        if fields is not None:
+            return sparse_response(
+                AnnouncementListResponse, "announcements", fields, announcements,
+                next_cursor=next_cursor, total_estimate=total
+            )
+        return AnnouncementListResponse(announcements=announcements, next_cursor=next_cursor, total_estimate=total)
+    except HTTPException as http_exc:
+        raise http_exc
     except Exception as e:
         logger.error(f"❌ Unexpected error retrieving announcements: {str(e)}")
         return JSONResponse(
@@ -55,14 +90,17 @@ async def get_all_announcements(
 @announcement_router.get("/filter", response_model=AnnouncementListResponse)
 async def filter_announcement_by_attribute(
     attributes: AnnouncementAttribute = Depends(),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)):
+    page: PageParams = Depends(),
+    fieldset: FieldSelection = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)):
     """
     Get announcements filtered by any combination of attributes.
     Requires: Valid JWT token. All authenticated users can access.
     """
     try:
-        query = db.query(Announcement)
+        fields = fieldset.resolve(AnnouncementResponse, Announcement)
+        query = select(Announcement)
         filters = []
 
         if attributes.title:
@@ -80,17 +118,26 @@ async def filter_announcement_by_attribute(
 
         logger.info("✅ Announcements filtered successfully")
         if filters:
-            query = query.filter(*filters)
-        announcements = query.all()
-        if not announcements:
+            query = query.where(*filters)
+        announcements, next_cursor = await fetch_page(db, project(query, Announcement, fields), Announcement, page)
+        if not announcements and not page.cursor:
             logger.warning("⚠️ No announcements found matching criteria")
             return JSONResponse(
                 status_code=status.HTTP_404_NOT_FOUND,
                 content={"detail": "No announcements found matching the provided criteria."}
             )
 
+        total = await estimate_total(db, query, f"announcements:filter:{attributes.json()}") if page.include_total else None
+
         logger.info("✅ Announcements filtered successfully")
-        return AnnouncementListResponse(announcements=announcements)
+        if fields is not None:
+            return sparse_response(
+                AnnouncementListResponse, "announcements", fields, announcements,
+                next_cursor=next_cursor, total_estimate=total
+            )
+        return AnnouncementListResponse(announcements=announcements, next_cursor=next_cursor, total_estimate=total)
+    except HTTPException as http_exc:
+        raise http_exc
     except Exception as e:
         logger.error(f"❌ Unexpected error filtering announcements: {str(e)}")
         return JSONResponse(
@@ -102,8 +149,8 @@ async def filter_announcement_by_attribute(
 @announcement_router.get("/get-recipient/{announcement_id}", response_model=AnnouncementRecipientResponse)
 async def get_announcement_recipient(
     announcement_id: uuid.UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     
     """
@@ -111,11 +158,7 @@ async def get_announcement_recipient(
     announcement id.
     """
     try:
-        user_id = current_user.id
-        recipient = db.query(AnnouncementRecipient).filter(
-            AnnouncementRecipient.user_id == user_id,
-            AnnouncementRecipient.announcement_id == announcement_id
-        ).first()
+        recipient = await recipient_state(db, announcement_id, current_user.id)
 
         if not recipient:
             logger.warning("⚠️ Recipient not found for given user and announcement")
@@ -132,10 +175,59 @@ async def get_announcement_recipient(
             content={"detail": "An unexpected error occurred while retrieving the recipient"}
         )
 
+@announcement_router.get("/inbox", response_model=InboxResponse)
+async def get_inbox(
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """
+    The current user's announcements with their read state, pinned first,
+    then newest first. Pass next_cursor back as cursor for the next page.
+    """
+    try:
+        rows, next_cursor = await inbox(db, current_user.id, page)
+        items = [
+            InboxItem(**AnnouncementResponse.model_validate(announcement).model_dump(), is_read=is_read, read_at=read_at)
+            for announcement, is_read, read_at in rows
+        ]
+        logger.info("✅ Announcement inbox retrieved successfully")
+        return InboxResponse(
+            announcements=items,
+            unread_count=await unread_count(db, current_user.id),
+            next_cursor=next_cursor
+        )
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        logger.error(f"❌ Error retrieving announcement inbox: {str(e)}")
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"detail": "An unexpected error occurred while retrieving the inbox."}
+        )
+
+@announcement_router.get("/unread-count", response_model=UnreadCountResponse)
+async def get_unread_count(
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """
+    Number of unread announcements for the current user, read from a
+    maintained counter.
+    """
+    try:
+        return UnreadCountResponse(unread_count=await unread_count(db, current_user.id))
+    except Exception as e:
+        logger.error(f"❌ Error retrieving unread count: {str(e)}")
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"detail": "An unexpected error occurred while retrieving the unread count."}
+        )
+
 @announcement_router.post("/create")
 async def create_Announcement(
     announcement: AnnouncementCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -162,7 +254,7 @@ async def create_Announcement(
             title=announcement.title,
             content=announcement.content,
             author_id=current_user.id,
-            is_pinned=announcement.is_pinned,
+            is_pinned=bool(announcement.is_pinned),
             start_date=announcement.start_date,
             end_date=announcement.end_date,
             created_at=datetime.now(),
@@ -170,35 +262,36 @@ async def create_Announcement(
         )
 
         db.add(new_announcement)
-        db.flush()
+        await db.flush()
 
-        employees = db.query(User).filter(User.role == UserRole.EMPLOYEE, User.is_active == True).all()
-        
-        for employee in employees:
-            recipient = AnnouncementRecipient(
-                id=uuid.uuid4(),
-                announcement_id=new_announcement.id,
-                user_id=employee.id,
-                is_read=False,
-                read_at=None
-            )
-            db.add(recipient)
-        db.commit()
-        db.refresh(new_announcement)
-        logger.info("✅ Announcement created successfully.")
+        fanout_started = time.perf_counter()
+        recipients = await publish(db, new_announcement)
+        await db.commit()
+        fanout_ms = round((time.perf_counter() - fanout_started) * 1000, 1)
+        logger.info(f"✅ Announcement created successfully ({recipients} recipients in {fanout_ms} ms).")
+        await broadcast_hub.publish("announcement.created", {
+            "id": str(new_announcement.id),
+            "title": new_announcement.title,
+            "is_pinned": bool(new_announcement.is_pinned),
+        })
         return JSONResponse(
             status_code=status.HTTP_201_CREATED,
-            content={"detail": "Announcement created successfully.", "announcement_id": str(new_announcement.id)}
+            content={
+                "detail": "Announcement created successfully.",
+                "announcement_id": str(new_announcement.id),
+                "recipients": recipients,
+                "fanout_ms": fanout_ms,
+            }
         )
     except IntegrityError as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"❌ Database integrity error: {str(e)}")
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={"detail": "Could not create announcement due to database constraint."}
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"❌ Unexpected error creating announcement: {str(e)}")
         return JSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -209,54 +302,109 @@ async def create_Announcement(
 @announcement_router.put("/mark-as-read")
 async def mark_announcement_as_read(
     announcement_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Mark an announcement as read for the current user.
     """
     try:
-        recipient = db.query(AnnouncementRecipient).filter(
-            AnnouncementRecipient.announcement_id == announcement_id,
-            AnnouncementRecipient.user_id == current_user.id
-        ).first()
+        marked = await mark_read(db, announcement_id, current_user.id)
 
-        if recipient is None:
+        if marked is None:
+            await db.rollback()
             logger.warning("⚠️ No announcement corresponding to this user.")
-            raise HTTPException(
+            return JSONResponse(
                 status_code=status.HTTP_404_NOT_FOUND,
                 content={"detail": "No announcement corresponding to this user."}
             )
 
-        if recipient.is_read:
+        if not marked:
+            await db.rollback()
             logger.info("ℹ️ Already marked as read")
             return JSONResponse(
                 status_code=status.HTTP_304_NOT_MODIFIED,
                 content={"detail": "Already marked as read."}
             )
 
-        recipient.is_read = True
-        recipient.read_at = datetime.now()
-
-        db.commit()
-        db.refresh(recipient)
+        await db.commit()
         logger.info("✅ Announcement marked as read successfully.")
         return JSONResponse(
             status_code=status.HTTP_200_OK,
             content={"detail": "Announcement marked as read successfully."}
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"❌ Error marking announcement as read: {str(e)}")
         return JSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={"detail": "An unexpected error occurred while marking announcement as read."}
         )
 
+@announcement_router.put("/mark-as-read/bulk", response_model=MarkReadResponse)
+async def mark_announcements_as_read(
+    body: MarkReadBulk,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Mark several announcements as read for the current user in one
+    statement. Ids that are unknown or already read are skipped; the
+    response says how many were marked.
+    """
+    if len(body.announcement_ids) > MARK_READ_MAX_IDS:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"detail": f"At most {MARK_READ_MAX_IDS} announcement ids per request."}
+        )
+    try:
+        marked = await mark_many_read(db, body.announcement_ids, current_user.id)
+        await db.commit()
+        logger.info(f"✅ {marked} announcements marked as read.")
+        return MarkReadResponse(
+            detail="Announcements marked as read successfully.",
+            marked=marked,
+            unread_count=await unread_count(db, current_user.id)
+        )
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"❌ Error marking announcements as read: {str(e)}")
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"detail": "An unexpected error occurred while marking announcements as read."}
+        )
+
+@announcement_router.put("/mark-all-read", response_model=MarkReadResponse)
+async def mark_all_announcements_as_read(
+    up_to: Optional[datetime] = Query(None, description="Only announcements created at or before this time; defaults to now"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Mark every announcement of the current user as read, up to a
+    timestamp, in one statement.
+    """
+    try:
+        marked = await mark_all_read(db, current_user.id, up_to or datetime.now())
+        await db.commit()
+        logger.info(f"✅ {marked} announcements marked as read.")
+        return MarkReadResponse(
+            detail="Announcements marked as read successfully.",
+            marked=marked,
+            unread_count=await unread_count(db, current_user.id)
+        )
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"❌ Error marking all announcements as read: {str(e)}")
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"detail": "An unexpected error occurred while marking announcements as read."}
+        )
+
 @announcement_router.delete("/delete/{announcement_id}")
 async def delete_announcement(
     announcement_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)):
     """
     Delete an announcement and all its recipient entries.
@@ -276,7 +424,7 @@ async def delete_announcement(
             content={"detail": "An unexpected error occurred while deleting announcement (no enough permission)."}
         )
     try:
-        announcement = db.query(Announcement).filter(Announcement.id == announcement_id).first()
+        announcement = await db.scalar(select(Announcement).where(Announcement.id == announcement_id))
 
         if not announcement:
             logger.warning("⚠️ Announcement not found.")
@@ -285,11 +433,10 @@ async def delete_announcement(
                 content={"detail": "Announcement not found."}
             )
 
-        db.query(AnnouncementRecipient).filter(
-            AnnouncementRecipient.announcement_id == announcement_id
-        ).delete()
-        db.delete(announcement)
-        db.commit()
+        await forget(db, announcement_id)
+        await db.delete(announcement)
+        await db.commit()
+        await broadcast_hub.publish("announcement.deleted", {"id": str(announcement_id)})
 
         logger.info("✅ Announcement and associated recipients deleted successfully.")
         return JSONResponse(
@@ -297,7 +444,7 @@ async def delete_announcement(
             content={"detail": "Announcement and associated recipients deleted successfully."}
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"❌ Error deleting announcement: {str(e)}")
         return JSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,14 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Body
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 import logging
 
-from src.database import get_db
-from src.auth.auth import Token, authenticate_user, create_access_token, get_current_user
+from src.database import get_async_db
+from src.auth.auth import (
+    Principal,
+    Token,
+    authenticate_user,
+    create_access_token,
+    get_current_principal,
+    get_current_user,
+)
+from src.auth.sessions import create_session, invalidate_user, revoke_session, revoke_user_sessions, rotate_session
 from src.resources.secret import ACCESS_TOKEN_EXPIRE_MINUTES
 from src.database.models import User
-from src.utils.utils import get_password_hash, verify_password
+from src.utils.hashing import hashing_service
 
 logger = logging.getLogger(__name__)
 auth_router = APIRouter(
@@ -16,16 +25,29 @@ auth_router = APIRouter(
     tags=["Authentication"]
 )
 
+def _access_token_for(user: User, session_id) -> str:
+    return create_access_token(
+        data={
+            "sub": str(user.id),
+            "email": user.email,
+            "role": user.role.value if user.role else None,
+            "is_admin": user.is_admin,
+            "sid": str(session_id)
+        },
+        expires_delta=timedelta(minutes=int(ACCESS_TOKEN_EXPIRE_MINUTES))
+    )
+
 @auth_router.post("/token", response_model=Token)
 async def login_for_access_token(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     OAuth2 compatible token login, get an access token for future requests
     """
     try:
-        user = authenticate_user(db, form_data.username, form_data.password)
+        user = await authenticate_user(db, form_data.username, form_data.password)
         if not user:
             logger.warning(f"🚫 Login failed for username: {form_data.username}")
             return {
@@ -34,49 +56,122 @@ async def login_for_access_token(
             }
         
         user.last_login = datetime.now()
-        db.commit()
-
-        access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = create_access_token(
-            data={
-                "sub": str(user.id),
-                "email": user.email,
-                "role": user.role.value if user.role else None,
-                "is_admin": user.is_admin
-            },
-            expires_delta=access_token_expires
+        session, refresh_token = create_session(
+            db,
+            user,
+            ip_address=request.client.host if request.client else None,
+            user_agent=request.headers.get("user-agent")
         )
+        await invalidate_user(db, user.id)
+        await db.commit()
+
+        access_token = _access_token_for(user, session.id)
         logger.info(f"✅ User {user.email} logged in successfully.")
-        return {"access_token": access_token, "token_type": "bearer"}
+        return {"access_token": access_token, "token_type": "bearer", "refresh_token": refresh_token}
 
+    except HTTPException as http_exc:
+        raise http_exc
     except Exception as e:
         logger.error(f"❌ Unexpected error during login: {str(e)}")
         return {
             "detail": "An unexpected error occurred while creating token.",
             "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR
         }
+
+@auth_router.post("/refresh", response_model=Token)
+async def refresh_access_token(
+    refresh_token: str = Body(..., embed=True),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Exchange a refresh token for a new access token (no password check).
+    The refresh token is rotated; the previous one stops working.
+    """
+    try:
+        rotated = await rotate_session(db, refresh_token)
+        if rotated is None:
+            logger.warning("🚫 Refresh attempted with an unknown or expired token")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired refresh token.",
+                headers={"WWW-Authenticate": "Bearer"}
+            )
+        session, new_refresh_token = rotated
+
+        user = await db.scalar(select(User).where(User.id == session.user_id))
+        if user is None or not user.is_active:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired refresh token.",
+                headers={"WWW-Authenticate": "Bearer"}
+            )
+        await db.commit()
+
+        access_token = _access_token_for(user, session.id)
+        logger.info(f"✅ Access token refreshed for user {user.id}")
+        return {"access_token": access_token, "token_type": "bearer", "refresh_token": new_refresh_token}
+
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"❌ Unexpected error refreshing token: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred while refreshing token."
+        )
+
+@auth_router.post("/logout", status_code=status.HTTP_200_OK)
+async def logout(
+    current_user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    End the caller's session. Its access and refresh tokens stop working.
+    """
+    try:
+        if current_user.session_id is not None:
+            await revoke_session(db, current_user.session_id)
+            await db.commit()
+        logger.info(f"✅ User {current_user.id} logged out.")
+        return {"detail": "Logged out successfully."}
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"❌ Error logging out user {current_user.id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred while logging out."
+        )
+
 @auth_router.post("/change-password", status_code=status.HTTP_200_OK)
 async def change_password(
     old_password: str = Body(...),
     new_password: str = Body(...),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Change user password
+    Change user password.
+    Every other session of the user is logged out.
     """
     try:
-        if not verify_password(old_password, current_user.hashed_password):
+        if not await hashing_service.verify_password(old_password, current_user.hashed_password):
             logger.warning(f"⚠️ Incorrect old password attempt for user {current_user.email}")
             return {
                 "detail": "Incorrect password.",
                 "status_code": status.HTTP_401_UNAUTHORIZED
             }
         
-        current_user.hashed_password = get_password_hash(new_password)
-        db.commit()
+        current_user.hashed_password = await hashing_service.hash_password(new_password)
+        await revoke_user_sessions(db, current_user.id, keep_session_id=principal.session_id)
+        await invalidate_user(db, current_user.id)
+        await db.commit()
         logger.info(f"✅ Password updated successfully for user {current_user.email}")
         return {"detail": "Password updated successfully."}
+    except HTTPException as http_exc:
+        raise http_exc
     except Exception as e:
         logger.error(f"❌ Error changing password for user {current_user.email}: {str(e)}")
         return {
@@ -1,17 +1,22 @@
 import uuid
 import logging
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import APIRouter, HTTPException, Depends, Response, status
 
 from src.pydantic_model.companyPolicy import (
     CompanyPolicyCreate, 
     CompanyPolicyUpdate, 
+    AllCompanyPolicy,
     AllCompanyPolicyResponseList
 )
-from src.database import get_db
+from src.database import get_async_db, get_read_db
+from src.utils.fieldsets import FieldSelection, project, sparse_response
+from src.utils.pagination import PageParams, estimate_total, fetch_page
 from src.database.models import CompanyPolicy, User
-from src.auth.auth import get_current_user, get_admin_user
+from src.auth.auth import Principal, get_admin_user, get_current_principal
+from src.utils.broadcast import broadcast_hub
 
 logger = logging.getLogger(__name__)
 
@@ -22,8 +27,10 @@ policy_router = APIRouter(
 
 @policy_router.get("/getall", response_model=AllCompanyPolicyResponseList)
 async def get_all_policy(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    page: PageParams = Depends(),
+    fieldset: FieldSelection = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Get all company policies
@@ -31,15 +38,23 @@ async def get_all_policy(
     Requires: Valid JWT token
     """
     try:
-        policy = db.query(CompanyPolicy).all()
-        if not policy:
+        fields = fieldset.resolve(AllCompanyPolicy, CompanyPolicy)
+        query = select(CompanyPolicy)
+        policy, next_cursor = await fetch_page(db, project(query, CompanyPolicy, fields), CompanyPolicy, page)
+        if not policy and not page.cursor:
             logger.warning("❌ No company policies found")
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No company policies found"
             )
+        total = await estimate_total(db, query, "policies:getall") if page.include_total else None
         logger.info("✅ Company policies retrieved successfully")
-        return AllCompanyPolicyResponseList(company_policies=policy)
+        if fields is not None:
+            return sparse_response(
+                AllCompanyPolicyResponseList, "company_policies", fields, policy,
+                next_cursor=next_cursor, total_estimate=total
+            )
+        return AllCompanyPolicyResponseList(company_policies=policy, next_cursor=next_cursor, total_estimate=total)
 
     except HTTPException as http_exc:
         raise http_exc
@@ -54,7 +69,7 @@ async def get_all_policy(
 @policy_router.post("/create_new_policy", status_code=status.HTTP_201_CREATED)
 async def create_policy(
     policy: CompanyPolicyCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_admin_user)
 ):
     """
@@ -63,7 +78,7 @@ async def create_policy(
     Requires: Valid JWT token
     """
     try:
-        existing_policy = db.query(CompanyPolicy).filter(CompanyPolicy.title == policy.title).first()
+        existing_policy = await db.scalar(select(CompanyPolicy).where(CompanyPolicy.title == policy.title))
         if existing_policy:
             logger.warning(f"🚫 Policy title conflict: {policy.title}")
             raise HTTPException(
@@ -81,16 +96,17 @@ async def create_policy(
         )
 
         db.add(new_policy)
-        db.commit()
-        db.refresh(new_policy)
+        await db.commit()
+        await db.refresh(new_policy)
         logger.info("✅ Company policy created successfully.")
+        await broadcast_hub.publish("policy.created", {"id": str(new_policy.id), "title": new_policy.title})
         return {"message": "Company policy created successfully.", "id": new_policy.id}
 
     except HTTPException as http_exc:
         raise http_exc
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"❌ Error creating policy: {str(e)}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -101,7 +117,7 @@ async def create_policy(
 async def update_policy(
     policy_id: uuid.UUID,
     policy_update: CompanyPolicyUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_admin_user)
 ):
     """
@@ -112,7 +128,7 @@ async def update_policy(
     - Admin privileges
     """
     try:
-        db_policy = db.query(CompanyPolicy).filter(CompanyPolicy.id == policy_id).first()
+        db_policy = await db.get(CompanyPolicy, policy_id)
         if not db_policy:
             logger.warning(f"🚫 Policy not found for id: {policy_id}")
             raise HTTPException(
@@ -121,10 +137,10 @@ async def update_policy(
             )
 
         if policy_update.title:
-            existing_policy = db.query(CompanyPolicy).filter(
+            existing_policy = await db.scalar(select(CompanyPolicy).where(
                 CompanyPolicy.title == policy_update.title,
                 CompanyPolicy.id != policy_id
-            ).first()
+            ))
             if existing_policy:
                 logger.warning(f"🚫 Title conflict when updating policy id: {policy_id}")
                 raise HTTPException(
@@ -137,16 +153,17 @@ async def update_policy(
             setattr(db_policy, field, value)
 
         db_policy.updated_at = datetime.utcnow()
-        db.commit()
-        db.refresh(db_policy)
+        await db.commit()
+        await db.refresh(db_policy)
         logger.info("✅ Company policy updated successfully.")
+        await broadcast_hub.publish("policy.updated", {"id": str(policy_id), "title": db_policy.title})
         return {"message": "Company policy updated successfully."}
 
     except HTTPException as http_exc:
         raise http_exc
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"❌ Error updating policy: {str(e)}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -156,7 +173,7 @@ async def update_policy(
 @policy_router.delete("/delete_policy/{policy_id}")
 async def delete_policy(
     policy_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_admin_user)
 ):
     """
@@ -167,7 +184,7 @@ async def delete_policy(
     - Admin privileges
     """
     try:
-        db_policy = db.query(CompanyPolicy).filter(CompanyPolicy.id == policy_id).first()
+        db_policy = await db.get(CompanyPolicy, policy_id)
         if not db_policy:
             logger.warning(f"🚫 Policy not found for deletion, id: {policy_id}")
             raise HTTPException(
@@ -175,16 +192,17 @@ async def delete_policy(
                 detail="Policy not found."
             )
 
-        db.delete(db_policy)
-        db.commit()
+        await db.delete(db_policy)
+        await db.commit()
         logger.info("✅ Company policy deleted successfully.")
+        await broadcast_hub.publish("policy.deleted", {"id": str(policy_id)})
         return {"message": "Company policy deleted successfully."}
 
     except HTTPException as http_exc:
         raise http_exc
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"❌ Error deleting policy: {str(e)}", exc_info=True)
         return {
             "detail": "Failed to delete policy.",
@@ -0,0 +1,71 @@
+import asyncio
+import logging
+import time
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+
+from src.auth.auth import Principal, get_stream_principal
+from src.auth.revocation import session_revocations
+from src.resources.constants import SSE_HEARTBEAT_SECONDS
+from src.utils.broadcast import broadcast_hub
+
+logger = logging.getLogger(__name__)
+
+events_router = APIRouter(
+    prefix="/events",
+    tags=["Events"]
+)
+
+# Sent first: how long EventSource waits before reconnecting, in milliseconds
+RETRY_MS = 3000
+
+
+async def _event_stream(request: Request, principal: Principal):
+    subscription = broadcast_hub.subscribe()
+    logger.info(f"📡 Event stream opened for user {principal.id} ({broadcast_hub.subscribers} open)")
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        while True:
+            timeout = SSE_HEARTBEAT_SECONDS
+            if principal.expires_at:
+                timeout = min(timeout, principal.expires_at - time.time())
+            if timeout <= 0:
+                # The client reconnects with a fresh token
+                yield "event: expired\ndata: {}\n\n"
+                return
+            try:
+                message = await asyncio.wait_for(subscription.get(), timeout)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected() or session_revocations.is_revoked(principal.session_id):
+                    return
+                yield ": keep-alive\n\n"
+                continue
+            if message is None:
+                if subscription.evicted:
+                    yield "event: evicted\ndata: {}\n\n"
+                return
+            yield message.to_sse()
+    finally:
+        broadcast_hub.unsubscribe(subscription)
+
+
+@events_router.get("/stream")
+async def stream_events(
+    request: Request,
+    current_user: Principal = Depends(get_stream_principal)
+):
+    """
+    Server-Sent Events stream of announcement and policy changes:
+    announcement.created, announcement.deleted, policy.created,
+    policy.updated and policy.deleted. Data is JSON with the record id
+    (and title, where there is one); fetch the record for the rest.
+    Ends with an "evicted" event when the client falls too far behind and
+    with "expired" when the token expires; reconnect and refetch then.
+    Requires: Valid JWT token, as a Bearer header or ?access_token=
+    """
+    return StreamingResponse(
+        _event_stream(request, current_user),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
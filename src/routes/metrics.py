@@ -0,0 +1,96 @@
+import logging
+from fastapi import APIRouter, Depends, Request
+
+from src.auth.auth import get_admin_user
+from src.auth.principal_cache import principal_cache
+from src.database import (
+    async_engine, async_engine_pool_stats, engine, engine_pool_stats,
+    read_router, replica_engines, replica_pool_stats,
+)
+from src.database.instrumentation import endpoint_sql_stats
+from src.database.models import User
+from src.resources.settings import database_settings
+from src.utils.broadcast import broadcast_hub
+from src.utils.hashing import hashing_service
+
+logger = logging.getLogger(__name__)
+
+metrics_router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"]
+)
+
+@metrics_router.get("/principal-cache")
+async def get_principal_cache_stats(current_user: User = Depends(get_admin_user)):
+    """
+    Hit/miss counters and occupancy of the authenticated principal cache.
+
+    Requires: Valid JWT token with admin privileges
+    """
+    return principal_cache.stats()
+
+@metrics_router.get("/hashing")
+async def get_hashing_stats(current_user: User = Depends(get_admin_user)):
+    """
+    Queue depth, rejections and latency of the password hashing pool.
+
+    Requires: Valid JWT token with admin privileges
+    """
+    return hashing_service.stats()
+
+@metrics_router.get("/broadcast")
+async def get_broadcast_stats(current_user: User = Depends(get_admin_user)):
+    """
+    Open event streams on this worker and how many were evicted as slow.
+
+    Requires: Valid JWT token with admin privileges
+    """
+    return broadcast_hub.stats()
+
+@metrics_router.get("/db-pool")
+async def get_db_pool_stats(current_user: User = Depends(get_admin_user)):
+    """
+    Connection pool occupancy, checkout wait times and timeouts for the
+    request (async) and background (sync) engines, with the configured limits.
+
+    Requires: Valid JWT token with admin privileges
+    """
+    return {
+        "settings": database_settings.public_dict(),
+        "async": async_engine_pool_stats.snapshot(async_engine.pool),
+        "sync": engine_pool_stats.snapshot(engine.pool),
+        "replicas": {
+            name: replica_pool_stats[name].snapshot(replica_engine.pool)
+            for name, replica_engine in replica_engines.items()
+        },
+    }
+
+@metrics_router.get("/db-routing")
+async def get_db_routing_stats(current_user: User = Depends(get_admin_user)):
+    """
+    How read-only request sessions split between the primary and the replicas,
+    and why reads stayed on the primary (no replica, forced by header, sticky
+    after a recent write).
+
+    Requires: Valid JWT token with admin privileges
+    """
+    return read_router.stats()
+
+@metrics_router.get("/sql")
+async def get_sql_stats(current_user: User = Depends(get_admin_user)):
+    """
+    Query count, database time and slowest statement per endpoint, plus how
+    many requests repeated one statement often enough to look like an N+1.
+
+    Requires: Valid JWT token with admin privileges
+    """
+    return endpoint_sql_stats.snapshot()
+
+@metrics_router.get("/startup")
+async def get_startup_report(request: Request, current_user: User = Depends(get_admin_user)):
+    """
+    Duration and outcome of each startup phase of this worker.
+
+    Requires: Valid JWT token with admin privileges
+    """
+    return request.app.state.startup_pipeline.report
@@ -1,16 +1,18 @@
 import uuid
 import logging
 from typing import List, Optional
-from sqlalchemy import or_
+from sqlalchemy import or_, select
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from fastapi.responses import JSONResponse
-from fastapi import APIRouter, Depends, status as status_code
+from fastapi import APIRouter, Depends, HTTPException, status as status_code
 
-from src.database import get_db
+from src.database import get_async_db, get_read_db
+from src.utils.fieldsets import FieldSelection, project, sparse_response
+from src.utils.pagination import PageParams, estimate_total, fetch_page
 from src.database.models import Testimonial, User
-from src.auth.auth import get_current_user
+from src.auth.auth import Principal, get_current_user, get_current_principal
 from src.pydantic_model.testimonials import (
     TestimonialCreate, 
     TestimonialUpdate, 
@@ -31,8 +33,10 @@ async def get_testimonials(
     status: Optional[TestimonialStatus] = None,
     employee_id: Optional[str] = None,
     department: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    page: PageParams = Depends(),
+    fieldset: FieldSelection = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Get testimonials with optional filtering
@@ -43,31 +47,44 @@ async def get_testimonials(
     Requires: Valid JWT token
     """
     try:
-        query = db.query(Testimonial)
+        fields = fieldset.resolve(TestimonialResponse, Testimonial)
+        query = select(Testimonial)
         if not current_user.is_admin:
-            query = query.filter(Testimonial.status == TestimonialStatus.APPROVED)
+            query = query.where(Testimonial.status == TestimonialStatus.APPROVED)
         elif status:
-            query = query.filter(Testimonial.status == status)
+            query = query.where(Testimonial.status == status)
         if employee_id:
-            query = query.join(User).filter(
+            query = query.join(User).where(
                 or_(
                     User.first_name.ilike(f"%{employee_id}%"),
                     User.last_name.ilike(f"%{employee_id}%")
                 )
             )
         if department:
-            query = query.join(User).filter(User.role.ilike(f"%{department}%"))
-        testimonials = query.all()
-        if not testimonials:
+            query = query.join(User).where(User.role.ilike(f"%{department}%"))
+        testimonials, next_cursor = await fetch_page(db, project(query, Testimonial, fields), Testimonial, page)
+        if not testimonials and not page.cursor:
             logger.warning("🚫 404 - No testimonials found.")
             return JSONResponse(
                 status_code=status_code.HTTP_404_NOT_FOUND,
                 content={"detail": "No testimonials found."}
             )
         
+        total = None
+        if page.include_total:
+            key = f"testimonials:{current_user.is_admin}:{status}:{employee_id}:{department}"
+            total = await estimate_total(db, query, key)
+
         logger.info("✅ Testimonials retrieved successfully.")
-        return {"testimonials": testimonials}
+        if fields is not None:
+            return sparse_response(
+                TestimonialListResponse, "testimonials", fields, testimonials,
+                next_cursor=next_cursor, total_estimate=total
+            )
+        return {"testimonials": testimonials, "next_cursor": next_cursor, "total_estimate": total}
     
+    except HTTPException as http_exc:
+        raise http_exc
     except Exception as e:
         logger.error(f"❌ Unexpected error retrieving testimonials: {str(e)}")
         return JSONResponse(
@@ -77,8 +94,8 @@ async def get_testimonials(
 @testimonials_router.get("/{testimonial_id}", response_model=TestimonialResponse)
 async def get_testimonial(
     testimonial_id: uuid.UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Get a specific testimonial by ID
@@ -89,7 +106,7 @@ async def get_testimonial(
     Requires: Valid JWT token
     """
     try:
-        testimonial = db.query(Testimonial).filter(Testimonial.id == testimonial_id).first()
+        testimonial = await db.get(Testimonial, testimonial_id)
         if not testimonial:
             logger.warning(f"🚫 404 - Testimonial with ID {testimonial_id} not found.")
             return JSONResponse(
@@ -116,7 +133,7 @@ async def get_testimonial(
 @testimonials_router.post("", status_code=status_code.HTTP_201_CREATED)
 async def create_testimonial(
     testimonial: TestimonialCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -135,8 +152,8 @@ async def create_testimonial(
         )
         
         db.add(new_testimonial)
-        db.commit()
-        db.refresh(new_testimonial)
+        await db.commit()
+        await db.refresh(new_testimonial)
         logger.info("✅ Testimonial submitted successfully.")
         return JSONResponse(
             status_code=status_code.HTTP_201_CREATED,
@@ -144,7 +161,7 @@ async def create_testimonial(
         )
 
     except IntegrityError as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"🚫 Database integrity error: {str(e)}")
         return JSONResponse(
             status_code=status_code.HTTP_400_BAD_REQUEST,
@@ -152,7 +169,7 @@ async def create_testimonial(
         )
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"❌ Unexpected error creating testimonial: {str(e)}")
         return JSONResponse(
             status_code=status_code.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -163,7 +180,7 @@ async def create_testimonial(
 async def update_testimonial(
     testimonial_id: uuid.UUID,
     update_data: TestimonialUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -175,7 +192,7 @@ async def update_testimonial(
     Requires: Valid JWT token
     """
     try:
-        db_testimonial = db.query(Testimonial).filter(Testimonial.id == testimonial_id).first()
+        db_testimonial = await db.get(Testimonial, testimonial_id)
         if not db_testimonial:
             logger.warning(f"🚫 404 - Testimonial with ID {testimonial_id} not found.")
             return JSONResponse(
@@ -212,13 +229,13 @@ async def update_testimonial(
             setattr(db_testimonial, key, value)
 
         db_testimonial.updated_at = datetime.now()
-        db.commit()
-        db.refresh(db_testimonial)
+        await db.commit()
+        await db.refresh(db_testimonial)
         logger.info(f"✅ Testimonial {testimonial_id} updated successfully")
         return db_testimonial
 
     except IntegrityError as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"🚫 Database integrity error: {str(e)}")
         return JSONResponse(
             status_code=status_code.HTTP_400_BAD_REQUEST,
@@ -226,7 +243,7 @@ async def update_testimonial(
         )
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"❌ Unexpected error updating testimonial: {str(e)}")
         return JSONResponse(
             status_code=status_code.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -236,7 +253,7 @@ async def update_testimonial(
 @testimonials_router.delete("/{testimonial_id}", status_code=status_code.HTTP_204_NO_CONTENT)
 async def delete_testimonial(
     testimonial_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -248,7 +265,7 @@ async def delete_testimonial(
     Requires: Valid JWT token
     """
     try:
-        db_testimonial = db.query(Testimonial).filter(Testimonial.id == testimonial_id).first()
+        db_testimonial = await db.get(Testimonial, testimonial_id)
         if not db_testimonial:
             logger.warning(f"🚫 404 - Testimonial with ID {testimonial_id} not found.")
             return JSONResponse(
@@ -271,8 +288,8 @@ async def delete_testimonial(
                     content={"detail": "Cannot delete testimonial with status other than 'Pending'."}
                 )
 
-        db.delete(db_testimonial)
-        db.commit()
+        await db.delete(db_testimonial)
+        await db.commit()
         logger.info(f"✅ Testimonial {testimonial_id} deleted successfully")
         return JSONResponse(
             status_code=status_code.HTTP_204_NO_CONTENT,
@@ -280,7 +297,7 @@ async def delete_testimonial(
         )
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"❌ Unexpected error deleting testimonial: {str(e)}")
         return JSONResponse(
             status_code=status_code.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,23 +1,57 @@
 import uuid
 import logging
-from typing import List
-from sqlalchemy.orm import Session
+import time
+from typing import List, Optional, Set
+from pydantic import ValidationError
+from sqlalchemy import exists, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 from sqlalchemy.exc import IntegrityError
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile, status
 from fastapi.responses import JSONResponse
 
-from src.database import get_db
-from src.database.models import User, Avatar
-from src.utils.utils import get_password_hash
-from src.auth.auth import get_current_user, get_admin_user
+from src.database import get_async_db, get_read_db
+from src.database.models import User, UserRole, Avatar
+from src.database.hierarchy import (
+    HierarchyCycleError,
+    creates_cycle,
+    direct_reports,
+    link_users,
+    management_chain,
+    move_user,
+    subtree
+)
+from src.database.search import search_statement, search_terms, uses_fts
+from src.database.receipts import recount_unread, unread_count
+from src.utils.hashing import hashing_service
+from src.utils.bulk_import import SUPPORTED_FORMATS, chunked, detect_format, iter_records
+from src.utils.http_cache import conditional_json
+from src.utils.fieldsets import FieldSelection, project, sparse_response
+from src.utils.pagination import PageParams, estimate_total, fetch_page
+from src.resources.constants import (
+    AVATAR_CATALOGUE_TTL_SECONDS,
+    BULK_IMPORT_CHUNK_SIZE,
+    SEARCH_DEFAULT_LIMIT,
+    SEARCH_MAX_LIMIT
+)
+from src.auth.auth import Principal, get_current_user, get_admin_user, get_current_principal
+from src.auth.sessions import invalidate_user, invalidate_users, revoke_user_sessions
 from src.pydantic_model.users import (
     UserCreate, 
     UserUpdate, 
     UserResponse, 
     UserListResponse,
     UserAttribute, 
-    AvatarUpdate
+    AvatarUpdate,
+    BulkImportRow,
+    BulkImportRowResult,
+    BulkImportResponse,
+    OrgChartMember,
+    OrgChartResponse,
+    AvatarResponse,
+    BootstrapResponse,
+    ManagerSummary,
+    RoleFlags
 )
 
 logger = logging.getLogger(__name__)
@@ -31,15 +65,79 @@ users_router = APIRouter(
 async def get_current_user_info(current_user: User = Depends(get_current_user)):
     return current_user
 
+# Avatars only change when seeded, so every page load need not re-read them
+_avatar_catalogue = {"loaded_at": None, "avatars": []}
+
+async def load_avatar_catalogue(db: AsyncSession) -> List[AvatarResponse]:
+    loaded_at = _avatar_catalogue["loaded_at"]
+    if loaded_at is not None and time.monotonic() - loaded_at < AVATAR_CATALOGUE_TTL_SECONDS:
+        return _avatar_catalogue["avatars"]
+    avatars = [AvatarResponse.model_validate(avatar) for avatar in (await db.scalars(select(Avatar).order_by(Avatar.id))).all()]
+    # An empty catalogue usually means seeding has not finished yet; try again next time
+    if avatars:
+        _avatar_catalogue.update(loaded_at=time.monotonic(), avatars=avatars)
+    return avatars
+
+@users_router.get("/bootstrap", response_model=BootstrapResponse)
+async def get_bootstrap(
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Everything a page needs on load: profile, manager, role flags, unread
+    announcement count and the avatar catalogue.
+    Send the last ETag in If-None-Match to get a 304 when nothing changed.
+    Requires: Valid JWT token
+    """
+    try:
+        unread = await unread_count(db, current_user.id)
+        has_reports = await db.scalar(select(exists().where(User.reporting_manager_id == current_user.id)))
+        manager = None
+        if current_user.reporting_manager_id:
+            manager = (await db.execute(
+                select(User.id, User.email, User.first_name, User.last_name, User.profile_picture_url)
+                .where(User.id == current_user.reporting_manager_id)
+            )).first()
+        payload = BootstrapResponse(
+            profile=current_user,
+            manager=ManagerSummary.model_validate(manager) if manager else None,
+            flags=RoleFlags(
+                role=current_user.role,
+                is_admin=current_user.is_admin,
+                is_manager=current_user.role == UserRole.MANAGER or bool(has_reports)
+            ),
+            unread_announcements=unread,
+            avatars=await load_avatar_catalogue(db)
+        )
+        return conditional_json(request, payload)
+    except Exception as e:
+        logger.error(f"❌ Error building bootstrap payload: {str(e)}")
+        return JSONResponse(status_code=500, content={"detail": "An unexpected error occurred while loading the page data."})
+
 @users_router.get("/getall", response_model=UserListResponse)
-async def get_all_users(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def get_all_users(
+    page: PageParams = Depends(),
+    fieldset: FieldSelection = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
     try:
+        fields = fieldset.resolve(UserResponse, User)
         if not current_user.is_admin:
             logger.info(f"ℹ️ Returning current user details for non-admin {current_user.id}")
+            if fields is not None:
+                return sparse_response(UserListResponse, "result", fields, [current_user])
             return UserListResponse(result=[current_user])
-        users = db.query(User).all()
+        query = select(User)
+        users, next_cursor = await fetch_page(db, project(query, User, fields), User, page)
+        total = await estimate_total(db, query, "users:getall") if page.include_total else None
         logger.info("✅ Users retrieved successfully")
-        return UserListResponse(result=users)
+        if fields is not None:
+            return sparse_response(UserListResponse, "result", fields, users, next_cursor=next_cursor, total_estimate=total)
+        return UserListResponse(result=users, next_cursor=next_cursor, total_estimate=total)
+    except HTTPException as http_exc:
+        raise http_exc
     except Exception as e:
         logger.error(f"❌ Unexpected error retrieving users: {str(e)}")
         return JSONResponse(status_code=500, content={"detail": "An unexpected error occurred while fetching users."})
@@ -47,7 +145,9 @@ async def get_all_users(db: Session = Depends(get_db), current_user: User = Depe
 @users_router.get("/filter", response_model=UserListResponse)
 async def filter_users_by_attributes(
     attributes: UserAttribute = Depends(),
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(),
+    fieldset: FieldSelection = Depends(),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -63,7 +163,8 @@ async def filter_users_by_attributes(
         return JSONResponse(status_code=500, content={"detail": "An unexpected error occurred while filtering users."})
 
     try:
-        query = db.query(User)
+        fields = fieldset.resolve(UserResponse, User)
+        query = select(User)
         filters = []
         if attributes.email:
             filters.append(User.email.ilike(f"%{attributes.email}%"))
@@ -88,24 +189,63 @@ async def filter_users_by_attributes(
 
         logger.info(f"ℹ️ Filtering users with: {attributes.json()}")
         if filters:
-            query = query.filter(*filters)
+            query = query.where(*filters)
 
-        users = query.all()
-        if not users:
+        users, next_cursor = await fetch_page(db, project(query, User, fields), User, page)
+        if not users and not page.cursor:
             logger.warning("⚠️ No users found matching criteria.")
             return JSONResponse(status_code=404, content={"detail": "No users found matching the provided criteria."})
+        total = await estimate_total(db, query, f"users:filter:{attributes.json()}") if page.include_total else None
 
         logger.info(f"✅ Retrieved filtered users")
-        return UserListResponse(result=users)
+        if fields is not None:
+            return sparse_response(UserListResponse, "result", fields, users, next_cursor=next_cursor, total_estimate=total)
+        return UserListResponse(result=users, next_cursor=next_cursor, total_estimate=total)
 
+    except HTTPException as http_exc:
+        raise http_exc
     except Exception as e:
         logger.error(f"❌ Error filtering users: {str(e)}")
         return JSONResponse(status_code=500, content={"detail": "An unexpected error occurred while filtering users."})
 
+@users_router.get("/search", response_model=UserListResponse)
+async def search_users(
+    q: str = Query(..., min_length=1, max_length=100, description="Name, email, phone or address prefix"),
+    limit: int = Query(SEARCH_DEFAULT_LIMIT, ge=1, le=SEARCH_MAX_LIMIT),
+    fieldset: FieldSelection = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Typeahead search over employees, best matches first.
+    Every word of q matches as a prefix, e.g. "jo sm" finds John Smith.
+    Requires: Valid JWT token. Only admins can search users.
+    """
+    if not current_user.is_admin:
+        logger.warning(f"🚫 403 - User {current_user.id} tried searching users.")
+        return JSONResponse(status_code=403, content={"detail": "Not enough permissions to search users."})
+
+    try:
+        fields = fieldset.resolve(UserResponse, User)
+        terms = search_terms(q)
+        users = []
+        if terms:
+            query = search_statement(terms, limit, await uses_fts(db))
+            users = (await db.scalars(project(query, User, fields))).all()
+        logger.info(f"✅ Search returned {len(users)} users")
+        if fields is not None:
+            return sparse_response(UserListResponse, "result", fields, users)
+        return UserListResponse(result=users)
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        logger.error(f"❌ Error searching users: {str(e)}")
+        return JSONResponse(status_code=500, content={"detail": "An unexpected error occurred while searching users."})
+
 @users_router.get("/{user_id}", response_model=UserResponse)
-async def get_user(user_id: uuid.UUID, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def get_user(user_id: uuid.UUID, db: AsyncSession = Depends(get_read_db), current_user: User = Depends(get_current_user)):
     try:
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await db.scalar(select(User).where(User.id == user_id))
         if not user:
             logger.warning(f"⚠️ User with ID {user_id} not found")
             return JSONResponse(status_code=404, content={"detail": "User not found."})
@@ -116,10 +256,63 @@ async def get_user(user_id: uuid.UUID, db: Session = Depends(get_db), current_us
         logger.error(f"❌ Error retrieving user: {str(e)}")
         return JSONResponse(status_code=500, content={"detail": "An unexpected error occurred while fetching user data."})
 
+@users_router.get("/{user_id}/reports", response_model=UserListResponse)
+async def get_direct_reports(user_id: uuid.UUID, db: AsyncSession = Depends(get_read_db), current_user: User = Depends(get_current_user)):
+    """
+    Employees whose reporting manager is user_id.
+    Requires: Valid JWT token
+    """
+    try:
+        if not await db.scalar(select(User.id).where(User.id == user_id)):
+            return JSONResponse(status_code=404, content={"detail": "User not found."})
+        reports = await direct_reports(db, user_id)
+        logger.info(f"✅ Retrieved {len(reports)} direct reports of {user_id}")
+        return UserListResponse(result=reports)
+    except Exception as e:
+        logger.error(f"❌ Error retrieving direct reports: {str(e)}")
+        return JSONResponse(status_code=500, content={"detail": "An unexpected error occurred while fetching direct reports."})
+
+@users_router.get("/{user_id}/subtree", response_model=OrgChartResponse)
+async def get_org_subtree(
+    user_id: uuid.UUID,
+    max_depth: Optional[int] = Query(None, ge=1, description="Only this many levels below the user"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Everyone who reports to user_id directly or indirectly, nearest levels first.
+    Requires: Valid JWT token
+    """
+    try:
+        if not await db.scalar(select(User.id).where(User.id == user_id)):
+            return JSONResponse(status_code=404, content={"detail": "User not found."})
+        rows = await subtree(db, user_id, max_depth)
+        logger.info(f"✅ Retrieved {len(rows)} people under {user_id}")
+        return OrgChartResponse(user_id=user_id, members=[OrgChartMember(depth=depth, user=user) for user, depth in rows])
+    except Exception as e:
+        logger.error(f"❌ Error retrieving org subtree: {str(e)}")
+        return JSONResponse(status_code=500, content={"detail": "An unexpected error occurred while fetching the org chart."})
+
+@users_router.get("/{user_id}/chain", response_model=OrgChartResponse)
+async def get_management_chain(user_id: uuid.UUID, db: AsyncSession = Depends(get_read_db), current_user: User = Depends(get_current_user)):
+    """
+    Managers of user_id from the direct manager up to the top of the org.
+    Requires: Valid JWT token
+    """
+    try:
+        if not await db.scalar(select(User.id).where(User.id == user_id)):
+            return JSONResponse(status_code=404, content={"detail": "User not found."})
+        rows = await management_chain(db, user_id)
+        logger.info(f"✅ Retrieved management chain of {user_id}")
+        return OrgChartResponse(user_id=user_id, members=[OrgChartMember(depth=depth, user=user) for user, depth in rows])
+    except Exception as e:
+        logger.error(f"❌ Error retrieving management chain: {str(e)}")
+        return JSONResponse(status_code=500, content={"detail": "An unexpected error occurred while fetching the management chain."})
+
 @users_router.post("/create", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def create_user(
     user: UserCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_admin_user)
 ):
     """
@@ -128,7 +321,7 @@ async def create_user(
     Requires: Valid JWT token with admin privileges
     """
     try:
-        existing_user = db.query(User).filter(User.email == user.email).first()
+        existing_user = await db.scalar(select(User).where(User.email == user.email))
         if existing_user:
             logger.warning(f"409 - User with email {user.email} already exists")
             return JSONResponse(
@@ -136,7 +329,7 @@ async def create_user(
                 content="User with this email already exists"
             )
 
-        hashed_password = get_password_hash(user.password)
+        hashed_password = await hashing_service.hash_password(user.password)
 
         user_data = user.model_dump(exclude={"password"})
 
@@ -149,32 +342,192 @@ async def create_user(
         )
 
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        await db.commit()
+        await db.refresh(new_user)
 
         logger.info(f"Admin {current_user.id} created new user with ID: {new_user.id}")
         return new_user
 
+    except HTTPException as http_exc:
+        raise http_exc
     except IntegrityError as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Database integrity error: {str(e)}")
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content="Could not create user due to database constraint"
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Unexpected error creating user: {str(e)}")
         return JSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content="An unexpected error occurred"
         )
 
+def _sync_hierarchy(connection, inserts: list, updates: list) -> None:
+    link_users(connection, [(values["id"], values.get("reporting_manager_id")) for values in inserts])
+    for values in updates:
+        if "reporting_manager_id" in values:
+            move_user(connection, values["id"], values["reporting_manager_id"])
+
+async def _import_chunk(
+    db: AsyncSession,
+    chunk: list,
+    upsert: bool,
+    seen_emails: Set[str],
+    report: BulkImportResponse
+):
+    """Validate, diff, hash and write one chunk of import rows in a single transaction."""
+    def fail(row_number, email, detail):
+        report.failed += 1
+        report.results.append(BulkImportRowResult(row=row_number, email=email, status="error", detail=detail))
+
+    rows = []
+    for row_number, record, error in chunk:
+        if error:
+            fail(row_number, None, error)
+            continue
+        try:
+            row = BulkImportRow.model_validate(record)
+        except ValidationError as e:
+            fail(row_number, record.get("email"), "; ".join(
+                f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+            ))
+            continue
+        if row.email in seen_emails:
+            fail(row_number, row.email, "Duplicate email earlier in the file")
+            continue
+        seen_emails.add(row.email)
+        rows.append((row_number, row))
+    if not rows:
+        return
+
+    # One set-based lookup per chunk instead of one duplicate-email query per row
+    existing = dict((await db.execute(select(User.email, User.id).where(
+        User.email.in_([row.email for _, row in rows])
+    ))).all())
+
+    now = datetime.now()
+    inserts, updates, passwords, results = [], [], [], []
+    for row_number, row in rows:
+        fields = row.model_dump(exclude={"password"}, exclude_none=True)
+        if row.email in existing:
+            if not upsert:
+                report.skipped += 1
+                report.results.append(BulkImportRowResult(
+                    row=row_number, email=row.email, status="skipped", id=existing[row.email],
+                    detail="User with this email already exists"
+                ))
+                continue
+            values = {**fields, "id": existing[row.email], "updated_at": now}
+            updates.append(values)
+            results.append(BulkImportRowResult(row=row_number, email=row.email, status="updated", id=values["id"]))
+        else:
+            if not row.password:
+                fail(row_number, row.email, "password is required for new employees")
+                continue
+            values = {
+                **row.model_dump(exclude={"password"}),
+                "role": row.role or UserRole.EMPLOYEE,
+                "is_active": True if row.is_active is None else row.is_active,
+                "is_admin": bool(row.is_admin),
+                "id": uuid.uuid4(),
+                "created_at": now,
+                "updated_at": now,
+            }
+            inserts.append(values)
+            results.append(BulkImportRowResult(row=row_number, email=row.email, status="created", id=values["id"]))
+        if row.password:
+            passwords.append((values, row.password))
+
+    hashes = await hashing_service.hash_many([password for _, password in passwords])
+    for (values, _), hashed_password in zip(passwords, hashes):
+        values["hashed_password"] = hashed_password
+
+    try:
+        if inserts:
+            await db.execute(insert(User), inserts)
+        if updates:
+            await db.execute(update(User), updates)
+        # Bulk statements skip the ORM listeners that maintain the org chart and unread counters
+        await db.run_sync(lambda session: _sync_hierarchy(session.connection(), inserts, updates))
+        recount = [values["id"] for values in inserts] + [
+            values["id"] for values in updates if values.keys() & {"role", "is_active"}
+        ]
+        await db.run_sync(lambda session: recount_unread(session.connection(), recount))
+        claims_changed = [values["id"] for values in updates if values.keys() & {"role", "is_admin", "is_active"}]
+        await invalidate_users(db, claims_changed, revoke_claims=True)
+        await invalidate_users(db, [values["id"] for values in updates if values["id"] not in claims_changed])
+        await db.commit()
+    except HierarchyCycleError as e:
+        await db.rollback()
+        logger.error(f"❌ Bulk import chunk rejected: {str(e)}")
+        for result in results:
+            fail(result.row, result.email, "Chunk rejected: reporting managers would form a cycle")
+        return
+    except IntegrityError as e:
+        await db.rollback()
+        logger.error(f"❌ Bulk import chunk rejected by database constraint: {str(e)}")
+        for result in results:
+            fail(result.row, result.email, "Chunk rejected due to database constraint")
+        return
+
+    report.created += len(inserts)
+    report.updated += len(updates)
+    report.results.extend(results)
+
+@users_router.post("/bulk-import", response_model=BulkImportResponse)
+async def bulk_import_users(
+    file: UploadFile = File(..., description="CSV with a header row, or NDJSON (one object per line)"),
+    upsert: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_admin_user)
+):
+    """
+    Create employees in bulk from an uploaded CSV or NDJSON file.
+
+    The file is read line by line and written in chunked transactions.
+    Existing emails are skipped, or updated when `upsert=true`.
+    Returns one result per input row.
+
+    Requires: Valid JWT token with admin privileges
+    """
+    fmt = detect_format(file.filename, file.content_type)
+    if fmt is None:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"detail": f"Unsupported file type. Supported formats: {', '.join(SUPPORTED_FORMATS)}."}
+        )
+
+    admin_id = current_user.id  # read before any chunk rollback expires it
+    report = BulkImportResponse()
+    seen_emails: Set[str] = set()
+    try:
+        for chunk in chunked(iter_records(file.file, fmt), BULK_IMPORT_CHUNK_SIZE):
+            await _import_chunk(db, chunk, upsert, seen_emails, report)
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"❌ Unexpected error during bulk import: {str(e)}")
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"detail": "An unexpected error occurred during bulk import."}
+        )
+
+    report.results.sort(key=lambda result: result.row)
+    logger.info(
+        f"✅ Admin {admin_id} bulk imported employees: {report.created} created, "
+        f"{report.updated} updated, {report.skipped} skipped, {report.failed} failed"
+    )
+    return report
+
 @users_router.put("/update/{user_id}", response_model=UserResponse)
 async def update_user(
     user_id: uuid.UUID,
     user_update: UserUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -191,7 +544,7 @@ async def update_user(
                 content="Not enough permissions to update this record"
             )
 
-        db_user = db.query(User).filter(User.id == user_id).first()
+        db_user = await db.scalar(select(User).where(User.id == user_id))
         if not db_user:
             logger.warning(f"404 - User with ID {user_id} not found")
             return JSONResponse(status_code=status.HTTP_404_NOT_FOUND, content="User not found")
@@ -207,8 +560,15 @@ async def update_user(
         if not current_user.is_admin and "is_admin" in update_data:
             del update_data["is_admin"]
 
+        if await creates_cycle(db, user_id, update_data.get("reporting_manager_id")):
+            logger.warning(f"🚫 400 - Reporting manager change for {user_id} would create a cycle")
+            return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={"detail": "The new reporting manager reports to this user."}
+            )
+
         if "password" in update_data:
-            hashed_password = get_password_hash(update_data["password"])
+            hashed_password = await hashing_service.hash_password(update_data["password"])
             update_data["hashed_password"] = hashed_password
             del update_data["password"]
 
@@ -217,21 +577,24 @@ async def update_user(
         for key, value in update_data.items():
             setattr(db_user, key, value)
 
-        db.commit()
-        db.refresh(db_user)
+        await invalidate_user(db, user_id, revoke_claims=bool(update_data.keys() & {"role", "is_admin", "is_active"}))
+        await db.commit()
+        await db.refresh(db_user)
 
         logger.info(f"User {current_user.id} updated user with ID: {user_id}")
         return db_user
 
+    except HTTPException as http_exc:
+        raise http_exc
     except IntegrityError as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Database integrity error: {str(e)}")
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content="Could not update user due to database constraint"
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Unexpected error updating user: {str(e)}")
         return JSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -240,12 +603,12 @@ async def update_user(
 
 @users_router.get("/{user_id}/avatars")
 async def get_avatars(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
     try:
         # Query avatars from database
-        avatars = db.query(Avatar).all()
+        avatars = (await db.scalars(select(Avatar))).all()
         
         # Format response
         avatar_list = [{"id": avatar.id, "name": avatar.name, "url": avatar.url} for avatar in avatars]
@@ -261,12 +624,12 @@ async def get_avatars(
 @users_router.put("/profile-picture")
 async def update_profile_picture(
     avatar_update: AvatarUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     try:
         # Verify the avatar exists
-        avatar = db.query(Avatar).filter(Avatar.id == avatar_update.avatar_id).first()
+        avatar = await db.get(Avatar, avatar_update.avatar_id)
         if not avatar:
             return JSONResponse(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -275,11 +638,12 @@ async def update_profile_picture(
         
         # Update the user's profile picture
         user_id = current_user.id
-        db_user = db.query(User).filter(User.id == user_id).first()
+        db_user = await db.scalar(select(User).where(User.id == user_id))
         db_user.profile_picture_url = avatar.url
         db_user.updated_at = datetime.now()
-        db.commit()
-        db.refresh(db_user)
+        await invalidate_user(db, user_id)
+        await db.commit()
+        await db.refresh(db_user)
         
         logger.info(f"User {current_user.id} updated profile picture using avatar: {avatar.name}")
         return JSONResponse(
@@ -288,7 +652,7 @@ async def update_profile_picture(
         )
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Unexpected error updating profile picture: {str(e)}")
         return JSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -296,14 +660,16 @@ async def update_profile_picture(
         )
 
 @users_router.delete("/delete/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_user(user_id: uuid.UUID, db: Session = Depends(get_db), current_user: User = Depends(get_admin_user)):
+async def delete_user(user_id: uuid.UUID, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_admin_user)):
     try:
-        db_user = db.query(User).filter(User.id == user_id).first()
+        db_user = await db.scalar(select(User).where(User.id == user_id))
         if not db_user:
             logger.warning(f"⚠️ User {user_id} not found")
             return JSONResponse(status_code=404, content={"detail": "User not found"})
         if db_user.is_admin:
-            admin_count = db.query(User).filter(User.is_admin == True, User.is_active == True).count()
+            admin_count = await db.scalar(
+                select(func.count()).select_from(User).where(User.is_admin == True, User.is_active == True)
+            )
             if admin_count <= 1:
                 logger.warning(f"🚫 Attempted to delete last admin user")
                 return JSONResponse(status_code=400, content={"detail": "Cannot delete the last admin user"})
@@ -313,11 +679,13 @@ async def delete_user(user_id: uuid.UUID, db: Session = Depends(get_db), current
     try:
         db_user.is_active = False
         db_user.updated_at = datetime.now()
-        db.commit()
+        await revoke_user_sessions(db, user_id)
+        await invalidate_user(db, user_id, revoke_claims=True)
+        await db.commit()
         logger.info(f"✅ Admin {current_user.id} deactivated user with id {user_id}")
         return None
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"❌ Error deleting user: {str(e)}")
         return JSONResponse(status_code=500, content={"detail": "An unexpected error occurred while deleting the user."})
\ No newline at end of file
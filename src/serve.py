@@ -0,0 +1,68 @@
+"""Production entry point: N uvicorn workers built from the ``src.main:_get_app`` factory.
+
+    WEB_CONCURRENCY=4 python src/serve.py
+
+Each worker builds its own app (engines, pools and caches are per process).
+Startup coordination between workers lives in the startup pipeline: DDL runs
+under a file lock, and only the worker holding the leader lock seeds and runs
+the session sweeper and SQLite maintenance. With more than one worker, live
+events are relayed between them (``BROADCAST_BACKEND=table``) unless the
+backend is set explicitly.
+"""
+import importlib.util
+import logging
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import uvicorn
+
+from src.resources.constants import (
+    PROJECT_ROOT,
+    SERVER_BACKLOG,
+    SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+    SERVER_HOST,
+    SERVER_KEEPALIVE_SECONDS,
+    SERVER_LIMIT_CONCURRENCY,
+    SERVER_LIMIT_MAX_REQUESTS,
+    SERVER_PORT,
+    WEB_CONCURRENCY,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+def server_options() -> dict:
+    return {
+        "host": SERVER_HOST,
+        "port": SERVER_PORT,
+        "workers": WEB_CONCURRENCY,
+        "factory": True,
+        "loop": "uvloop" if _available("uvloop") else "asyncio",
+        "http": "httptools" if _available("httptools") else "h11",
+        "timeout_keep_alive": SERVER_KEEPALIVE_SECONDS,
+        "backlog": SERVER_BACKLOG,
+        "limit_concurrency": SERVER_LIMIT_CONCURRENCY,
+        "limit_max_requests": SERVER_LIMIT_MAX_REQUESTS,
+        "timeout_graceful_shutdown": SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+        "proxy_headers": True,
+    }
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    # Templates and static files are resolved relative to the working directory
+    os.chdir(PROJECT_ROOT)
+    options = server_options()
+    if options["workers"] > 1:
+        # Read by each worker when it imports the constants
+        os.environ.setdefault("BROADCAST_BACKEND", "table")
+    logger.info(
+        f"🚀 Serving with {options['workers']} workers, loop={options['loop']}, http={options['http']}, "
+        f"keep-alive={options['timeout_keep_alive']}s, backlog={options['backlog']}, "
+        f"limit-concurrency={options['limit_concurrency']}"
+    )
+    uvicorn.run("src.main:_get_app", **options)
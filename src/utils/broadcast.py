@@ -0,0 +1,208 @@
+"""In-process broadcast of change events to live ``/events/stream`` connections.
+
+Routes publish after their commit. Every connection subscribes with its own
+bounded queue. A subscriber that falls ``BROADCAST_QUEUE_SIZE`` events
+behind is evicted rather than buffered without limit: its stream ends with
+an ``evicted`` event, and the client reconnects and refetches.
+
+Each worker process has its own hub. A backend relays events between them:
+
+``local``  single process, nothing to relay.
+``table``  each event is also written to ``broadcast_events``; every worker
+           polls the table for events from the others. A stand-in for a
+           real pub/sub service, which would implement the same two methods.
+"""
+import asyncio
+import json
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Optional, Set
+
+from sqlalchemy import delete, func, insert, select
+
+from src.database import engine
+from src.database.models import BroadcastEvent
+from src.resources.constants import (
+    BROADCAST_BACKEND,
+    BROADCAST_POLL_SECONDS,
+    BROADCAST_QUEUE_SIZE,
+    BROADCAST_RETENTION_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+events = BroadcastEvent.__table__
+
+
+@dataclass(frozen=True)
+class BroadcastMessage:
+    id: str
+    type: str
+    data: dict
+    origin: str
+
+    def to_sse(self) -> str:
+        return f"id: {self.id}\nevent: {self.type}\ndata: {json.dumps(self.data, default=str)}\n\n"
+
+
+class Subscription:
+    """One connection's queue; ``get`` returns ``None`` once it was evicted or the hub closed."""
+
+    def __init__(self, maxsize: int):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.evicted = False
+
+    async def get(self) -> Optional[BroadcastMessage]:
+        return await self._queue.get()
+
+    def offer(self, message: BroadcastMessage) -> bool:
+        try:
+            self._queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def end(self, evicted: bool = False) -> None:
+        self.evicted = evicted
+        # Drop what is queued so the end marker always fits
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+
+class LocalBackend:
+    """Single process: the hub's own delivery is all there is."""
+
+    async def publish(self, message: BroadcastMessage) -> None:
+        pass
+
+    async def run(self, hub: "BroadcastHub", prune: bool) -> None:
+        pass
+
+
+class TableBackend:
+    """Relays events between workers through the ``broadcast_events`` table."""
+
+    def __init__(self, poll_seconds: float, retention_seconds: float):
+        self.poll_seconds = poll_seconds
+        self.retention_seconds = retention_seconds
+        self._last_id = 0
+
+    def _insert(self, message: BroadcastMessage) -> None:
+        with engine.begin() as connection:
+            connection.execute(insert(events).values(
+                event_id=message.id,
+                event_type=message.type,
+                payload=json.dumps(message.data, default=str),
+                origin=message.origin,
+                created_at=datetime.now(),
+            ))
+
+    def _start(self) -> None:
+        # Only events published from now on
+        with engine.connect() as connection:
+            self._last_id = connection.execute(select(func.max(events.c.id))).scalar() or 0
+
+    def _fetch(self) -> List[BroadcastMessage]:
+        with engine.connect() as connection:
+            rows = connection.execute(
+                select(events).where(events.c.id > self._last_id).order_by(events.c.id)
+            ).all()
+        if rows:
+            self._last_id = rows[-1].id
+        return [
+            BroadcastMessage(id=row.event_id, type=row.event_type, data=json.loads(row.payload), origin=row.origin)
+            for row in rows
+        ]
+
+    def _prune(self) -> int:
+        cutoff = datetime.now() - timedelta(seconds=self.retention_seconds)
+        with engine.begin() as connection:
+            return connection.execute(delete(events).where(events.c.created_at < cutoff)).rowcount
+
+    async def publish(self, message: BroadcastMessage) -> None:
+        await asyncio.to_thread(self._insert, message)
+
+    async def run(self, hub: "BroadcastHub", prune: bool) -> None:
+        await asyncio.to_thread(self._start)
+        polls_per_prune = max(1, int(self.retention_seconds / self.poll_seconds))
+        polls = 0
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            try:
+                for message in await asyncio.to_thread(self._fetch):
+                    if message.origin != hub.origin:
+                        hub.deliver(message)
+                polls += 1
+                if prune and polls % polls_per_prune == 0:
+                    await asyncio.to_thread(self._prune)
+            except Exception as e:
+                logger.error(f"❌ Broadcast relay poll failed: {str(e)}")
+
+
+BACKENDS = {
+    "local": lambda: LocalBackend(),
+    "table": lambda: TableBackend(BROADCAST_POLL_SECONDS, BROADCAST_RETENTION_SECONDS),
+}
+
+
+class BroadcastHub:
+    def __init__(self, backend, queue_size: int):
+        self.backend = backend
+        self.queue_size = queue_size
+        self.origin = uuid.uuid4().hex
+        self._subscriptions: Set[Subscription] = set()
+        self.evictions = 0
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(self.queue_size)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscriptions.discard(subscription)
+
+    def deliver(self, message: BroadcastMessage) -> None:
+        """Queue ``message`` for every local subscriber, evicting those whose queue is full."""
+        for subscription in list(self._subscriptions):
+            if not subscription.offer(message):
+                self.unsubscribe(subscription)
+                subscription.end(evicted=True)
+                self.evictions += 1
+                logger.warning("⚠️ Evicted a slow event stream subscriber")
+
+    async def publish(self, event_type: str, data: dict) -> None:
+        """Send an event to every connection on every worker; failures are logged, never raised."""
+        message = BroadcastMessage(id=uuid.uuid4().hex, type=event_type, data=data, origin=self.origin)
+        self.deliver(message)
+        try:
+            await self.backend.publish(message)
+        except Exception as e:
+            logger.error(f"❌ Could not relay {event_type} to other workers: {str(e)}")
+
+    def stats(self) -> dict:
+        return {
+            "backend": BROADCAST_BACKEND,
+            "subscribers": self.subscribers,
+            "queue_size": self.queue_size,
+            "evictions": self.evictions,
+        }
+
+    async def run_backend(self, prune: bool) -> None:
+        """Background task: receive other workers' events; ``prune`` on one worker only."""
+        await self.backend.run(self, prune)
+
+    def close(self) -> None:
+        """End every open stream, e.g. on shutdown."""
+        for subscription in list(self._subscriptions):
+            self.unsubscribe(subscription)
+            subscription.end()
+
+
+broadcast_hub = BroadcastHub(BACKENDS[BROADCAST_BACKEND](), BROADCAST_QUEUE_SIZE)
@@ -0,0 +1,52 @@
+import csv
+import io
+import json
+from itertools import islice
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+SUPPORTED_FORMATS = ("csv", "ndjson")
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> Optional[str]:
+    name = (filename or "").lower()
+    if name.endswith(".csv") or content_type == "text/csv":
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")) or content_type in ("application/x-ndjson", "application/jsonl"):
+        return "ndjson"
+    return None
+
+
+def iter_records(stream: BinaryIO, fmt: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """Yield ``(row_number, record, error)`` one line at a time.
+
+    Only the current line is held in memory. Empty CSV cells become ``None`` so
+    they are treated as "not provided" rather than as empty strings.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for row_number, row in enumerate(reader, start=1):
+            yield row_number, {k.strip(): (v.strip() or None) for k, v in row.items() if k and v is not None}, None
+    else:
+        for row_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield row_number, None, f"Invalid JSON: {e.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield row_number, None, "Each line must be a JSON object"
+                continue
+            yield row_number, record, None
+    text.detach()
+
+
+def chunked(iterable, size: int) -> Iterator[List]:
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,56 @@
+"""Pick a bcrypt cost factor that fits a login latency budget on this host.
+
+    python src/utils/calibrate_hashing.py --target-ms 250
+
+Prints the recommended ``BCRYPT_ROUNDS`` value. Export it before starting the
+app; stored hashes at any other cost are upgraded transparently on next login.
+"""
+import argparse
+import statistics
+import sys
+import os
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from src.resources.constants import BCRYPT_ROUNDS
+from src.utils.hashing import build_context
+
+
+def measure(rounds: int, samples: int) -> float:
+    """Median wall time in milliseconds of one hash at ``rounds``."""
+    context = build_context(rounds)
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        context.hash("calibration-password")
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(target_ms: float, min_rounds: int, max_rounds: int, samples: int) -> int:
+    chosen = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        elapsed = measure(rounds, samples)
+        fits = elapsed <= target_ms
+        print(f"rounds={rounds:>2}  median={elapsed:8.1f} ms  {'ok' if fits else 'over budget'}")
+        if not fits:
+            break
+        chosen = rounds
+    return chosen
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target-ms", type=float, default=250.0, help="latency budget for one hash")
+    parser.add_argument("--min-rounds", type=int, default=10, help="never recommend less than this")
+    parser.add_argument("--max-rounds", type=int, default=16)
+    parser.add_argument("--samples", type=int, default=3)
+    args = parser.parse_args()
+
+    rounds = calibrate(args.target_ms, args.min_rounds, args.max_rounds, args.samples)
+    print(f"\nCurrent BCRYPT_ROUNDS={BCRYPT_ROUNDS}")
+    print(f"Recommended BCRYPT_ROUNDS={rounds}")
+
+
+if __name__ == "__main__":
+    main()
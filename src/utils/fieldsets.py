@@ -0,0 +1,76 @@
+"""Sparse fieldsets for list endpoints: ``?fields=id,first_name,last_name``.
+
+The requested fields become a ``load_only`` projection on the query and a
+trimmed copy of the endpoint's response model, so unrequested columns are
+neither read from the database nor serialised. Trimmed models are built
+once per (model, field set) and cached. ``id`` is always returned.
+"""
+from functools import lru_cache
+from typing import FrozenSet, List, Optional, Type, get_args
+
+from fastapi import HTTPException, Query, Response, status
+from pydantic import BaseModel, ConfigDict, create_model
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import load_only
+from sqlalchemy.sql import Select
+
+# Columns keyset pagination reads from every row, requested or not
+ALWAYS_LOADED = ("id", "created_at")
+
+
+class FieldSelection:
+    """``fields`` query parameter, used as ``fieldset: FieldSelection = Depends()``."""
+
+    def __init__(
+        self,
+        fields: Optional[str] = Query(None, description="Comma-separated response fields to return, e.g. id,first_name"),
+    ):
+        self.fields = fields
+
+    def resolve(self, response_model: Type[BaseModel], model) -> Optional[FrozenSet[str]]:
+        """Validated field set, or ``None`` when the full representation was asked for."""
+        if not self.fields:
+            return None
+        requested = {name.strip() for name in self.fields.split(",") if name.strip()}
+        allowed = set(response_model.model_fields) & set(sa_inspect(model).column_attrs.keys())
+        unknown = requested - allowed
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}. Allowed: {', '.join(sorted(allowed))}."
+            )
+        return frozenset(requested | {"id"})
+
+
+def project(query: Select, model, fields: Optional[FrozenSet[str]]) -> Select:
+    """Restrict ``query`` to the requested columns (plus the pagination keys)."""
+    if fields is None:
+        return query
+    columns = sorted(fields | set(ALWAYS_LOADED))
+    return query.options(load_only(*(getattr(model, name) for name in columns)))
+
+
+@lru_cache(maxsize=256)
+def trimmed_model(response_model: Type[BaseModel], fields: FrozenSet[str]) -> Type[BaseModel]:
+    source = response_model.model_fields
+    return create_model(
+        f"{response_model.__name__}_{'_'.join(sorted(fields))}",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (source[name].annotation, source[name]) for name in sorted(fields)},
+    )
+
+@lru_cache(maxsize=256)
+def trimmed_list_model(list_model: Type[BaseModel], items_field: str, fields: FrozenSet[str]) -> Type[BaseModel]:
+    """``list_model`` with its ``items_field`` entries narrowed to ``fields``."""
+    item_model = get_args(list_model.model_fields[items_field].annotation)[0]
+    definitions = {name: (info.annotation, info) for name, info in list_model.model_fields.items()}
+    definitions[items_field] = (List[trimmed_model(item_model, fields)], ...)
+    return create_model(f"{list_model.__name__}_{'_'.join(sorted(fields))}", **definitions)
+
+
+def sparse_response(
+    list_model: Type[BaseModel], items_field: str, fields: FrozenSet[str], items: list, **extra
+) -> Response:
+    """Serialise a trimmed list response directly; the route's full ``response_model`` is bypassed."""
+    model = trimmed_list_model(list_model, items_field, fields)
+    return Response(content=model(**{items_field: items}, **extra).model_dump_json(), media_type="application/json")
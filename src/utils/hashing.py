@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from src.resources.constants import (
+    BCRYPT_ROUNDS,
+    HASHING_EXECUTOR,
+    HASHING_MAX_QUEUE,
+    HASHING_MAX_WORKERS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def build_context(rounds: int) -> CryptContext:
+    """bcrypt context pinned to ``rounds``; hashes at any other cost need an update."""
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+
+pwd_context = build_context(BCRYPT_ROUNDS)
+
+
+def get_password_hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+def verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password and, if its hash is below the current policy, return a replacement."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+def needs_update(hashed_password: str) -> bool:
+    return pwd_context.needs_update(hashed_password)
+
+
+class HashingService:
+    """Runs bcrypt hashing and verification off the event loop.
+
+    Work is submitted to a thread or process pool. At most
+    ``max_workers + max_queue`` jobs may be outstanding; anything beyond
+    that is rejected with ``503 Service Unavailable`` instead of piling up
+    behind the pool and holding request handlers open.
+    """
+
+    def __init__(self, executor_kind: str = "thread", max_workers: int = 4, max_queue: int = 64):
+        if executor_kind not in ("thread", "process"):
+            raise ValueError(f"Unknown hashing executor: {executor_kind}")
+        self.executor_kind = executor_kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._latencies = deque(maxlen=1024)
+        self.completed = 0
+        self.rejected = 0
+        self.failed = 0
+        self.max_latency_ms = 0.0
+
+    def _get_executor(self) -> Executor:
+        # Created lazily so importing this module never forks or spawns threads.
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.executor_kind == "process":
+                        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.max_workers, thread_name_prefix="hashing"
+                        )
+        return self._executor
+
+    async def _run(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                logger.warning(f"🚫 503 - Password hashing queue saturated ({self._pending} pending)")
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Server is busy, please retry shortly.",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._get_executor(), fn, *args)
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with self._lock:
+                self._pending -= 1
+        with self._lock:
+            self.completed += 1
+            self._latencies.append(elapsed_ms)
+            self.max_latency_ms = max(self.max_latency_ms, elapsed_ms)
+        return result
+
+    async def hash_password(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def hash_many(self, passwords: List[str]) -> List[str]:
+        """Hash a batch in parallel without ever queueing more than the pool can run."""
+        gate = asyncio.Semaphore(self.max_workers)
+
+        async def _hash(password: str) -> str:
+            async with gate:
+                return await self.hash_password(password)
+
+        return await asyncio.gather(*(_hash(password) for password in passwords))
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        return await self._run(verify_and_update, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            pending = self._pending
+            stats = {
+                "executor": self.executor_kind,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": min(pending, self.max_workers),
+                "queue_depth": max(0, pending - self.max_workers),
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "failed": self.failed,
+                "max_latency_ms": round(self.max_latency_ms, 2),
+            }
+        if latencies:
+            stats["avg_latency_ms"] = round(sum(latencies) / len(latencies), 2)
+            stats["p50_latency_ms"] = round(latencies[len(latencies) // 2], 2)
+            stats["p95_latency_ms"] = round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 2)
+        return stats
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+hashing_service = HashingService(
+    executor_kind=HASHING_EXECUTOR,
+    max_workers=HASHING_MAX_WORKERS,
+    max_queue=HASHING_MAX_QUEUE,
+)
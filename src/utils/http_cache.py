@@ -0,0 +1,34 @@
+"""Conditional GET for per-user JSON responses.
+
+The ETag is a hash of the serialised body, so it changes exactly when the
+payload does. Responses are ``private, no-cache``: the browser keeps its
+copy but revalidates every time with ``If-None-Match``, and an unchanged
+payload costs a bodiless 304 instead of a full download.
+"""
+import hashlib
+
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+
+CACHE_HEADERS = {"Cache-Control": "private, no-cache", "Vary": "Authorization"}
+
+
+def etag_for(body: bytes) -> str:
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {candidate.strip() for candidate in header.split(",")}
+    # Weak comparison: W/"x" and "x" name the same representation
+    return "*" in candidates or etag in candidates or etag[2:] in candidates
+
+def conditional_json(request: Request, payload: BaseModel) -> Response:
+    """``payload`` as JSON with an ETag, or a 304 when the client already has it."""
+    body = payload.model_dump_json().encode()
+    etag = etag_for(body)
+    headers = {**CACHE_HEADERS, "ETag": etag}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
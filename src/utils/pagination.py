@@ -0,0 +1,128 @@
+"""Keyset pagination for list endpoints.
+
+Pages are ordered by ``(created_at, id)`` and continue strictly after the
+last row of the previous page, so each page is an index range scan on the
+``ix_<table>_created_at_id`` indexes instead of an ``OFFSET`` that re-reads
+every skipped row. The cursor is opaque to clients: base64 of the last
+row's ``created_at`` and ``id``.
+"""
+import base64
+import json
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import func, literal, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from src.resources.constants import PAGINATION_COUNT_TTL_SECONDS, PAGINATION_DEFAULT_LIMIT, PAGINATION_MAX_LIMIT
+
+
+def _encode(key: list) -> str:
+    raw = json.dumps(key).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _decode(cursor: str) -> list:
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor.")
+
+def encode_cursor(created_at: datetime, row_id) -> str:
+    return _encode([created_at.isoformat(), str(row_id)])
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    try:
+        created_at, row_id = _decode(cursor)
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor.")
+
+def encode_pinned_cursor(is_pinned: bool, created_at: datetime, row_id) -> str:
+    """Cursor for lists ordered pinned first, e.g. the announcement inbox."""
+    return _encode([bool(is_pinned), created_at.isoformat(), str(row_id)])
+
+def decode_pinned_cursor(cursor: str) -> Tuple[bool, datetime, uuid.UUID]:
+    try:
+        is_pinned, created_at, row_id = _decode(cursor)
+        if not isinstance(is_pinned, bool):
+            raise TypeError(is_pinned)
+        return is_pinned, datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor.")
+
+
+def cursor_key(columns, values):
+    """Row value for comparing ``columns`` against a decoded cursor.
+
+    Each value is bound with its column's type; a bare ``uuid.UUID`` would
+    otherwise bind as 32 hex digits and never equal a stored key.
+    """
+    return tuple_(*(literal(value, type_=column.type) for column, value in zip(columns, values)))
+
+
+class PageParams:
+    """``limit``/``cursor``/``include_total`` query parameters, used as ``page: PageParams = Depends()``."""
+
+    def __init__(
+        self,
+        limit: int = Query(PAGINATION_DEFAULT_LIMIT, ge=1, le=PAGINATION_MAX_LIMIT),
+        cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+        include_total: bool = Query(False, description="Add a cached total_estimate to the response"),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.include_total = include_total
+
+
+async def fetch_page(db: AsyncSession, query: Select, model, page: PageParams) -> Tuple[List, Optional[str]]:
+    """Run ``query`` for one page of ``model`` rows; returns ``(rows, next_cursor)``."""
+    key = (model.created_at, model.id)
+    query = query.order_by(*key)
+    if page.cursor:
+        query = query.where(tuple_(*key) > cursor_key(key, decode_cursor(page.cursor)))
+    # One extra row tells whether another page exists without a COUNT
+    rows = (await db.scalars(query.limit(page.limit + 1))).all()
+    if len(rows) <= page.limit:
+        return rows, None
+    last = rows[page.limit - 1]
+    return rows[:page.limit], encode_cursor(last.created_at, last.id)
+
+
+class CountCache:
+    """Row counts per list query, recomputed at most every ``ttl_seconds``.
+
+    Totals are only for display ("about 12,400 employees"), so a slightly
+    stale number is fine and saves a full COUNT(*) scan on every page.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._counts: Dict[str, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    async def get(self, key: str, compute: Callable[[], Awaitable[int]]) -> int:
+        now = time.monotonic()
+        cached = self._counts.get(key)
+        if cached is not None and now - cached[0] < self.ttl_seconds:
+            return cached[1]
+        total = await compute()
+        with self._lock:
+            if len(self._counts) >= self.max_entries:
+                self._counts.clear()
+            self._counts[key] = (now, total)
+        return total
+
+
+count_cache = CountCache(ttl_seconds=PAGINATION_COUNT_TTL_SECONDS)
+
+async def estimate_total(db: AsyncSession, query: Select, key: str) -> int:
+    """Cached ``COUNT(*)`` of ``query`` (without ordering or paging), keyed by endpoint and filters."""
+    return await count_cache.get(
+        key, lambda: db.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
+    )
@@ -0,0 +1,46 @@
+import inspect
+import logging
+import time
+from typing import Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StartupPipeline:
+    """Named startup phases, run once and in order, with a timing report.
+
+    A failing phase is logged and recorded as failed; the remaining phases
+    still run so one broken optional step does not keep the API down.
+    """
+
+    def __init__(self):
+        self._phases: List[Tuple[str, Callable]] = []
+        self.report: Dict[str, dict] = {}
+        self.completed = False
+
+    def add(self, name: str, step: Callable) -> "StartupPipeline":
+        self._phases.append((name, step))
+        return self
+
+    async def run(self) -> Dict[str, dict]:
+        if self.completed:
+            return self.report
+        started = time.perf_counter()
+        for name, step in self._phases:
+            phase_started = time.perf_counter()
+            try:
+                result = step()
+                if inspect.isawaitable(result):
+                    result = await result
+                self.report[name] = {"ms": round((time.perf_counter() - phase_started) * 1000, 2), "ok": True}
+                if result is not None:
+                    self.report[name]["result"] = result
+            except Exception as e:
+                self.report[name] = {"ms": round((time.perf_counter() - phase_started) * 1000, 2), "ok": False}
+                logger.error(f"❌ Startup phase '{name}' failed: {e}")
+        self.completed = True
+        total_ms = (time.perf_counter() - started) * 1000
+        self.report["total"] = {"ms": round(total_ms, 2), "ok": all(p["ok"] for p in self.report.values())}
+        phases = ", ".join(f"{name} {phase['ms']:.1f} ms" for name, phase in self.report.items() if name != "total")
+        logger.info(f"⏱️ Startup finished in {total_ms:.1f} ms ({phases})")
+        return self.report
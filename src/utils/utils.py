@@ -1,9 +1,2 @@
-from passlib.context import CryptContext
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
-
-def get_password_hash(password):
-    return pwd_context.hash(password)
\ No newline at end of file
+# Password hashing lives in src/utils/hashing.py; re-exported for existing imports.
+from src.utils.hashing import pwd_context, get_password_hash, verify_password
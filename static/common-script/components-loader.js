@@ -46,7 +46,31 @@ document.addEventListener("DOMContentLoaded", function () {
   }
 });
 
-// Function to get user role (placeholder - would be replaced with actual logic)
+// Profile, manager, role flags, unread count and avatars in one request,
+// shared by the sidebar, header and page scripts. The response carries an
+// ETag and "no-cache", so the browser revalidates it and repeat
+// navigations get a 304.
+let bootstrapPromise = null;
+
+function getBootstrap() {
+  if (!bootstrapPromise) {
+    const token = localStorage.getItem("astrellect_token");
+    bootstrapPromise = fetch("/astrellect/v1/employees/bootstrap", {
+      headers: { Authorization: `Bearer ${token}` },
+      cache: "no-cache",
+    })
+      .then((res) => {
+        if (!res.ok) throw new Error("Failed to fetch bootstrap data");
+        return res.json();
+      })
+      .catch((err) => {
+        bootstrapPromise = null;
+        throw err;
+      });
+  }
+  return bootstrapPromise;
+}
+
 async function getUserRole() {
   const token = localStorage.getItem("astrellect_token");
 
@@ -56,14 +80,8 @@ async function getUserRole() {
   }
 
   try {
-    const res = await fetch("/astrellect/v1/employees/get-me", {
-      headers: { Authorization: `Bearer ${token}` },
-    });
-
-    if (!res.ok) throw new Error("Failed to fetch");
-
-    const user = await res.json();
-    return user.role?.toLowerCase();
+    const bootstrap = await getBootstrap();
+    return bootstrap.profile.role?.toLowerCase();
   } catch (err) {
     alert("An error encountered while fetching data");
     return null;
@@ -78,20 +96,8 @@ async function fetchData() {
     showErrorMessage("Please log in to view your profile");
     return;
   }
-  const response = await fetch("/astrellect/v1/employees/get-me", {
-    method: "GET",
-    headers: {
-      Authorization: "Bearer " + token,
-      "Content-Type": "application/json",
-    },
-  });
-
-  if (!response.ok) {
-    throw new Error("Failed to fetch user data");
-  }
-
-  const userData = await response.json();
-  updateUserInfo(userData);
+  const bootstrap = await getBootstrap();
+  updateUserInfo(bootstrap.profile);
 }
 
 // Function to update user information in the header (placeholder)
@@ -0,0 +1,107 @@
+"""Bulk-imported users keep their unread counter in step with their inbox.
+
+Runs the app against a throwaway SQLite database in lazy receipt mode, where
+a role change decides which announcements a user is addressed.
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DATABASE_FILE = os.path.join(tempfile.mkdtemp(), "test.db")
+
+# Read by src.resources.constants at import time
+os.environ["DATABASE_URL"] = f"sqlite:///{DATABASE_FILE}"
+os.environ["ANNOUNCEMENT_RECEIPTS"] = "lazy"
+os.environ["SEED_ON_STARTUP"] = "blocking"
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["WEB_CONCURRENCY"] = "1"
+sys.path.insert(0, PROJECT_ROOT)
+
+from fastapi.testclient import TestClient
+
+API = "/astrellect/v1"
+
+
+@pytest.fixture(scope="module")
+def client():
+    os.chdir(PROJECT_ROOT)
+    from src.main import _get_app
+    with TestClient(_get_app()) as test_client:
+        yield test_client
+
+
+def _login(client, email, password):
+    response = client.post(f"{API}/auth/token", data={"username": email, "password": password})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def _inbox_unread(client, headers):
+    unread, cursor = 0, None
+    while True:
+        params = {"limit": 50, **({"cursor": cursor} if cursor else {})}
+        page = client.get(f"{API}/announcement/inbox", params=params, headers=headers).json()
+        unread += sum(not item["is_read"] for item in page["announcements"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            return unread
+
+
+def _import(client, admin, csv, upsert=False):
+    response = client.post(
+        f"{API}/employees/bulk-import?upsert={str(upsert).lower()}",
+        files={"file": ("users.csv", csv, "text/csv")},
+        headers=admin,
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def _counter_row(email):
+    from sqlalchemy import select
+    from src.database import engine
+    from src.database.models import AnnouncementUnreadCount, User
+    with engine.connect() as connection:
+        return connection.execute(
+            select(AnnouncementUnreadCount.unread)
+            .join(User, User.id == AnnouncementUnreadCount.user_id)
+            .where(User.email == email)
+        ).scalar()
+
+
+def _announce(client, admin, title):
+    response = client.post(f"{API}/announcement/create", json={"title": title, "content": "x"}, headers=admin)
+    assert response.status_code in (200, 201)
+
+
+def test_imported_user_unread_count_matches_inbox(client):
+    admin = _login(client, "admin@astrellect.com", "Admin@123#")
+    assert _import(client, admin, "email,password,first_name,role\nimported@x.io,Secret@123#,Imp,employee\n")["created"] == 1
+    _announce(client, admin, "After import")
+
+    headers = _login(client, "imported@x.io", "Secret@123#")
+    unread = client.get(f"{API}/announcement/unread-count", headers=headers).json()["unread_count"]
+    assert unread == _inbox_unread(client, headers) == 1
+    # Served from the maintained counter, not counted from scratch
+    assert _counter_row("imported@x.io") == 1
+
+
+def test_upserted_role_change_recounts_unread(client):
+    admin = _login(client, "admin@astrellect.com", "Admin@123#")
+    created = client.post(
+        f"{API}/employees/create",
+        json={"email": "promoted@x.io", "password": "Secret@123#", "first_name": "Pro", "role": "manager"},
+        headers=admin,
+    )
+    assert created.status_code == 201
+    _announce(client, admin, "Employees only")
+
+    headers = _login(client, "promoted@x.io", "Secret@123#")
+    assert client.get(f"{API}/announcement/unread-count", headers=headers).json()["unread_count"] == 0
+
+    assert _import(client, admin, "email,role\npromoted@x.io,employee\n", upsert=True)["updated"] == 1
+    headers = _login(client, "promoted@x.io", "Secret@123#")
+    unread = client.get(f"{API}/announcement/unread-count", headers=headers).json()["unread_count"]
+    assert unread == _inbox_unread(client, headers) == 1